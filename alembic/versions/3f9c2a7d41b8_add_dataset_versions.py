@@ -0,0 +1,78 @@
+# pylint: disable=invalid-name
+"""add_dataset_versions
+
+Revision ID: 3f9c2a7d41b8
+Revises: 5233d5762475
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import Column, ForeignKey, String
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2a7d41b8"
+down_revision: Union[str, None] = "5233d5762475"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Add the dataset version memberships and the semantic relations version."""
+    op.create_table(
+        "in_version",
+        Column("version", String(), primary_key=True),
+        Column(
+            "member_iri",
+            String(),
+            ForeignKey("collection_members.iri"),
+            primary_key=True,
+        ),
+    )
+    op.create_table(
+        "scheme_in_version",
+        Column("version", String(), primary_key=True),
+        Column(
+            "scheme_iri",
+            String(),
+            ForeignKey("concept_schemes.iri"),
+            primary_key=True,
+        ),
+    )
+
+    op.add_column(
+        "semantic_relations",
+        Column("version", String(), nullable=False, server_default=""),
+    )
+    op.drop_constraint("semantic_relations_pkey", "semantic_relations")
+    op.create_primary_key(
+        "semantic_relations_pkey",
+        "semantic_relations",
+        ["source_concept_iri", "target_concept_iri", "version"],
+    )
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Remove the dataset version memberships and the semantic relations version."""
+    # Keep a single row for the relations asserted in several versions.
+    op.execute(
+        "DELETE FROM semantic_relations AS duplicate USING semantic_relations AS kept "
+        "WHERE duplicate.source_concept_iri = kept.source_concept_iri "
+        "AND duplicate.target_concept_iri = kept.target_concept_iri "
+        "AND duplicate.version > kept.version"
+    )
+    op.drop_constraint("semantic_relations_pkey", "semantic_relations")
+    op.create_primary_key(
+        "semantic_relations_pkey",
+        "semantic_relations",
+        ["source_concept_iri", "target_concept_iri"],
+    )
+    op.drop_column("semantic_relations", "version")
+
+    op.drop_table("scheme_in_version")
+    op.drop_table("in_version")
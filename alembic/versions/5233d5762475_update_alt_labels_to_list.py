@@ -7,11 +7,10 @@ Create Date: 2024-05-20 16:28:24.278434
 
 """
 
-from typing import Callable, Sequence, Union
-
-from sqlalchemy import CursorResult, MetaData, Table, select, update
+from typing import Sequence, Union
 
 from alembic import op
+from dds_glossary.migration import jsonb_map_values, update_column
 
 # revision identifiers, used by Alembic.
 revision: str = "5233d5762475"
@@ -20,42 +19,22 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
-def update_rows(update_func: Callable) -> None:
-    """Update the altLabels column in the concepts table."""
-    column_name = "altLabels"
-    pk_name = "iri"
-    connection = op.get_bind()  # pylint: disable=no-member
-    metadata = MetaData()
-    metadata.reflect(bind=connection)
-    table = Table("concepts", metadata, autoload_with=connection)
-
-    results: CursorResult = connection.execute(
-        select(table.c[pk_name], table.c[column_name])
+def update_rows(value_expression: str) -> None:
+    """Update the altLabels column in the concepts table, in a single statement."""
+    update_column(
+        op.get_bind(),  # pylint: disable=no-member
+        table_name="concepts",
+        column_name="altLabels",
+        expression=jsonb_map_values("{column}", value_expression),
+        where="{column} <> jsonb_build_object()",
     )
-    for row in results:
-        row_dict = dict(row)
-        if row_dict[column_name] != {}:
-            new_alt_labels = update_func(row_dict[column_name])
-            connection.execute(
-                update(table)
-                .where(table.c[pk_name] == row_dict[pk_name])
-                .values({column_name: new_alt_labels})
-            )
 
 
 def upgrade() -> None:
     """upgrade the altLabels column to dict[str, list[str]]."""
-
-    def _to_list(x: dict[str, str]) -> dict[str, list[str]]:
-        return {key: [value] for key, value in x.items()}
-
-    update_rows(_to_list)
+    update_rows("jsonb_build_array(value)")
 
 
 def downgrade() -> None:
     """downgrade the altLabels column to dict[str, str]."""
-
-    def _from_list(x: dict[str, list[str]]) -> dict[str, str]:
-        return {key: value[0] for key, value in x.items()}
-
-    update_rows(_from_list)
+    update_rows("value -> 0")
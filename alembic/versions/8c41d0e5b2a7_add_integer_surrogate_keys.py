@@ -0,0 +1,117 @@
+# pylint: disable=invalid-name
+"""add_integer_surrogate_keys
+
+Revision ID: 8c41d0e5b2a7
+Revises: 3f9c2a7d41b8
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import Column, Integer, String
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41d0e5b2a7"
+down_revision: Union[str, None] = "3f9c2a7d41b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The tables identified by an IRI, given an integer id.
+KEYED_TABLES = ["concept_schemes", "collection_members"]
+
+# The references to the keyed tables, as (table, IRI column, id column, referenced
+# table), ordered so that a referenced column is dropped after its references.
+REFERENCES = [
+    ("semantic_relations", "source_concept_iri", "source_concept_id", "concepts"),
+    ("semantic_relations", "target_concept_iri", "target_concept_id", "concepts"),
+    ("in_scheme", "scheme_iri", "scheme_id", "concept_schemes"),
+    ("in_scheme", "member_iri", "member_id", "collection_members"),
+    ("in_collection", "collection_iri", "collection_id", "collections"),
+    ("in_collection", "member_iri", "member_id", "collection_members"),
+    ("in_version", "member_iri", "member_id", "collection_members"),
+    ("scheme_in_version", "scheme_iri", "scheme_id", "concept_schemes"),
+    ("concepts", "iri", "id", "collection_members"),
+    ("collections", "iri", "id", "collection_members"),
+]
+
+# The primary keys of the referencing tables, with the IRI or id columns.
+PRIMARY_KEYS = {
+    "concepts": ["iri"],
+    "collections": ["iri"],
+    "semantic_relations": ["source_concept_iri", "target_concept_iri", "version"],
+    "in_scheme": ["scheme_iri", "member_iri"],
+    "in_collection": ["collection_iri", "member_iri"],
+    "in_version": ["version", "member_iri"],
+    "scheme_in_version": ["version", "scheme_iri"],
+}
+
+
+# pylint: disable=no-member
+def convert_references(to_ids: bool) -> None:
+    """
+    Replace the references to the keyed tables by their id or IRI counterparts,
+    looked up in the keyed tables, then recreate the primary and foreign keys.
+
+    Args:
+        to_ids (bool): Whether to reference the ids instead of the IRIs.
+    """
+    old_key, new_key = ("iri", "id") if to_ids else ("id", "iri")
+    for table, iri_column, id_column, referenced_table in REFERENCES:
+        old_column, new_column = (
+            (iri_column, id_column) if to_ids else (id_column, iri_column)
+        )
+        keyed_table = (
+            referenced_table
+            if referenced_table in KEYED_TABLES
+            else "collection_members"
+        )
+        op.add_column(table, Column(new_column, Integer() if to_ids else String()))
+        op.execute(
+            f"UPDATE {table} SET {new_column} = keyed.{new_key} "
+            f"FROM {keyed_table} AS keyed "
+            f"WHERE keyed.{old_key} = {table}.{old_column}"
+        )
+        op.alter_column(table, new_column, nullable=False)
+    for table, iri_column, id_column, _ in REFERENCES:
+        op.drop_column(table, iri_column if to_ids else id_column)
+
+    for table in KEYED_TABLES:
+        op.drop_constraint(f"{table}_pkey", table)
+        op.create_primary_key(f"{table}_pkey", table, [new_key])
+        if to_ids:
+            op.create_unique_constraint(f"{table}_iri_key", table, ["iri"])
+        else:
+            op.drop_column(table, "id")
+
+    for table, columns in PRIMARY_KEYS.items():
+        if to_ids:
+            columns = [column.replace("iri", "id") for column in columns]
+        op.create_primary_key(f"{table}_pkey", table, columns)
+    for table, iri_column, id_column, referenced_table in reversed(REFERENCES):
+        column = id_column if to_ids else iri_column
+        op.create_foreign_key(
+            f"{table}_{column}_fkey",
+            table,
+            referenced_table,
+            [column],
+            [new_key],
+        )
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Reference the concept schemes and members by integer ids instead of IRIs."""
+    for table in KEYED_TABLES:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN id SERIAL")
+    convert_references(to_ids=True)
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Reference the concept schemes and members by IRIs instead of integer ids."""
+    for table in KEYED_TABLES:
+        op.drop_constraint(f"{table}_iri_key", table)
+    convert_references(to_ids=False)
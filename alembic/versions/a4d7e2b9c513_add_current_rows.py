@@ -0,0 +1,78 @@
+# pylint: disable=invalid-name
+"""add_current_rows
+
+Revision ID: a4d7e2b9c513
+Revises: f8d2b6e4a1c7
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import Boolean, Column, text, true
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d7e2b9c513"
+down_revision: Union[str, None] = "f8d2b6e4a1c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The tables identified by an IRI.
+IRI_TABLES = ["concept_schemes", "collection_members"]
+
+# The rows referencing the concept schemes and the members, by table and column.
+REFERENCES = {
+    "concept_schemes": [("in_scheme", "scheme_id"), ("scheme_in_version", "scheme_id")],
+    "collection_members": [
+        ("semantic_relations", "source_concept_id"),
+        ("semantic_relations", "target_concept_id"),
+        ("labels", "member_id"),
+        ("in_version", "member_id"),
+        ("in_scheme", "member_id"),
+        ("in_collection", "member_id"),
+        ("in_collection", "collection_id"),
+        ("concepts", "id"),
+        ("collections", "id"),
+    ],
+}
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Store the changed content of an IRI in a new row, its current one."""
+    for table in IRI_TABLES:
+        op.add_column(
+            table,
+            Column("current", Boolean(), nullable=False, server_default=true()),
+        )
+        op.drop_constraint(f"{table}_prefix_id_local_name_key", table)
+        op.create_index(f"ix_{table}_iri", table, ["prefix_id", "local_name"])
+        op.create_index(
+            f"ix_{table}_current_iri",
+            table,
+            ["prefix_id", "local_name"],
+            unique=True,
+            postgresql_where=text("current"),
+        )
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Keep the current row of each IRI only, with the rows referencing it."""
+    for table in IRI_TABLES:
+        for reference, column in REFERENCES[table]:
+            op.execute(
+                f"DELETE FROM {reference} WHERE {column} IN "
+                f"(SELECT id FROM {table} WHERE NOT current)"
+            )
+        op.execute(f"DELETE FROM {table} WHERE NOT current")
+        op.drop_index(f"ix_{table}_current_iri", table)
+        op.drop_index(f"ix_{table}_iri", table)
+        op.create_unique_constraint(
+            f"{table}_prefix_id_local_name_key",
+            table,
+            ["prefix_id", "local_name"],
+        )
+        op.drop_column(table, "current")
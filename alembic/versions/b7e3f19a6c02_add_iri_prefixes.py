@@ -0,0 +1,81 @@
+# pylint: disable=invalid-name
+"""add_iri_prefixes
+
+Revision ID: b7e3f19a6c02
+Revises: 8c41d0e5b2a7
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import Column, Integer, String
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3f19a6c02"
+down_revision: Union[str, None] = "8c41d0e5b2a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The tables identified by an IRI.
+IRI_TABLES = ["concept_schemes", "collection_members"]
+
+# The prefix of an IRI, up to and including its last "/" or "#", as computed by
+# `IriPrefix.split`.
+IRI_PREFIX = "regexp_replace({table}.iri, '[^/#]*$', '')"
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Store the IRIs as a shared prefix and a local name."""
+    op.create_table(
+        "iri_prefixes",
+        Column("id", Integer(), primary_key=True),
+        Column("prefix", String(), nullable=False, unique=True),
+    )
+    for table in IRI_TABLES:
+        prefix = IRI_PREFIX.format(table=table)
+        op.execute(
+            f"INSERT INTO iri_prefixes (prefix) SELECT DISTINCT {prefix} "
+            f"FROM {table} ON CONFLICT DO NOTHING"
+        )
+        op.add_column(table, Column("prefix_id", Integer()))
+        op.add_column(table, Column("local_name", String()))
+        op.execute(
+            f"UPDATE {table} SET prefix_id = iri_prefixes.id, "
+            f"local_name = substr({table}.iri, length(iri_prefixes.prefix) + 1) "
+            f"FROM iri_prefixes WHERE iri_prefixes.prefix = {prefix}"
+        )
+        op.alter_column(table, "prefix_id", nullable=False)
+        op.alter_column(table, "local_name", nullable=False)
+        op.drop_column(table, "iri")
+        op.create_unique_constraint(
+            f"{table}_prefix_id_local_name_key",
+            table,
+            ["prefix_id", "local_name"],
+        )
+        op.create_foreign_key(
+            f"{table}_prefix_id_fkey",
+            table,
+            "iri_prefixes",
+            ["prefix_id"],
+            ["id"],
+        )
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Store the full IRIs."""
+    for table in IRI_TABLES:
+        op.add_column(table, Column("iri", String()))
+        op.execute(
+            f"UPDATE {table} SET iri = iri_prefixes.prefix || {table}.local_name "
+            f"FROM iri_prefixes WHERE iri_prefixes.id = {table}.prefix_id"
+        )
+        op.alter_column(table, "iri", nullable=False)
+        op.drop_column(table, "prefix_id")
+        op.drop_column(table, "local_name")
+        op.create_unique_constraint(f"{table}_iri_key", table, ["iri"])
+    op.drop_table("iri_prefixes")
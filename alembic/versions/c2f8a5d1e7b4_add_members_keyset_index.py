@@ -0,0 +1,34 @@
+# pylint: disable=invalid-name
+"""add_members_keyset_index
+
+Revision ID: c2f8a5d1e7b4
+Revises: a4d7e2b9c513
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2f8a5d1e7b4"
+down_revision: Union[str, None] = "a4d7e2b9c513"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Add the index serving the keyset of the member pages."""
+    op.create_index(
+        "ix_collection_members_notation_iri",
+        "collection_members",
+        ["notation", "prefix_id", "local_name"],
+    )
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Remove the index serving the keyset of the member pages."""
+    op.drop_index("ix_collection_members_notation_iri", "collection_members")
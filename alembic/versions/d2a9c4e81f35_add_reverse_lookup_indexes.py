@@ -0,0 +1,39 @@
+# pylint: disable=invalid-name
+"""add_reverse_lookup_indexes
+
+Revision ID: d2a9c4e81f35
+Revises: b7e3f19a6c02
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a9c4e81f35"
+down_revision: Union[str, None] = "b7e3f19a6c02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The columns looked up without the leading column of their primary key.
+INDEXED_COLUMNS = [
+    ("semantic_relations", "target_concept_id"),
+    ("in_scheme", "member_id"),
+    ("in_collection", "member_id"),
+]
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Index the reverse lookups of the relations and memberships."""
+    for table, column in INDEXED_COLUMNS:
+        op.create_index(f"ix_{table}_{column}", table, [column])
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Remove the reverse lookup indexes."""
+    for table, column in INDEXED_COLUMNS:
+        op.drop_index(f"ix_{table}_{column}", table)
@@ -0,0 +1,70 @@
+# pylint: disable=invalid-name
+"""add_labels
+
+Revision ID: e5c1a7f3b942
+Revises: d2a9c4e81f35
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import Column, Enum, ForeignKey, Integer, String, text
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c1a7f3b942"
+down_revision: Union[str, None] = "d2a9c4e81f35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The labels in every language of the members, one row per language and label.
+LABELS = """
+SELECT id, 'PREF_LABEL'::labelkind, label.key, 0, label.value
+FROM collection_members, jsonb_each_text("prefLabels") AS label
+UNION ALL
+SELECT id, 'ALT_LABEL'::labelkind, label.key, alt_label.position - 1, alt_label.text
+FROM concepts, jsonb_each("altLabels") AS label,
+    jsonb_array_elements_text(label.value) WITH ORDINALITY AS alt_label(text, position)
+UNION ALL
+SELECT id, 'SCOPE_NOTE'::labelkind, label.key, 0, label.value
+FROM concepts, jsonb_each_text("scopeNotes") AS label
+"""
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Add the labels table, filled with the labels of the stored members."""
+    op.create_table(
+        "labels",
+        Column(
+            "member_id",
+            Integer(),
+            ForeignKey("collection_members.id"),
+            primary_key=True,
+        ),
+        Column(
+            "kind",
+            Enum("PREF_LABEL", "ALT_LABEL", "SCOPE_NOTE", name="labelkind"),
+            primary_key=True,
+        ),
+        Column("lang", String(), primary_key=True),
+        Column("position", Integer(), primary_key=True),
+        Column("text", String(), nullable=False),
+    )
+    op.create_index(
+        "ix_labels_lang_kind_text",
+        "labels",
+        ["lang", "kind", "text"],
+        postgresql_where=text("kind <> 'SCOPE_NOTE'"),
+    )
+    op.execute(f"INSERT INTO labels (member_id, kind, lang, position, text) {LABELS}")
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Remove the labels table."""
+    op.drop_index("ix_labels_lang_kind_text", "labels")
+    op.drop_table("labels")
+    op.execute("DROP TYPE labelkind")
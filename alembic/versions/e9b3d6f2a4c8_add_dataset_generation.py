@@ -0,0 +1,37 @@
+# pylint: disable=invalid-name
+"""add_dataset_generation
+
+Revision ID: e9b3d6f2a4c8
+Revises: c2f8a5d1e7b4
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import Column, DateTime, Integer
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e9b3d6f2a4c8"
+down_revision: Union[str, None] = "c2f8a5d1e7b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Add the dataset generation bumped by each ingestion."""
+    op.create_table(
+        "dataset_generation",
+        Column("id", Integer(), primary_key=True),
+        Column("generation", Integer(), nullable=False),
+        Column("loaded_at", DateTime(timezone=True), nullable=False),
+    )
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Remove the dataset generation bumped by each ingestion."""
+    op.drop_table("dataset_generation")
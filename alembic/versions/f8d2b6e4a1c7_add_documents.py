@@ -0,0 +1,44 @@
+# pylint: disable=invalid-name
+"""add_documents
+
+Revision ID: f8d2b6e4a1c7
+Revises: e5c1a7f3b942
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import Column, Enum, LargeBinary, String
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f8d2b6e4a1c7"
+down_revision: Union[str, None] = "e5c1a7f3b942"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# pylint: disable=no-member
+def upgrade() -> None:
+    """Add the documents table, filled by the materialization after ingestion."""
+    op.create_table(
+        "documents",
+        Column(
+            "type",
+            Enum("CONCEPT", "CONCEPT_SCHEME", "COLLECTION", name="documenttype"),
+            primary_key=True,
+        ),
+        Column("iri", String(), primary_key=True),
+        Column("lang", String(), primary_key=True),
+        Column("version", String(), primary_key=True),
+        Column("content", LargeBinary(), nullable=False),
+    )
+
+
+# pylint: disable=no-member
+def downgrade() -> None:
+    """Remove the documents table."""
+    op.drop_table("documents")
+    op.execute("DROP TYPE documenttype")
@@ -0,0 +1,199 @@
+"""Columnar analytics exports for the dds_glossary package.
+
+This module requires the `analytics` optional dependencies, PyArrow and DuckDB.
+"""
+
+import json
+from enum import Enum
+from pathlib import Path
+from typing import Any, Final
+
+import duckdb
+import pyarrow as pa
+from pyarrow import parquet
+from sqlalchemy import Boolean, Integer, LargeBinary, Select, select
+from sqlalchemy.engine import Connection, Engine
+
+from .database import select_member_rows
+from .migration import quote_identifier
+from .model import Base, Label, SemanticRelation
+
+# The number of rows written at once to the Parquet files.
+BATCH_SIZE: Final[int] = 10000
+
+
+def arrow_type(column_type: Any) -> pa.DataType:
+    """
+    Get the Arrow type of the values of a column type. The enums are stored as their
+    values, and the JSON labels by language as serialized JSON strings.
+
+    Args:
+        column_type (Any): The SQLAlchemy column type.
+
+    Returns:
+        pa.DataType: The Arrow type.
+    """
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, LargeBinary):
+        return pa.binary()
+    return pa.string()
+
+
+def arrow_value(value: Any, data_type: pa.DataType) -> Any:
+    """
+    Convert a column value to its Arrow type, see `arrow_type`.
+
+    Args:
+        value (Any): The column value.
+        data_type (pa.DataType): The Arrow type.
+
+    Returns:
+        Any: The converted value.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (dict, list)) and pa.types.is_string(data_type):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def write_parquet(
+    connection: Connection,
+    statement: Select,
+    path: Path,
+    types: dict[str, pa.DataType] | None = None,
+) -> Path:
+    """
+    Write the rows of a statement to a Parquet file, streamed in batches of
+    `BATCH_SIZE` rows.
+
+    Args:
+        connection (Connection): The database connection.
+        statement (Select): The statement.
+        path (Path): The path of the Parquet file.
+        types (dict[str, pa.DataType] | None): The Arrow types of the columns, by
+            name, overriding the `arrow_type` of their column type. Defaults to
+            None.
+
+    Returns:
+        Path: The path of the Parquet file.
+    """
+    types = types or {}
+    schema = pa.schema(
+        [
+            (name, types.get(name, arrow_type(column.type)))
+            for name, column in statement.selected_columns.items()
+        ]
+    )
+    result = connection.execution_options(yield_per=BATCH_SIZE).execute(statement)
+    with parquet.ParquetWriter(path, schema) as writer:
+        for rows in result.partitions():
+            writer.write_batch(
+                pa.RecordBatch.from_arrays(
+                    [
+                        pa.array(
+                            [arrow_value(row[index], field.type) for row in rows],
+                            field.type,
+                        )
+                        for index, field in enumerate(schema)
+                    ],
+                    schema=schema,
+                )
+            )
+    return path
+
+
+def select_relations() -> Select:
+    """
+    Build a statement selecting the semantic relations with the IRIs of their
+    concepts, instead of their surrogate keys.
+
+    Returns:
+        Select: The statement.
+    """
+    return select(
+        SemanticRelation.source_concept_iri,
+        SemanticRelation.target_concept_iri,
+        SemanticRelation.type,
+        SemanticRelation.version,
+    ).order_by(SemanticRelation.source_concept_id, SemanticRelation.target_concept_id)
+
+
+def write_duckdb(paths: list[Path], duckdb_path: str | Path) -> Path:
+    """
+    Write a DuckDB database file, replacing the file if it exists, with a table
+    loaded from each Parquet file, named after the file.
+
+    Args:
+        paths (list[Path]): The paths of the Parquet files.
+        duckdb_path (str | Path): The path of the DuckDB database file.
+
+    Returns:
+        Path: The path of the DuckDB database file.
+    """
+    duckdb_path = Path(duckdb_path)
+    duckdb_path.unlink(missing_ok=True)
+    with duckdb.connect(str(duckdb_path)) as connection:
+        for path in paths:
+            connection.execute(
+                f"CREATE TABLE {quote_identifier(path.stem)} AS "
+                "SELECT * FROM read_parquet(?)",
+                [str(path)],
+            )
+    return duckdb_path
+
+
+def export_analytics(
+    engine: Engine,
+    directory: str | Path,
+    duckdb_path: str | Path | None = None,
+) -> list[Path]:
+    """
+    Export the database as Parquet files, for the analytics reading whole tables
+    instead of querying the API. Each table is written as is, the semantic
+    relations with the IRIs of their concepts as `relations`, and the members with
+    their labels in each stored language, as returned by `select_member_rows`, as
+    `labels_<lang>`. The files can also be loaded in a DuckDB database file.
+
+    Args:
+        engine (Engine): The database engine.
+        directory (str | Path): The directory of the Parquet files, created if it
+            does not exist.
+        duckdb_path (str | Path | None): The path of the DuckDB database file.
+            Defaults to None, for no DuckDB database.
+
+    Returns:
+        list[Path]: The paths of the Parquet files.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    with engine.connect() as connection:
+        paths = [
+            write_parquet(
+                connection, select(table), directory / f"{table.name}.parquet"
+            )
+            for table in Base.metadata.sorted_tables
+        ]
+        paths.append(
+            write_parquet(
+                connection, select_relations(), directory / "relations.parquet"
+            )
+        )
+        languages = connection.scalars(
+            select(Label.lang).distinct().order_by(Label.lang)
+        ).all()
+        paths.extend(
+            write_parquet(
+                connection,
+                select_member_rows(lang),
+                directory / f"labels_{lang}.parquet",
+                {"altLabels": pa.list_(pa.string())},
+            )
+            for lang in languages
+        )
+    if duckdb_path is not None:
+        write_duckdb(paths, duckdb_path)
+    return paths
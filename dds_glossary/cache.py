@@ -0,0 +1,210 @@
+"""In-process response cache for the dds_glossary package."""
+
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+from inspect import signature
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Hashable, TypeVar
+
+import orjson
+from pydantic import BaseModel
+
+from .model import UNLOADED_AT
+from .schema import CacheStatisticsResponse
+
+ResultT = TypeVar("ResultT")
+MethodT = TypeVar("MethodT", bound=Callable[..., Any])
+
+
+def result_size(result: Any) -> int:
+    """
+    Estimate the size of a cached result as the size of its JSON serialization, or
+    its size for the precomputed documents, already serialized.
+
+    Args:
+        result (Any): The result.
+
+    Returns:
+        int: The size in bytes.
+    """
+    if isinstance(result, bytes):
+        return len(result)
+    return len(orjson.dumps(result, default=BaseModel.model_dump))
+
+
+# pylint: disable-next=too-many-instance-attributes
+class ResponseCache:
+    """
+    Bounded in-process cache of the results of the read methods of the glossary
+    controller, decorated by `cached`. The least recently used results are evicted
+    once the cache holds more than `max_entries` results, or more than `max_bytes`
+    by `result_size`.
+
+    The datasets only change when they are ingested, which bumps the dataset
+    generation stored in the database. The cache loads it with `load_generation`
+    at most every `ttl` seconds, see `refresh`, and drops its results when it
+    changed, so that the caches of every process follow the ingestions of any
+    process. A result computed while the generation changes is not stored, as it
+    may have read the previous datasets.
+
+    Attributes:
+        load_generation (Callable[[], tuple[int, datetime]]): The function loading
+            the dataset generation and when it was bumped.
+        max_entries (int): The maximum number of results.
+        max_bytes (int): The maximum total size of the results, in bytes.
+        ttl (float): The number of seconds the loaded generation is trusted.
+        generation (int): The dataset generation.
+        modified (datetime): When the generation was bumped, to the second, in
+            UTC, or `UNLOADED_AT` until it is loaded.
+        size (int): The total size of the results, in bytes.
+        hits (int): The number of results served from the cache.
+        misses (int): The number of results computed.
+        evictions (int): The number of results evicted.
+    """
+
+    def __init__(
+        self,
+        load_generation: Callable[[], tuple[int, datetime]],
+        max_entries: int = 1024,
+        max_bytes: int = 64 << 20,
+        ttl: float = 1.0,
+    ) -> None:
+        self.load_generation = load_generation
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.generation = 0
+        self.modified = UNLOADED_AT
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = Lock()
+        self._refresh_lock = Lock()
+        self._expires_at = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_call(self, key: Hashable, function: Callable[[], ResultT]) -> ResultT:
+        """
+        Get the cached result of a key, or compute it by calling the function, and
+        store it, outside the lock so that the calls run concurrently. The dataset
+        generation is refreshed by the caller first, see `refresh`, as it may query
+        the database.
+
+        Args:
+            key (Hashable): The key of the result.
+            function (Callable[[], ResultT]): The function computing the result.
+
+        Returns:
+            ResultT: The result.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            generation = self.generation
+        result = function()
+        size = result_size(result)
+        with self._lock:
+            if (
+                generation == self.generation
+                and key not in self._entries
+                and size <= self.max_bytes
+            ):
+                self._entries[key] = (result, size)
+                self.size += size
+                self._evict()
+        return result
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Load the dataset generation, if it was loaded more than `ttl` seconds ago
+        or if forced, dropping the cached results when it changed. A single thread
+        loads it at once, the others waiting for it.
+
+        Args:
+            force (bool): Whether to load the generation even if it was loaded less
+                than `ttl` seconds ago, once the datasets are ingested. Defaults to
+                False.
+
+        Returns:
+            int: The dataset generation.
+        """
+        if not force and monotonic() < self._expires_at:
+            return self.generation
+        with self._refresh_lock:
+            if force or monotonic() >= self._expires_at:
+                generation, modified = self.load_generation()
+                with self._lock:
+                    if (generation, modified) != (self.generation, self.modified):
+                        self.generation = generation
+                        self.modified = modified
+                        self._entries.clear()
+                        self.size = 0
+                self._expires_at = monotonic() + self.ttl
+            return self.generation
+
+    def statistics(self) -> CacheStatisticsResponse:
+        """
+        Get the statistics of the cache.
+
+        Returns:
+            CacheStatisticsResponse: The statistics.
+        """
+        with self._lock:
+            return CacheStatisticsResponse(
+                generation=self.generation,
+                entries=len(self._entries),
+                bytes=self.size,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.size > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+
+def cached(method: MethodT) -> MethodT:
+    """
+    Decorate a read method of the glossary controller to cache its results in the
+    `cache` of the controller, if it has one, keyed by the method name and its
+    arguments, with their defaults, so that the calls with the same arguments
+    share their result however they are passed. The dataset generation is refreshed
+    first, except for the methods run on the event loop, whose generation is
+    refreshed in the threadpool by `GlossaryController.run_async`, so that its
+    blocking query does not hold the event loop. The controllers reading from the
+    primary database bypass the cache, to read the latest ingested data.
+
+    Args:
+        method (MethodT): The read method, whose arguments are hashable.
+
+    Returns:
+        MethodT: The decorated method.
+    """
+    method_signature = signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache is None or self.read_primary:
+            return method(self, *args, **kwargs)
+        arguments = method_signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        key = (method.__name__, *list(arguments.arguments.values())[1:])
+        if not self.reads_async:
+            self.cache.refresh()
+        return self.cache.get_or_call(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper  # type: ignore[return-value]
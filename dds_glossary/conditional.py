@@ -0,0 +1,138 @@
+"""HTTP conditional requests for the dds_glossary package."""
+
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import sha256
+from http import HTTPStatus
+from typing import Final, Mapping
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import ResponseCache
+
+# The key of the request state holding the headers of the conditional response.
+STATE_KEY: Final[str] = "conditional_headers"
+
+
+def entity_tag(cache: ResponseCache, request: Request) -> str:
+    """
+    Build the strong entity tag of the response to a read request, from the
+    dataset generation loaded by the cache from the database, see
+    `ResponseCache.refresh`, which identifies the data the response is read from
+    in every process, and from the path, the query parameters and the `Accept`
+    header of the request, which select the response. The query parameters are
+    sorted, so that the requests passing them in any order share their tag.
+
+    Args:
+        cache (ResponseCache): The response cache.
+        request (Request): The request.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    parts = [
+        str(cache.generation),
+        cache.modified.isoformat(),
+        request.url.path,
+        *(
+            f"{key}={value}"
+            for key, value in sorted(request.query_params.multi_items())
+        ),
+        request.headers.get("accept", ""),
+    ]
+    digest = sha256("\n".join(parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def conditional_headers(
+    cache: ResponseCache,
+    request: Request,
+    cache_control: str,
+) -> dict[str, str]:
+    """
+    Build the validators of the response to a read request, its `ETag` by
+    `entity_tag` and its `Last-Modified` date, when the dataset generation was
+    last bumped, with its `Cache-Control` policy.
+
+    Args:
+        cache (ResponseCache): The response cache.
+        request (Request): The request.
+        cache_control (str): The `Cache-Control` policy, or "" for none.
+
+    Returns:
+        dict[str, str]: The headers.
+    """
+    headers = {
+        "ETag": entity_tag(cache, request),
+        "Last-Modified": format_datetime(cache.modified, usegmt=True),
+        "Vary": "Accept",
+    }
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def is_not_modified(
+    request_headers: Mapping[str, str],
+    headers: Mapping[str, str],
+) -> bool:
+    """
+    Check whether the client of a request holds the current response, by its
+    `If-None-Match` header, or by its `If-Modified-Since` header if it has no
+    `If-None-Match` header.
+
+    Args:
+        request_headers (Mapping[str, str]): The headers of the request.
+        headers (Mapping[str, str]): The validators of the response, see
+            `conditional_headers`.
+
+    Returns:
+        bool: Whether the response is not modified.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or headers["ETag"] in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return parsedate_to_datetime(headers["Last-Modified"]) <= since
+
+
+class ConditionalRequestMiddleware:  # pylint: disable=too-few-public-methods
+    """
+    Middleware setting the validators of the successful read responses, stored in
+    the request state by the `check_not_modified` dependency of their route, as
+    the routes build their responses themselves.
+
+    Attributes:
+        app (ASGIApp): The application.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] == HTTPStatus.OK
+            ):
+                headers = scope.get("state", {}).get(STATE_KEY)
+                if headers:
+                    MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,132 +1,1762 @@
+# pylint: disable=too-many-lines
 """Database classes for the dds_glossary package."""
 
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from hashlib import blake2s
+from itertools import count
+from math import ceil
 from os import getenv as os_getenv
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Any, Final, Iterator, Sequence, TypeVar
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, joinedload, with_polymorphic
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Delete,
+    Enum,
+    Integer,
+    MetaData,
+    RowMapping,
+    ScalarSelect,
+    Select,
+    String,
+    Table,
+    and_,
+    bindparam,
+    create_engine,
+    delete,
+    event,
+    exists,
+    false,
+    func,
+    inspect,
+    label,
+    literal,
+    literal_column,
+    make_url,
+    or_,
+    select,
+    text,
+    true,
+    tuple_,
+    type_coerce,
+    union,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by, insert
+from sqlalchemy.engine import URL, Connection, Engine
+from sqlalchemy.engine.interfaces import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import (
+    Session,
+    aliased,
+    defer,
+    joinedload,
+    selectinload,
+    with_expression,
+    with_polymorphic,
+)
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.sql.elements import BindParameter
 from sqlalchemy_utils import create_database, database_exists, drop_database
 
-from .model import Base, Collection, Concept, ConceptScheme, Member, SemanticRelation
+from .enums import DocumentType, LabelKind, MemberType, SemanticRelationType
+from .model import (
+    LABELS_JSON,
+    UNLOADED_AT,
+    Base,
+    Collection,
+    Concept,
+    ConceptScheme,
+    DatasetGeneration,
+    Document,
+    IriPrefix,
+    Label,
+    Member,
+    SemanticRelation,
+    in_collection,
+    in_scheme,
+    in_version,
+    scheme_in_version,
+)
+
+StoredT = TypeVar("StoredT", ConceptScheme, Member)
+
+# The tables holding rows scoped to a dataset version, in their `version` column.
+PARTITIONED_TABLES: Final[list[Table]] = [
+    Base.metadata.tables[SemanticRelation.__tablename__],
+    in_version,
+]
+
+# The FTS5 index of the preferred and alternative labels of the SQLite files
+# written by `export_sqlite`, matching the substrings of at least
+# `LABELS_FTS_MIN_LENGTH` characters with its trigram tokenizer. It is created by
+# `export_sqlite` only, hence its own metadata.
+LABELS_FTS: Final[Table] = Table(
+    "labels_fts",
+    MetaData(),
+    Column("member_id", Integer),
+    Column("text", String),
+)
+LABELS_FTS_MIN_LENGTH: Final[int] = 3
+
+# The number of rows copied at once by `export_sqlite`.
+EXPORT_BATCH_SIZE: Final[int] = 10000
+
+# The number of rows read at once by the streamed responses, see `stream_rows`.
+STREAM_BATCH_SIZE: Final[int] = 1000
+
+# The number of statements cached by each of the statement builders of the hot
+# read functions, by shape and language.
+STATEMENT_CACHE_SIZE: Final[int] = 256
+
+# The members of the concept schemes and collections, with their concept and
+# collection columns, shared by the cached statements.
+MEMBER_POLYMORPHIC: Final = with_polymorphic(
+    Member, [Concept, Collection], aliased=True
+)
 
 
 def init_engine(
     database_url: str | None = None,
     drop_database_flag: bool = False,
+    partitioned: bool | None = None,
 ) -> Engine:
     """
     Initialize the database engine. If the database does not exist, create it.
     If the drop_database_flag is set, drop the database if it exists. Create the
-    tables if they do not exist.
+    tables if they do not exist. SQLite databases are files written by
+    `export_sqlite`, opened read-only as they are, see `init_sqlite_engine`.
+
+    Args:
+        database_url (str, optional): The database URL. If None, use the
+            `DATABASE_URL` environment variable.
+        drop_database_flag (bool): Flag to drop the database if it exists.
+        partitioned (bool, optional): Flag to create the version scoped tables
+            partitioned by version, see `create_partitioned_tables`. If None, use
+            the `DATABASE_PARTITIONED` environment variable, defaulting to False.
+            The engine arguments are the ones of `engine_arguments`.
+
+    Returns:
+        Engine: The database engine.
+
+    Raises:
+        ValueError: If the DATABASE_URL environment variable is not set, in case the
+            the `database_url` argument is None.
+    """
+    if database_url is None:
+        database_url = os_getenv("DATABASE_URL")
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable is not set.")
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return init_sqlite_engine(url.database or "")
+    if partitioned is None:
+        partitioned = os_getenv("DATABASE_PARTITIONED", "").lower() in ("1", "true")
+    engine = create_engine(database_url, **engine_arguments(database_url))
+
+    if not database_exists(engine.url):
+        create_database(engine.url)
+    elif drop_database_flag:
+        drop_database(engine.url)
+        create_database(engine.url)
+
+    if partitioned:
+        Base.metadata.create_all(
+            engine,
+            tables=[
+                table
+                for table in Base.metadata.sorted_tables
+                if table not in PARTITIONED_TABLES
+            ],
+        )
+        with engine.begin() as connection:
+            create_partitioned_tables(connection)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def init_async_engine(database_url: str | None = None) -> AsyncEngine | None:
+    """
+    Initialize the async engine of a PostgreSQL database, with psycopg in its async
+    mode, for the read functions run by `GlossaryController.run_within_budget`
+    without a worker thread. The database and its tables are created by
+    `init_engine`.
+
+    Args:
+        database_url (str, optional): The database URL. If None, use the
+            `DATABASE_URL` environment variable.
+
+    Returns:
+        AsyncEngine | None: The async engine, or None for the SQLite files, which
+            are read by the threadpool, or if the `DATABASE_ASYNC` environment
+            variable is false.
+    """
+    if database_url is None:
+        database_url = os_getenv("DATABASE_URL", "")
+    url = make_url(database_url)
+    enabled = os_getenv("DATABASE_ASYNC", "true").lower() in ("1", "true")
+    if not enabled or url.get_backend_name() != "postgresql":
+        return None
+    async_url = url.set(drivername="postgresql+psycopg")
+    return create_async_engine(async_url, **engine_arguments(async_url))
+
+
+def engine_arguments(database_url: str | URL) -> dict:
+    """
+    Get the arguments of the engines of a database URL: the seconds waited for a
+    pooled connection, from the `DATABASE_POOL_TIMEOUT` environment variable,
+    defaulting to 30, and the connection arguments of `connect_arguments`.
+
+    Args:
+        database_url (str | URL): The database URL.
+
+    Returns:
+        dict: The engine arguments.
+    """
+    return {
+        "pool_timeout": float(os_getenv("DATABASE_POOL_TIMEOUT", "30")),
+        "connect_args": connect_arguments(database_url),
+    }
+
+
+def connect_arguments(database_url: str | URL) -> dict:
+    """
+    Get the arguments of the DBAPI connections of a database URL. The psycopg
+    connections prepare the statements on the server from their second execution,
+    or from the `DATABASE_PREPARE_THRESHOLD` environment variable one, so that
+    the repeated statements of the read functions are parsed and planned once per
+    connection. An empty threshold disables the prepared statements, for the
+    connection poolers which do not support them.
+
+    Args:
+        database_url (str | URL): The database URL.
+
+    Returns:
+        dict: The connection arguments.
+    """
+    if make_url(database_url).get_driver_name() != "psycopg":
+        return {}
+    threshold = os_getenv("DATABASE_PREPARE_THRESHOLD", "1")
+    return {"prepare_threshold": int(threshold) if threshold else None}
+
+
+def init_sqlite_engine(path: str | Path) -> Engine:
+    """
+    Initialize the engine of a SQLite file written by `export_sqlite`, opened
+    read-only so that it can be shared by the processes serving it.
+
+    Args:
+        path (str | Path): The path of the SQLite file.
+
+    Returns:
+        Engine: The database engine.
+
+    Raises:
+        ValueError: If the SQLite file does not exist.
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise ValueError(f"SQLite database {path} does not exist.")
+    return create_engine(f"sqlite:///file:{path.resolve()}?mode=ro&uri=true")
+
+
+class ReplicaSet:
+    """
+    Read replicas of the database, handed out round-robin by `get_engine` to the
+    read functions, while the ingestion and the migrations use the primary engine
+    of `init_engine`. A replica failing to connect, or losing its connection, is
+    ejected for `eject_seconds`, then handed out again.
+
+    Attributes:
+        engines (list[Engine]): The engines of the replicas.
+        eject_seconds (float): The number of seconds a failing replica is ejected.
+        ejected_until (dict[Engine, float]): The monotonic time at which each
+            ejected replica is handed out again.
+    """
+
+    def __init__(self, engines: list[Engine], eject_seconds: float = 30.0) -> None:
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        self.ejected_until: dict[Engine, float] = {}
+        self._counter = count()
+        for engine in engines:
+            event.listen(engine, "handle_error", partial(self._handle_error, engine))
+
+    @classmethod
+    def from_urls(cls, urls: list[str], eject_seconds: float = 30.0) -> "ReplicaSet":
+        """
+        Create the replica set of the database URLs, the SQLite URLs being opened
+        like in `init_engine`. The replica databases are not created, as they are
+        maintained by the replication of the primary one.
+
+        Args:
+            urls (list[str]): The database URLs of the replicas.
+            eject_seconds (float): The number of seconds a failing replica is
+                ejected. Defaults to 30.
+
+        Returns:
+            ReplicaSet: The replica set.
+        """
+        return cls(
+            [
+                (
+                    init_sqlite_engine(make_url(url).database or "")
+                    if make_url(url).get_backend_name() == "sqlite"
+                    else create_engine(url, pool_pre_ping=True, **engine_arguments(url))
+                )
+                for url in urls
+            ],
+            eject_seconds=eject_seconds,
+        )
+
+    def get_engine(self) -> Engine | None:
+        """
+        Get the next replica engine which is not ejected.
+
+        Returns:
+            Engine | None: The replica engine, or None if there are no replicas or
+                if they are all ejected, for the read functions to use the primary.
+        """
+        now = monotonic()
+        for _ in self.engines:
+            engine = self.engines[next(self._counter) % len(self.engines)]
+            if self.ejected_until.get(engine, 0.0) <= now:
+                return engine
+        return None
+
+    def eject(self, engine: Engine) -> None:
+        """
+        Eject a replica for `eject_seconds`.
+
+        Args:
+            engine (Engine): The replica engine.
+        """
+        self.ejected_until[engine] = monotonic() + self.eject_seconds
+
+    def _handle_error(self, engine: Engine, context: ExceptionContext) -> None:
+        # The connection is missing when the replica failed to connect.
+        if context.is_disconnect or context.connection is None:
+            self.eject(engine)
+
+
+class QueryBudget:
+    """
+    Time budget of the queries of a request. The queries of the engines bound by
+    `bind` stop being executed once the budget is exceeded or cancelled, and on
+    PostgreSQL their transactions run with a `statement_timeout` of the remaining
+    time, so that the server stops them even if the request is gone. The running
+    queries are interrupted by `interrupt`, when the deadline is reached, and by
+    `cancel`, when the client disconnects.
+
+    Attributes:
+        seconds (float): The budget in seconds.
+        deadline (float): The monotonic time at which the budget is exceeded.
+        cancelled (bool): Whether the queries were cancelled by `cancel`.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.deadline = monotonic() + seconds
+        self.cancelled = False
+        self._connections: set[Any] = set()
+        self._lock = Lock()
+
+    @property
+    def exceeded(self) -> bool:
+        """Whether the deadline is reached."""
+        return self.remaining() <= 0.0
+
+    def remaining(self) -> float:
+        """
+        Get the remaining time of the budget.
+
+        Returns:
+            float: The remaining time in seconds, 0 once the deadline is reached.
+        """
+        return max(0.0, self.deadline - monotonic())
+
+    def bind(self, engine: Engine) -> Engine:
+        """
+        Bind the budget to the queries of an engine.
+
+        Args:
+            engine (Engine): The database engine.
+
+        Returns:
+            Engine: The engine sharing the connection pool of `engine`, with the
+                queries bound to the budget.
+        """
+        return engine.execution_options(query_budget=self)
+
+    def interrupt(self) -> None:
+        """
+        Interrupt the running queries, from any thread, with a PostgreSQL cancel
+        request or a SQLite interrupt.
+        """
+        with self._lock:
+            for driver_connection in self._connections:
+                if hasattr(driver_connection, "cancel"):
+                    driver_connection.cancel()
+                else:
+                    driver_connection.interrupt()
+
+    def cancel(self) -> None:
+        """Cancel the queries, interrupting the running ones, from any thread."""
+        self.cancelled = True
+        self.interrupt()
+
+    def check(self) -> None:
+        """
+        Check that the queries can still run.
+
+        Raises:
+            TimeoutError: If the budget is exceeded or cancelled.
+        """
+        if self.cancelled or self.exceeded:
+            raise TimeoutError(f"The query time budget of {self.seconds}s is over.")
+
+    def track(self, driver_connection: Any, running: bool) -> None:
+        """
+        Track the connections running a query, interrupted by `interrupt`.
+
+        Args:
+            driver_connection (Any): The connection of the driver, such as a
+                psycopg connection, in its sync or async mode.
+            running (bool): Whether the connection starts or stops running a query.
+        """
+        with self._lock:
+            if running:
+                self._connections.add(driver_connection)
+            else:
+                self._connections.discard(driver_connection)
+
+
+def connection_query_budget(connection: Connection) -> QueryBudget | None:
+    """
+    Get the time budget bound to the queries of a connection, see
+    `QueryBudget.bind`.
+
+    Args:
+        connection (Connection): The database connection.
+
+    Returns:
+        QueryBudget | None: The time budget, or None if there is none.
+    """
+    return connection.get_execution_options().get("query_budget")
+
+
+@event.listens_for(Engine, "begin")
+def _apply_statement_timeout(connection: Connection) -> None:
+    budget = connection_query_budget(connection)
+    if budget is None or connection.dialect.name != "postgresql":
+        return
+    budget.check()
+    # A zero timeout would disable it, hence at least one millisecond.
+    timeout = max(1, ceil(budget.remaining() * 1000))
+    # Bound instead of inlined, so that the statement text stays the same, and is
+    # prepared once like the other statements, see `connect_arguments`.
+    connection.execute(
+        select(func.set_config("statement_timeout", str(timeout), literal(True)))
+    )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_budgeted_query(connection: Connection, *_: Any) -> None:
+    budget = connection_query_budget(connection)
+    if budget is not None:
+        budget.check()
+        budget.track(connection.connection.driver_connection, running=True)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_budgeted_query(connection: Connection, *_: Any) -> None:
+    budget = connection_query_budget(connection)
+    if budget is not None:
+        budget.track(connection.connection.driver_connection, running=False)
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_budgeted_query(context: ExceptionContext) -> None:
+    if context.connection is None:
+        return
+    budget = connection_query_budget(context.connection)
+    if budget is not None and not context.connection.invalidated:
+        budget.track(context.connection.connection.driver_connection, running=False)
+
+
+def is_sqlite(engine: Engine | Session) -> bool:
+    """
+    Check whether an engine reads a SQLite file written by `export_sqlite`.
+
+    Args:
+        engine (Engine | Session): The database engine, or a session bound to it.
+
+    Returns:
+        bool: Whether the engine reads a SQLite file.
+    """
+    if isinstance(engine, Session):
+        return engine.get_bind().dialect.name == "sqlite"
+    return engine.dialect.name == "sqlite"
+
+
+def export_sqlite(engine: Engine, path: str | Path) -> Path:
+    """
+    Export the database to a SQLite file, replacing the file if it exists, with the
+    same tables and data, and with the `LABELS_FTS` full text index of the labels.
+    The file is served read-only by the engines of `init_sqlite_engine`, for
+    example copied to every API node at deploy time instead of querying a server.
+
+    Args:
+        engine (Engine): The database engine.
+        path (str | Path): The path of the SQLite file.
+
+    Returns:
+        Path: The path of the SQLite file.
+    """
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    sqlite_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sqlite_engine)
+    with engine.connect() as source, sqlite_engine.begin() as target:
+        for table in Base.metadata.sorted_tables:
+            result = source.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(
+                select(table)
+            )
+            for rows in result.mappings().partitions():
+                target.execute(table.insert(), [dict(row) for row in rows])
+        target.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE {LABELS_FTS.name} USING fts5(text, member_id "
+            f"UNINDEXED, content='{Label.__tablename__}', "
+            "tokenize='trigram case_sensitive 1')"
+        )
+        target.exec_driver_sql(
+            f"INSERT INTO {LABELS_FTS.name} (rowid, text, member_id) "
+            f"SELECT rowid, text, member_id FROM {Label.__tablename__} "
+            f"WHERE kind <> '{LabelKind.SCOPE_NOTE.name}'"
+        )
+        target.exec_driver_sql("ANALYZE")
+    sqlite_engine.dispose()
+    return path
+
+
+def create_partitioned_tables(connection: Connection) -> None:
+    """
+    Create the version scoped tables, if they do not exist, as tables list
+    partitioned by version, with a default partition for the rows saved without a
+    partition. Each dataset version is then stored in its own partition, created by
+    `create_version_partitions`, so that the queries of a version only scan its
+    partition, and that a version is deleted by dropping its partition. The tables
+    they reference must already exist.
+
+    Args:
+        connection (Connection): The database connection.
+    """
+    for table in PARTITIONED_TABLES:
+        if inspect(connection).has_table(table.name):
+            continue
+        for column in table.columns:
+            if isinstance(column.type, Enum):
+                column.type.create(connection, checkfirst=True)
+        create_table = CreateTable(table).compile(dialect=connection.dialect)
+        connection.exec_driver_sql(
+            f"{str(create_table).rstrip()} PARTITION BY LIST (version)"
+        )
+        connection.exec_driver_sql(
+            f"CREATE TABLE {table.name}_default PARTITION OF {table.name} DEFAULT"
+        )
+        for index in table.indexes:
+            index.create(connection)
+
+
+def version_partition(table: Table, version: str) -> str:
+    """
+    Get the name of the partition of a table holding a dataset version.
+
+    Args:
+        table (Table): The partitioned table.
+        version (str): The dataset version.
+
+    Returns:
+        str: The name of the partition.
+    """
+    digest = blake2s(version.encode(), digest_size=8).hexdigest()
+    return f"{table.name}_{digest}"
+
+
+def is_partitioned(connection: Connection, table: Table) -> bool:
+    """
+    Check whether a table is partitioned.
+
+    Args:
+        connection (Connection): The database connection.
+        table (Table): The table.
+
+    Returns:
+        bool: Whether the table is partitioned.
+    """
+    return bool(
+        connection.scalar(
+            text(
+                "SELECT EXISTS (SELECT FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:table))"
+            ),
+            {"table": table.name},
+        )
+    )
+
+
+def create_version_partitions(connection: Connection, version: str) -> None:
+    """
+    Create the partitions of a dataset version, if the version scoped tables are
+    partitioned and the partitions do not exist.
+
+    Args:
+        connection (Connection): The database connection.
+        version (str): The dataset version.
+    """
+    values = literal(version).compile(
+        dialect=connection.dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(connection, table):
+            connection.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {version_partition(table, version)} "
+                f"PARTITION OF {table.name} FOR VALUES IN ({values})"
+            )
+
+
+def delete_stale_documents(version: str | None = None) -> Delete:
+    """
+    Build a statement deleting the precomputed documents which may no longer match
+    the stored data once a dataset version is saved or deleted: the documents of
+    that version and those read across all the versions, or every document without
+    a version.
+
+    Args:
+        version (str | None): The dataset version. Defaults to None.
+
+    Returns:
+        Delete: The statement.
+    """
+    statement = delete(Document)
+    if version is not None:
+        statement = statement.where(Document.version.in_([version, ""]))
+    return statement
+
+
+def delete_version(engine: Engine | Session, version: str) -> None:
+    """
+    Delete a dataset version, before reloading it: its semantic relations and
+    memberships are dropped with their partitions if the version scoped tables are
+    partitioned, and deleted otherwise. The members stay stored, as they can be
+    shared with other versions, and the stale precomputed documents are deleted,
+    see `delete_stale_documents`.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to write
+            in, see `write_session`.
+        version (str): The dataset version.
+    """
+    with write_session(engine) as session:
+        connection = session.connection()
+        for table in PARTITIONED_TABLES:
+            if is_partitioned(connection, table):
+                connection.exec_driver_sql(
+                    f"DROP TABLE IF EXISTS {version_partition(table, version)}"
+                )
+            else:
+                connection.execute(delete(table).where(table.c.version == version))
+        connection.execute(
+            delete(scheme_in_version).where(scheme_in_version.c.version == version)
+        )
+        connection.execute(delete_stale_documents(version))
+
+
+def member_in_version(
+    member_id, version: str | BindParameter[str]
+) -> ColumnElement[bool]:
+    """
+    Build a condition checking that a member belongs to a dataset version.
+
+    Args:
+        member_id: The member id column.
+        version (str | BindParameter[str]): The dataset version, or its bound
+            parameter.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+    """
+    return exists().where(
+        in_version.c.version == version,
+        in_version.c.member_id == member_id,
+    )
+
+
+def scheme_in_dataset_version(
+    scheme_id, version: str | BindParameter[str]
+) -> ColumnElement[bool]:
+    """
+    Build a condition checking that a concept scheme belongs to a dataset version.
+
+    Args:
+        scheme_id: The concept scheme id column.
+        version (str | BindParameter[str]): The dataset version, or its bound
+            parameter.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+    """
+    return exists().where(
+        scheme_in_version.c.version == version,
+        scheme_in_version.c.scheme_id == scheme_id,
+    )
+
+
+def member_visible(
+    member, version: str | BindParameter[str] | None
+) -> ColumnElement[bool]:
+    """
+    Build a condition checking that a member is read for a dataset version: that it
+    belongs to the version, or, without a version, that it is the current row of
+    its IRI, see `merge_stored`.
+
+    Args:
+        member: The member entity, or an alias of it.
+        version (str | BindParameter[str] | None): The dataset version, or its
+            bound parameter, or None for the current rows.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+    """
+    if version is None:
+        return member.current == true()
+    return member_in_version(member.id, version)
+
+
+def scheme_visible(
+    scheme, version: str | BindParameter[str] | None
+) -> ColumnElement[bool]:
+    """
+    Build a condition checking that a concept scheme is read for a dataset version,
+    like `member_visible`.
+
+    Args:
+        scheme: The concept scheme entity.
+        version (str | BindParameter[str] | None): The dataset version, or its
+            bound parameter, or None for the current rows.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+    """
+    if version is None:
+        return scheme.current == true()
+    return scheme_in_dataset_version(scheme.id, version)
+
+
+def label_in_language(member_id, kind: LabelKind, lang: str) -> ScalarSelect[str]:
+    """
+    Build a subquery selecting the label of a member in a language, falling back to
+    English, then to an empty string, like `Base.get_in_language`.
+
+    Args:
+        member_id: The member id column.
+        kind (LabelKind): The kind of the label.
+        lang (str): The language code of the label.
+
+    Returns:
+        ScalarSelect[str]: The subquery.
+    """
+    return (
+        select(
+            func.coalesce(
+                func.min(Label.text).filter(Label.lang == lang),
+                func.min(Label.text).filter(Label.lang == "en"),
+                "",
+            )
+        )
+        .where(
+            Label.member_id == member_id,
+            Label.kind == kind,
+            Label.lang.in_([lang, "en"]),
+        )
+        .scalar_subquery()
+    )
+
+
+def labels_in_language(
+    member_id,
+    kind: LabelKind,
+    lang: str,
+) -> ScalarSelect[list[str]]:
+    """
+    Build a subquery selecting the ordered labels of a member in a language, falling
+    back to English, then to an empty list, like `Base.get_in_language_list`.
+
+    Args:
+        member_id: The member id column.
+        kind (LabelKind): The kind of the labels.
+        lang (str): The language code of the labels.
+
+    Returns:
+        ScalarSelect[list[str]]: The subquery.
+    """
+    texts = aggregate_order_by(Label.text, Label.position)
+    return (
+        select(
+            func.coalesce(
+                func.array_agg(texts).filter(Label.lang == lang),
+                func.array_agg(texts).filter(Label.lang == "en"),
+                literal([], ARRAY(String)),
+            )
+        )
+        .where(
+            Label.member_id == member_id,
+            Label.kind == kind,
+            Label.lang.in_([lang, "en"]),
+        )
+        .scalar_subquery()
+    )
+
+
+def load_in_language(
+    member,
+    lang: str,
+    concept=None,
+    labels_table: bool = True,
+    fields: frozenset[str] | None = None,
+) -> list:
+    """
+    Build the loader options reading the labels of the members in a single language
+    from the labels table, instead of loading their labels in every language.
+
+    Args:
+        member: The member entity, or an alias of it.
+        lang (str): The language code of the labels.
+        concept: The concept entity, or the concept part of the member alias, if the
+            concepts labels are loaded too. Defaults to None.
+        labels_table (bool): Whether to read the labels from the labels table, or to
+            project them from the labels by language columns, for the SQLite files
+            which cannot aggregate the ordered alternative labels. Defaults to True.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, to load
+            only their labels and columns, the `iri` and `notation` being always
+            loaded. Defaults to None, for all the fields.
+
+    Returns:
+        list: The loader options.
+    """
+    options = [defer(member.prefLabels)]
+    if fields is None or "prefLabel" in fields:
+        options.append(
+            with_expression(
+                member.prefLabelInLanguage,
+                (
+                    label_in_language(member.id, LabelKind.PREF_LABEL, lang)
+                    if labels_table
+                    else json_in_language(member.prefLabels, lang)
+                ),
+            )
+        )
+    if concept is None:
+        return options
+    options.extend([defer(concept.altLabels), defer(concept.scopeNotes)])
+    if fields is not None and "identifier" not in fields:
+        options.append(defer(concept.identifier))
+    if fields is None or "altLabels" in fields:
+        options.append(
+            with_expression(
+                concept.altLabelsInLanguage,
+                (
+                    labels_in_language(concept.id, LabelKind.ALT_LABEL, lang)
+                    if labels_table
+                    else json_list_in_language(concept.altLabels, lang)
+                ),
+            )
+        )
+    if fields is None or "scopeNote" in fields:
+        options.append(
+            with_expression(
+                concept.scopeNoteInLanguage,
+                (
+                    label_in_language(concept.id, LabelKind.SCOPE_NOTE, lang)
+                    if labels_table
+                    else json_in_language(concept.scopeNotes, lang)
+                ),
+            )
+        )
+    return options
+
+
+def json_in_language(column, lang: str) -> ColumnElement[str]:
+    """
+    Build an expression selecting the value of a JSON labels column in a language,
+    falling back to English, then to an empty string, like `Base.get_in_language`.
+
+    Args:
+        column: The JSON labels column, with the labels by language code.
+        lang (str): The language code of the label.
+
+    Returns:
+        ColumnElement[str]: The expression.
+    """
+    return func.coalesce(column[lang].as_string(), column["en"].as_string(), "")
+
+
+def json_list_in_language(column, lang: str) -> ColumnElement[list[str]]:
+    """
+    Build an expression selecting the list of a JSON labels column in a language,
+    falling back to English, then to an empty list, like `Base.get_in_language_list`.
+
+    Args:
+        column: The JSON labels column, with the lists of labels by language code.
+        lang (str): The language code of the labels.
+
+    Returns:
+        ColumnElement[list[str]]: The expression.
+    """
+    # SQLite returns a JSON null instead of NULL for the missing languages.
+    return func.coalesce(
+        func.nullif(column[lang], literal_column("'null'")),
+        func.nullif(column["en"], literal_column("'null'")),
+        literal([], LABELS_JSON),
+    )
+
+
+def labels_fts_match(member_id, search_term: str) -> ColumnElement[bool]:
+    """
+    Build a condition checking that a member has a preferred or alternative label,
+    in any language, containing the search term, using the `LABELS_FTS` index of the
+    SQLite files. The search term must have at least `LABELS_FTS_MIN_LENGTH`
+    characters.
+
+    Args:
+        member_id: The member id column.
+        search_term (str): The search term.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+    """
+    phrase = '"' + search_term.replace('"', '""') + '"'
+    return member_id.in_(
+        select(LABELS_FTS.c.member_id).where(LABELS_FTS.c.text.match(phrase))
+    )
+
+
+def select_member_rows(lang: str, fields: frozenset[str] | None = None) -> Select:
+    """
+    Build a statement selecting the members as rows with their labels in a single
+    language, projected by the database instead of loading the labels in every
+    language. The concept columns are empty for the other members.
+
+    Args:
+        lang (str): The language code of the labels.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, to select
+            only their columns, besides the `member_type`, `iri` and `notation`
+            always selected. Defaults to None, for all the fields.
+
+    Returns:
+        Select: The statement, with the keys of `Concept.to_dict` and the
+            `member_type`.
+    """
+    # The concepts table is joined instead of the Concept entity, which would join
+    # the members table again.
+    concepts = Concept.__table__.c
+    columns = {
+        "prefLabel": json_in_language(Member.prefLabels, lang).label("prefLabel"),
+        "identifier": concepts.identifier,
+        "altLabels": json_list_in_language(concepts.altLabels, lang).label("altLabels"),
+        "scopeNote": json_in_language(concepts.scopeNotes, lang).label("scopeNote"),
+    }
+    return (
+        select(
+            Member.member_type,
+            label("iri", Member.iri),
+            Member.notation,
+            *(
+                column
+                for name, column in columns.items()
+                if fields is None or name in fields
+            ),
+        )
+        .outerjoin(Concept.__table__, concepts.id == Member.id)
+        .order_by(Member.id)
+    )
+
+
+def paginate_members(
+    statement: Select,
+    limit: int | None = None,
+    after: tuple[str, str] | None = None,
+) -> Select:
+    """
+    Paginate a statement selecting members by keyset: order the members by their
+    notation and IRI, and select at most `limit` of them after the `after` ones,
+    so that the database only reads the rows of the page instead of skipping the
+    previous pages. The IRIs are ordered by their prefix id and local name, so
+    that the keyset is served by the index on the notation, prefix id and local
+    name of the members. Without `limit` nor `after`, the statement is returned
+    as is. The prefix of the `after` IRI must be stored, see `has_iri_prefix`, as
+    the keyset of an unknown prefix is NULL and selects no member.
+
+    Args:
+        statement (Select): The statement selecting members.
+        limit (int | None): The maximum number of members. Defaults to None, for
+            all of them.
+        after (tuple[str, str] | None): The notation and IRI of the last member of
+            the previous page. Defaults to None, for the first page.
+
+    Returns:
+        Select: The paginated statement.
+    """
+    if limit is None and after is None:
+        return statement
+    keyset = (Member.notation, Member.prefix_id, Member.local_name)
+    statement = statement.order_by(None).order_by(*keyset)
+    if after is not None:
+        notation, iri = after
+        prefix, local_name = IriPrefix.split(iri)
+        statement = statement.where(
+            tuple_(*keyset)
+            > tuple_(
+                literal(notation), IriPrefix.select_id(prefix), literal(local_name)
+            )
+        )
+    return statement.limit(limit)
+
+
+def has_iri_prefix(engine: Engine | Session, iri: str) -> bool:
+    """
+    Check whether the prefix of an IRI is stored in the database, see `IriPrefix`.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        iri (str): The IRI.
+
+    Returns:
+        bool: Whether the prefix is stored.
+    """
+    prefix, _ = IriPrefix.split(iri)
+    with read_session(engine) as session:
+        return (
+            session.execute(
+                select(IriPrefix.id).where(IriPrefix.prefix == prefix)
+            ).scalar()
+            is not None
+        )
+
+
+def get_stored(
+    session: Session,
+    entity: type[StoredT],
+    iris: list[str],
+) -> dict[str, list[StoredT]]:
+    """
+    Get the already stored entities among the IRIs, every row of their IRI, with
+    their concept schemes.
+
+    Args:
+        session (Session): The database session.
+        entity (type[StoredT]): The entity class, ConceptScheme or Member.
+        iris (list[str]): The IRIs to look up.
+
+    Returns:
+        dict[str, list[StoredT]]: The stored entities by IRI, in the order they
+            were stored.
+    """
+    stored_entity = MEMBER_POLYMORPHIC if entity is Member else entity
+    statement = (
+        session.query(stored_entity)
+        .where(stored_entity.iri.in_(iris))
+        .order_by(stored_entity.id)
+    )
+    if entity is Member:
+        statement = statement.options(selectinload(MEMBER_POLYMORPHIC.concept_schemes))
+    stored: dict[str, list[StoredT]] = {}
+    for stored_row in statement.all():
+        stored.setdefault(stored_row.iri, []).append(stored_row)
+    return stored
+
+
+def merge_stored(
+    session: Session,
+    entity: type[StoredT],
+    entities: list[StoredT],
+) -> list[StoredT]:
+    """
+    Replace the parsed entities by the rows storing the same content under the
+    same IRI, for example for another release of the same classification. The
+    entities whose content is not stored yet are saved as new rows, so that the
+    versions of the earlier releases keep reading their content from the stored
+    rows. The rows used by the saved dataset become the current rows of their IRI.
+
+    Args:
+        session (Session): The database session.
+        entity (type[StoredT]): The entity class, ConceptScheme or Member.
+        entities (list[StoredT]): The parsed entities.
+
+    Returns:
+        list[StoredT]: The entities to save, parsed or stored, in the same order.
+    """
+    stored = get_stored(session, entity, [parsed.iri for parsed in entities])
+    merged: list[StoredT] = []
+    reused: list[StoredT] = []
+    for parsed in entities:
+        rows = stored.get(parsed.iri, [])
+        content = parsed.get_content()
+        same = next((row for row in rows if row.get_content() == content), None)
+        for row in rows:
+            if row.current and row is not same:
+                row.current = False
+        if same is None:
+            merged.append(parsed)
+        else:
+            merged.append(same)
+            reused.append(same)
+    # The previous current rows are cleared before the reused rows are set, as the
+    # unique index of the current rows is not deferrable.
+    session.flush()
+    for row in reused:
+        row.current = True
+    return merged
+
+
+def merge_stored_members(
+    session: Session,
+    members: list[Member],
+    schemes: dict[str, ConceptScheme],
+) -> list[Member]:
+    """
+    Replace the parsed members storing the same content as stored ones by the
+    stored ones, see `merge_stored`, adding the concept schemes of the parsed
+    members to them.
+
+    Args:
+        session (Session): The database session.
+        members (list[Member]): The parsed members.
+        schemes (dict[str, ConceptScheme]): The concept schemes to use, by IRI.
+
+    Returns:
+        list[Member]: The members to save, parsed or stored.
+    """
+    merged = merge_stored(session, Member, members)
+    for member, merged_member in zip(members, merged):
+        member_schemes = [
+            schemes.get(scheme.iri, scheme) for scheme in member.concept_schemes
+        ]
+        if merged_member is member:
+            member.concept_schemes = member_schemes
+            continue
+        # Detach the parsed duplicate, so it is not cascaded into the session.
+        member.concept_schemes = []
+        stored_ids = {scheme.id for scheme in merged_member.concept_schemes}
+        merged_member.concept_schemes.extend(
+            scheme
+            for scheme in member_schemes
+            if scheme.id is None or scheme.id not in stored_ids
+        )
+    return merged
+
+
+def save_version(
+    session: Session,
+    version: str,
+    schemes: list[ConceptScheme],
+    members: list[Member],
+) -> None:
+    """
+    Record the concept schemes and members as part of a dataset version.
+
+    Args:
+        session (Session): The database session.
+        version (str): The dataset version.
+        schemes (list[ConceptScheme]): The concept schemes of the version.
+        members (list[Member]): The members of the version.
+    """
+    session.flush()
+    if schemes:
+        session.execute(
+            insert(scheme_in_version).on_conflict_do_nothing(),
+            [{"version": version, "scheme_id": scheme.id} for scheme in schemes],
+        )
+    if members:
+        session.execute(
+            insert(in_version).on_conflict_do_nothing(),
+            [{"version": version, "member_id": member.id} for member in members],
+        )
+
+
+def save_dataset(
+    engine: Engine | Session,
+    concept_schemes: list[ConceptScheme],
+    concepts: list[Concept],
+    collections: list[Collection],
+    semantic_relations: list[SemanticRelation],
+    version: str | None = None,
+) -> None:
+    """
+    Save a dataset in the database.
+
+    Concept schemes and members already stored under the same IRI with the same
+    content, for example by another release of the same classification, are shared
+    instead of being stored again: only their scheme and collection memberships are
+    added. Those whose content changed are stored again, as the current content of
+    their IRI, see `merge_stored`. If a `version`
+    is given, the concept schemes, members and semantic relations of the dataset
+    are recorded as part of that version, in its own partitions if the version
+    scoped tables are partitioned. The labels of the members are also stored one
+    row per language, by the `sync_labels` flush listener. The stale precomputed
+    documents are deleted, see `delete_stale_documents`.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to write in,
+            see `write_session`.
+        concept_schemes (list[ConceptScheme]): The concept schemes.
+        concepts (list[Concept]): The concepts.
+        collections (list[Collection]): The collections.
+        semantic_relations (list[SemanticRelation]): The semantic relations.
+        version (str | None): The dataset version. Defaults to None.
+    """
+    with write_session(engine) as session:
+        if version is not None:
+            create_version_partitions(session.connection(), version)
+        session.execute(delete_stale_documents(version))
+        schemes = {
+            scheme.iri: scheme
+            for scheme in merge_stored(session, ConceptScheme, concept_schemes)
+        }
+        members = merge_stored_members(session, [*concepts, *collections], schemes)
+        members_by_iri = {member.iri: member for member in members}
+
+        session.add_all(schemes.values())
+        session.add_all(members)
+        for collection in collections:
+            stored_collection = members_by_iri[collection.iri]
+            if stored_collection is collection:
+                collection.resolve_members_from_xml(members)
+            elif isinstance(stored_collection, Collection):
+                stored_ids = {member.id for member in stored_collection.members}
+                stored_collection.members.extend(
+                    member
+                    for member in members
+                    if member.iri in collection.member_iris
+                    and (member.id is None or member.id not in stored_ids)
+                )
+
+        concepts_by_iri = {
+            iri: member
+            for iri, member in members_by_iri.items()
+            if isinstance(member, Concept)
+        }
+        for semantic_relation in semantic_relations:
+            semantic_relation.version = version or ""
+            semantic_relation.resolve_concepts_from_xml(concepts_by_iri)
+        session.add_all(semantic_relations)
+
+        if version is not None:
+            save_version(session, version, list(schemes.values()), members)
+
+
+@contextmanager
+def write_session(engine: Engine | Session) -> Iterator[Session]:
+    """
+    Open a session for the write functions, committed when done. Given a session,
+    the write function runs in it as is, the caller committing it, so that several
+    writes are committed or rolled back together.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to write in.
+
+    Yields:
+        Session: The session.
+    """
+    if isinstance(engine, Session):
+        yield engine
+        return
+    with Session(engine) as session:
+        yield session
+        session.commit()
+
+
+@contextmanager
+def read_session(engine: Engine | Session) -> Iterator[Session]:
+    """
+    Open a session for the read functions, whose transaction is committed instead
+    of rolled back when done, as psycopg drops the prepared statements of its
+    connection on rollback, see `connect_arguments`. The loaded objects are not
+    expired by the commit, to be used once the session is closed.
+
+    Given a session, the read function runs in it as is, so that the reads of a
+    unit of work share its connection and transaction, the caller closing it.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+
+    Yields:
+        Session: The session.
+    """
+    if isinstance(engine, Session):
+        yield engine
+        return
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+        session.commit()
+
+
+def get_concept_schemes(
+    engine: Engine | Session,
+    version: str | None = None,
+) -> list[ConceptScheme]:
+    """
+    Get the concept schemes from the database.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        version (str | None): The dataset version. If None, get the concept schemes
+            of all the versions.
+
+    Returns:
+        list[ConceptScheme]: The concept schemes.
+    """
+    with read_session(engine) as session:
+        return (
+            session.query(ConceptScheme)
+            .where(scheme_visible(ConceptScheme, version))
+            .all()
+        )
+
+
+def iri_matches(entity) -> ColumnElement[bool]:
+    """
+    Build a condition checking the IRI of an entity, like its `IriComparator`, but
+    against the bound parameters of `iri_parameters`, for the cached statements.
+
+    Args:
+        entity: The entity identified by an IRI, or an alias of it.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+    """
+    return and_(
+        entity.prefix_id
+        == select(IriPrefix.id)
+        .where(IriPrefix.prefix == bindparam("iri_prefix"))
+        .scalar_subquery(),
+        entity.local_name == bindparam("iri_local_name"),
+    )
+
+
+def iris_match(
+    entity, iris: Sequence[str], sqlite: bool = False
+) -> ColumnElement[bool]:
+    """
+    Build a condition checking the IRI of an entity is one of the IRIs, with a
+    single `= ANY(:local_names)` condition per IRI prefix, see `IriComparator.in_`.
+    SQLite files cannot bind arrays, so the local names are checked with an `IN`
+    list there instead.
+
+    Args:
+        entity: The entity identified by an IRI, or an alias of it.
+        iris (Sequence[str]): The IRIs.
+        sqlite (bool): Whether the condition runs on a SQLite file. Defaults to
+            False.
+
+    Returns:
+        ColumnElement[bool]: The condition.
+    """
+    if not sqlite:
+        return entity.iri.in_(iris)
+    return or_(
+        false(),
+        *(
+            and_(
+                entity.prefix_id == IriPrefix.select_id(prefix),
+                entity.local_name.in_(local_names),
+            )
+            for prefix, local_names in IriPrefix.split_all(iris).items()
+        ),
+    )
+
+
+def iri_parameters(iri: str, version: str | None = None) -> dict[str, str | None]:
+    """
+    Get the bound parameters of the cached statements: the IRI checked by
+    `iri_matches`, and the dataset version.
+
+    Args:
+        iri (str): The IRI.
+        version (str | None): The dataset version. Defaults to None.
+
+    Returns:
+        dict[str, str | None]: The bound parameters.
+    """
+    prefix, local_name = IriPrefix.split(iri)
+    return {"iri_prefix": prefix, "iri_local_name": local_name, "version": version}
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def select_concept_scheme(
+    versioned: bool,
+    lang: str | None,
+    labels_table: bool,
+) -> Select:
+    """
+    Build the statement of `get_concept_scheme`, cached by shape so that the
+    statement and its cache key are built once, with the `iri_parameters` bound
+    parameters.
+
+    Args:
+        versioned (bool): Whether the concept scheme and its members must belong
+            to the dataset version.
+        lang (str | None): The language code of the labels, or None for all the
+            languages.
+        labels_table (bool): Whether to read the labels from the labels table, see
+            `load_in_language`.
+
+    Returns:
+        Select: The statement.
+    """
+    version = bindparam("version", type_=String) if versioned else None
+    members = ConceptScheme.members.of_type(MEMBER_POLYMORPHIC).and_(
+        member_visible(MEMBER_POLYMORPHIC, version)
+    )
+    statement = select(ConceptScheme).where(
+        iri_matches(ConceptScheme), scheme_visible(ConceptScheme, version)
+    )
+    members_options = (
+        []
+        if lang is None
+        else load_in_language(
+            MEMBER_POLYMORPHIC,
+            lang,
+            MEMBER_POLYMORPHIC.Concept,
+            labels_table=labels_table,
+        )
+    )
+    return statement.options(joinedload(members).options(*members_options))
+
+
+def get_concept_scheme(
+    engine: Engine | Session,
+    concept_scheme_iri: str,
+    version: str | None = None,
+    lang: str | None = None,
+) -> ConceptScheme:
+    """
+    Get the concept scheme from the database.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        concept_scheme_iri (str): The concept scheme IRI.
+        version (str | None): The dataset version. If given, the concept scheme and
+            its members must belong to it.
+        lang (str | None): The language code of the labels. If given, only the
+            labels of the members in that language, or in English, are loaded.
+
+    Returns:
+        ConceptScheme: The concept scheme.
+
+    Raises:
+        NoResultFound: If the concept scheme is not found.
+    """
+    statement = select_concept_scheme(
+        version is not None, lang, labels_table=not is_sqlite(engine)
+    )
+    with read_session(engine) as session:
+        return (
+            session.scalars(statement, iri_parameters(concept_scheme_iri, version))
+            .unique()
+            .one()
+        )
+
+
+def get_concept_scheme_row(
+    engine: Engine | Session,
+    concept_scheme_iri: str,
+    lang: str = "en",
+    version: str | None = None,
+) -> RowMapping:
+    """
+    Get the concept scheme from the database as a row, with its preferred label in
+    a single language.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        concept_scheme_iri (str): The concept scheme IRI.
+        lang (str): The language code of the preferred label. Defaults to "en".
+        version (str | None): The dataset version. If given, the concept scheme must
+            belong to it.
+
+    Returns:
+        RowMapping: The concept scheme, with the keys of `ConceptScheme.to_dict`.
+
+    Raises:
+        NoResultFound: If the concept scheme is not found.
+    """
+    statement = select(
+        label("iri", ConceptScheme.iri),
+        ConceptScheme.notation,
+        ConceptScheme.scopeNote,
+        json_in_language(ConceptScheme.prefLabels, lang).label("prefLabel"),
+    ).where(
+        ConceptScheme.iri == concept_scheme_iri,
+        scheme_visible(ConceptScheme, version),
+    )
+    with read_session(engine) as session:
+        return session.execute(statement).mappings().one()
+
+
+def select_scheme_member_rows(
+    concept_scheme_iri: str,
+    lang: str = "en",
+    version: str | None = None,
+    member_type: MemberType | None = None,
+    fields: frozenset[str] | None = None,
+) -> Select:
+    """
+    Build the statement of `get_scheme_member_rows`.
 
     Args:
-        database_url (str, optional): The database URL. If None, use the
-            `DATABASE_URL` environment variable.
-        drop_database_flag (bool): Flag to drop the database if it exists.
+        concept_scheme_iri (str): The concept scheme IRI.
+        lang (str): The language code of the labels. Defaults to "en".
+        version (str | None): The dataset version. If given, the members must
+            belong to it.
+        member_type (MemberType | None): The type of the members. Defaults to None,
+            for all the types.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `select_member_rows`. Defaults to None, for all the fields.
 
     Returns:
-        Engine: The database engine.
+        Select: The statement, as built by `select_member_rows`.
+    """
+    statement = (
+        select_member_rows(lang, fields)
+        .join(in_scheme, in_scheme.c.member_id == Member.id)
+        .where(
+            in_scheme.c.scheme_id
+            == select(ConceptScheme.id)
+            .where(
+                ConceptScheme.iri == concept_scheme_iri,
+                scheme_visible(ConceptScheme, version),
+            )
+            .scalar_subquery(),
+            member_visible(Member, version),
+        )
+    )
+    if member_type is not None:
+        statement = statement.where(Member.member_type == member_type)
+    return statement
 
-    Raises:
-        ValueError: If the DATABASE_URL environment variable is not set, in case the
-            the `database_url` argument is None.
+
+def get_scheme_member_rows(  # pylint: disable=too-many-arguments
+    engine: Engine | Session,
+    concept_scheme_iri: str,
+    lang: str = "en",
+    version: str | None = None,
+    member_type: MemberType | None = None,
+    limit: int | None = None,
+    after: tuple[str, str] | None = None,
+    fields: frozenset[str] | None = None,
+) -> list[RowMapping]:
     """
-    if database_url is None:
-        database_url = os_getenv("DATABASE_URL")
-    if not database_url:
-        raise ValueError("DATABASE_URL environment variable is not set.")
-    engine = create_engine(database_url)
+    Get the members of a concept scheme from the database as rows, with their
+    labels in a single language.
 
-    if not database_exists(engine.url):
-        create_database(engine.url)
-    elif drop_database_flag:
-        drop_database(engine.url)
-        create_database(engine.url)
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        concept_scheme_iri (str): The concept scheme IRI.
+        lang (str): The language code of the labels. Defaults to "en".
+        version (str | None): The dataset version. If given, the members must
+            belong to it.
+        member_type (MemberType | None): The type of the members. Defaults to None,
+            for all the types.
+        limit (int | None): The maximum number of members. Defaults to None, for
+            all of them.
+        after (tuple[str, str] | None): The notation and IRI of the last member of
+            the previous page, see `paginate_members`. Defaults to None.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `select_member_rows`. Defaults to None, for all the fields.
 
-    Base.metadata.create_all(engine)
-    return engine
+    Returns:
+        list[RowMapping]: The members, as selected by `select_member_rows`.
+    """
+    statement = paginate_members(
+        select_scheme_member_rows(
+            concept_scheme_iri, lang, version, member_type, fields
+        ),
+        limit,
+        after,
+    )
+    with read_session(engine) as session:
+        return list(session.execute(statement).mappings().all())
 
 
-def save_dataset(
-    engine: Engine,
-    concept_schemes: list[ConceptScheme],
-    concepts: list[Concept],
-    collections: list[Collection],
-    semantic_relations: list[SemanticRelation],
-) -> None:
+def get_collection_row(
+    engine: Engine | Session,
+    collection_iri: str,
+    lang: str = "en",
+    version: str | None = None,
+) -> RowMapping:
     """
-    Save a dataset in the database.
+    Get the collection from the database as a row, with its preferred label in a
+    single language.
 
     Args:
-        engine (Engine): The database engine.
-        concept_schemes (list[ConceptScheme]): The concept schemes.
-        concepts (list[Concept]): The concepts.
-        collections (list[Collection]): The collections.
-        semantic_relations (list[SemanticRelation]): The semantic relations.
-    """
-    with Session(engine) as session:
-        session.add_all(concept_schemes)
-        session.add_all(concepts)
-        session.add_all(collections)
-        session.add_all(semantic_relations)
+        engine (Engine | Session): The database engine, or the session to read in.
+        collection_iri (str): The collection IRI.
+        lang (str): The language code of the preferred label. Defaults to "en".
+        version (str | None): The dataset version. If given, the collection must
+            belong to it.
 
-        members: list[Member] = []
-        members.extend(concepts)
-        members.extend(collections)
-        for collection in collections:
-            collection.resolve_members_from_xml(members)
-        session.commit()
+    Returns:
+        RowMapping: The collection, as selected by `select_member_rows`.
+
+    Raises:
+        NoResultFound: If the collection is not found.
+    """
+    statement = select_member_rows(lang).where(
+        Member.iri == collection_iri,
+        Member.member_type == MemberType.COLLECTION,
+        member_visible(Member, version),
+    )
+    with read_session(engine) as session:
+        return session.execute(statement).mappings().one()
 
 
-def get_concept_schemes(engine: Engine) -> list[ConceptScheme]:
+def select_collection_member_rows(
+    collection_iri: str,
+    lang: str = "en",
+    version: str | None = None,
+    fields: frozenset[str] | None = None,
+) -> Select:
     """
-    Get the concept schemes from the database.
+    Build the statement of `get_collection_member_rows`.
 
     Args:
-        engine (Engine): The database engine.
+        collection_iri (str): The collection IRI.
+        lang (str): The language code of the labels. Defaults to "en".
+        version (str | None): The dataset version. If given, the members must
+            belong to it.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `select_member_rows`. Defaults to None, for all the fields.
 
     Returns:
-        list[ConceptScheme]: The concept schemes.
+        Select: The statement, as built by `select_member_rows`.
     """
-    with Session(engine) as session:
-        return session.query(ConceptScheme).all()
+    collection = aliased(Member)
+    return (
+        select_member_rows(lang, fields)
+        .join(in_collection, in_collection.c.member_id == Member.id)
+        .where(
+            in_collection.c.collection_id
+            == select(collection.id)
+            .where(
+                collection.iri == collection_iri,
+                member_visible(collection, version),
+            )
+            .scalar_subquery(),
+            member_visible(Member, version),
+        )
+    )
 
 
-def get_concept_scheme(engine: Engine, concept_scheme_iri: str) -> ConceptScheme:
+def get_collection_member_rows(  # pylint: disable=too-many-arguments
+    engine: Engine | Session,
+    collection_iri: str,
+    lang: str = "en",
+    version: str | None = None,
+    limit: int | None = None,
+    after: tuple[str, str] | None = None,
+    fields: frozenset[str] | None = None,
+) -> list[RowMapping]:
     """
-    Get the concept scheme from the database.
+    Get the members of a collection from the database as rows, with their labels
+    in a single language.
 
     Args:
-        engine (Engine): The database engine.
-        concept_scheme_iri (str): The concept scheme IRI.
+        engine (Engine | Session): The database engine, or the session to read in.
+        collection_iri (str): The collection IRI.
+        lang (str): The language code of the labels. Defaults to "en".
+        version (str | None): The dataset version. If given, the members must
+            belong to it.
+        limit (int | None): The maximum number of members. Defaults to None, for
+            all of them.
+        after (tuple[str, str] | None): The notation and IRI of the last member of
+            the previous page, see `paginate_members`. Defaults to None.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `select_member_rows`. Defaults to None, for all the fields.
 
     Returns:
-        ConceptScheme: The concept scheme.
+        list[RowMapping]: The members, as selected by `select_member_rows`.
+    """
+    statement = paginate_members(
+        select_collection_member_rows(collection_iri, lang, version, fields),
+        limit,
+        after,
+    )
+    with read_session(engine) as session:
+        return list(session.execute(statement).mappings().all())
 
-    Raises:
-        NoResultFound: If the concept scheme is not found.
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def select_collection(versioned: bool, lang: str | None, labels_table: bool) -> Select:
     """
-    with Session(engine) as session:
-        member_polymorphic = with_polymorphic(
-            Member,
-            [Concept, Collection],
-            aliased=True,
-        )
-        return (
-            session.query(ConceptScheme)
-            .where(ConceptScheme.iri == concept_scheme_iri)
-            .options(joinedload(ConceptScheme.members.of_type(member_polymorphic)))
-            .one()
-        )
+    Build the statement of `get_collection`, cached by shape like
+    `select_concept_scheme`, with the `iri_parameters` bound parameters.
+
+    Args:
+        versioned (bool): Whether the collection and its members must belong to the
+            dataset version.
+        lang (str | None): The language code of the labels, or None for all the
+            languages.
+        labels_table (bool): Whether to read the labels from the labels table, see
+            `load_in_language`.
+
+    Returns:
+        Select: The statement.
+    """
+    version = bindparam("version", type_=String) if versioned else None
+    members = Collection.members.of_type(MEMBER_POLYMORPHIC).and_(
+        member_visible(MEMBER_POLYMORPHIC, version)
+    )
+    statement = select(Collection).where(
+        iri_matches(Collection), member_visible(Collection, version)
+    )
+    if lang is None:
+        return statement.options(joinedload(members))
+    return statement.options(
+        *load_in_language(Collection, lang, labels_table=labels_table),
+        joinedload(members).options(
+            *load_in_language(
+                MEMBER_POLYMORPHIC,
+                lang,
+                MEMBER_POLYMORPHIC.Concept,
+                labels_table=labels_table,
+            )
+        ),
+    )
 
 
-def get_collection(engine: Engine, collection_iri: str) -> Collection:
+def get_collection(
+    engine: Engine | Session,
+    collection_iri: str,
+    version: str | None = None,
+    lang: str | None = None,
+) -> Collection:
     """
     Get the collection from the database.
 
     Args:
-        engine (Engine): The database engine.
+        engine (Engine | Session): The database engine, or the session to read in.
         collection_iri (str): The collection IRI.
+        version (str | None): The dataset version. If given, the collection and its
+            members must belong to it.
+        lang (str | None): The language code of the labels. If given, only the
+            labels of the collection and its members in that language, or in
+            English, are loaded.
 
     Returns:
         Collection: The collection.
@@ -134,27 +1764,78 @@ def get_collection(engine: Engine, collection_iri: str) -> Collection:
     Raises:
         NoResultFound: If the collection is not found.
     """
-    with Session(engine) as session:
-        member_polymorphic = with_polymorphic(
-            Member,
-            [Concept, Collection],
-            aliased=True,
-        )
+    statement = select_collection(
+        version is not None, lang, labels_table=not is_sqlite(engine)
+    )
+    with read_session(engine) as session:
         return (
-            session.query(Collection)
-            .where(Collection.iri == collection_iri)
-            .options(joinedload(Collection.members.of_type(member_polymorphic)))
+            session.scalars(statement, iri_parameters(collection_iri, version))
+            .unique()
             .one()
         )
 
 
-def get_concept(engine: Engine, concept_iri: str) -> Concept:
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def select_concept(
+    versioned: bool,
+    lang: str | None,
+    labels_table: bool,
+    fields: frozenset[str] | None = None,
+) -> Select:
+    """
+    Build the statement of `get_concept`, cached by shape like
+    `select_concept_scheme`, with the `iri_parameters` bound parameters.
+
+    Args:
+        versioned (bool): Whether the concept must belong to the dataset version,
+            and only its concept schemes in that version are loaded.
+        lang (str | None): The language code of the labels, or None for all the
+            languages.
+        labels_table (bool): Whether to read the labels from the labels table, see
+            `load_in_language`.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `load_in_language`, if the labels are read in a single language.
+            Defaults to None, for all the fields.
+
+    Returns:
+        Select: The statement.
+    """
+    version = bindparam("version", type_=String) if versioned else None
+    concept_schemes = Concept.concept_schemes.and_(
+        scheme_visible(ConceptScheme, version)
+    )
+    statement = select(Concept).where(
+        iri_matches(Concept), member_visible(Concept, version)
+    )
+    if lang is not None:
+        statement = statement.options(
+            *load_in_language(
+                Concept, lang, Concept, labels_table=labels_table, fields=fields
+            )
+        )
+    return statement.options(joinedload(concept_schemes))
+
+
+def get_concept(
+    engine: Engine | Session,
+    concept_iri: str,
+    version: str | None = None,
+    lang: str | None = None,
+    fields: frozenset[str] | None = None,
+) -> Concept:
     """
     Get the concept from the database.
 
     Args:
-        engine (Engine): The database engine.
+        engine (Engine | Session): The database engine, or the session to read in.
         concept_iri (str): The concept IRI.
+        version (str | None): The dataset version. If given, the concept must
+            belong to it, and only its concept schemes in that version are loaded.
+        lang (str | None): The language code of the labels. If given, only the
+            labels of the concept in that language, or in English, are loaded.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `load_in_language`, if `lang` is given. Defaults to None, for all the
+            fields.
 
     Return:
         Concept: The concept or None if not found.
@@ -162,59 +1843,600 @@ def get_concept(engine: Engine, concept_iri: str) -> Concept:
     Raises:
         NoResultFound: If the concept is not found.
     """
-    with Session(engine) as session:
+    statement = select_concept(
+        version is not None, lang, labels_table=not is_sqlite(engine), fields=fields
+    )
+    with read_session(engine) as session:
         return (
-            session.query(Concept)
-            .where(Concept.iri == concept_iri)
-            .options(joinedload(Concept.concept_schemes))
+            session.scalars(statement, iri_parameters(concept_iri, version))
+            .unique()
             .one()
         )
 
 
-def get_relations(engine: Engine, concept_iri: str) -> list[SemanticRelation]:
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def select_relations_of(versioned: bool, distinct: bool) -> Select:
+    """
+    Build the statement of `get_relations`, cached by shape like
+    `select_concept_scheme`, with the `iri_parameters` bound parameters.
+
+    Args:
+        versioned (bool): Whether the relations must belong to the dataset version.
+        distinct (bool): Whether to return each relation once, with the PostgreSQL
+            `DISTINCT ON`, instead of ordering them for the caller to skip the
+            duplicates.
+
+    Returns:
+        Select: The statement.
+    """
+    concept_id = (
+        select(Member.id)
+        .where(
+            iri_matches(Member),
+            member_visible(
+                Member, bindparam("version", type_=String) if versioned else None
+            ),
+        )
+        .scalar_subquery()
+    )
+    # The source and target sides are queried separately, so that each one uses
+    # its own index, instead of scanning the table for the OR condition. They
+    # select the table columns only, the concept IRIs being loaded once for the
+    # union.
+    sides = [
+        select(SemanticRelation.__table__).where(column == concept_id)
+        for column in (
+            SemanticRelation.source_concept_id,
+            SemanticRelation.target_concept_id,
+        )
+    ]
+    if versioned:
+        sides = [
+            side.where(SemanticRelation.version == bindparam("version"))
+            for side in sides
+        ]
+    relation = aliased(SemanticRelation, union(*sides).subquery())
+    statement = select(relation)
+    if versioned:
+        return statement
+    if distinct:
+        statement = statement.distinct(
+            relation.source_concept_id, relation.target_concept_id
+        )
+    return statement.order_by(relation.source_concept_id, relation.target_concept_id)
+
+
+def get_relations(
+    engine: Engine | Session,
+    concept_iri: str,
+    version: str | None = None,
+) -> list[SemanticRelation]:
     """
     Get the relations from the database.
 
     Args:
-        engine (Engine): The database engine.
+        engine (Engine | Session): The database engine, or the session to read in.
         concept_iri (str): The concept IRI.
+        version (str | None): The dataset version. If None, get the relations of
+            all the versions, each relation being returned once.
 
     Returns:
         list[SemanticRelation]: The relations.
     """
-    with Session(engine) as session:
-        return (
-            session.query(SemanticRelation)
-            .where(
-                (SemanticRelation.source_concept_iri == concept_iri)
-                | (SemanticRelation.target_concept_iri == concept_iri)
+    sqlite = is_sqlite(engine)
+    statement = select_relations_of(version is not None, distinct=not sqlite)
+    with read_session(engine) as session:
+        relations = session.scalars(
+            statement, iri_parameters(concept_iri, version)
+        ).all()
+    if version is not None or not sqlite:
+        return list(relations)
+    unique_relations: dict[tuple[int, int], SemanticRelation] = {}
+    for relation in relations:
+        unique_relations.setdefault(
+            (relation.source_concept_id, relation.target_concept_id), relation
+        )
+    return list(unique_relations.values())
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def select_concept_with_relations(
+    versioned: bool,
+    lang: str | None,
+    labels_table: bool,
+    fields: frozenset[str] | None = None,
+) -> Select:
+    """
+    Build the statement of `get_concept_with_relations`, cached by shape like
+    `select_concept_scheme`: the concept of `select_concept`, with the IRIs of its
+    concept schemes aggregated in an array, as its `concept_schemes` column, and
+    its relations of `select_relations_of` in a JSON array, as its `relations`
+    column, instead of joining them. It only runs on PostgreSQL.
+
+    Args:
+        versioned (bool): Whether the concept and its relations must belong to the
+            dataset version, and only its concept schemes in that version are
+            selected.
+        lang (str | None): The language code of the labels, or None for all the
+            languages.
+        labels_table (bool): Whether to read the labels from the labels table, see
+            `load_in_language`.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `load_in_language`, if the labels are read in a single language.
+            Defaults to None, for all the fields.
+
+    Returns:
+        Select: The statement.
+    """
+    version = bindparam("version", type_=String) if versioned else None
+    concept_schemes = (
+        select(
+            func.coalesce(
+                func.array_agg(aggregate_order_by(ConceptScheme.iri, ConceptScheme.id)),
+                literal([], ARRAY(String)),
             )
-            .all()
         )
+        .join(in_scheme, in_scheme.c.scheme_id == ConceptScheme.id)
+        .where(
+            in_scheme.c.member_id == Concept.id,
+            scheme_visible(ConceptScheme, version),
+        )
+    )
+    relation = aliased(
+        SemanticRelation, select_relations_of(versioned, distinct=True).subquery()
+    )
+    relations = select(
+        func.coalesce(
+            func.json_agg(
+                func.json_build_object(
+                    "type",
+                    relation.type,
+                    "source_concept_id",
+                    relation.source_concept_id,
+                    "target_concept_id",
+                    relation.target_concept_id,
+                    "source_concept_iri",
+                    relation.source_concept_iri,
+                    "target_concept_iri",
+                    relation.target_concept_iri,
+                    "version",
+                    relation.version,
+                )
+            ),
+            literal_column("'[]'::json"),
+        )
+    )
+    statement = select(
+        Concept,
+        concept_schemes.scalar_subquery().label("concept_schemes"),
+        relations.scalar_subquery().label("relations"),
+    ).where(iri_matches(Concept), member_visible(Concept, version))
+    if lang is not None:
+        statement = statement.options(
+            *load_in_language(
+                Concept, lang, Concept, labels_table=labels_table, fields=fields
+            )
+        )
+    return statement
+
+
+def get_concept_with_relations(
+    engine: Engine | Session,
+    concept_iri: str,
+    version: str | None = None,
+    lang: str | None = None,
+    fields: frozenset[str] | None = None,
+) -> tuple[Concept, list[str], list[SemanticRelation]]:
+    """
+    Get the concept, the IRIs of its concept schemes and its relations from the
+    database, like `get_concept` and `get_relations`, in a single query on
+    PostgreSQL, see `select_concept_with_relations`. On SQLite files, they are read
+    in the same session instead.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        concept_iri (str): The concept IRI.
+        version (str | None): The dataset version. If given, the concept and its
+            relations must belong to it, and only its concept schemes in that
+            version are returned.
+        lang (str | None): The language code of the labels. If given, only the
+            labels of the concept in that language, or in English, are loaded.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `load_in_language`, if `lang` is given. Defaults to None, for all the
+            fields.
+
+    Returns:
+        tuple[Concept, list[str], list[SemanticRelation]]: The concept, the IRIs of
+            its concept schemes and its relations, the relations not being
+            attached to the session.
+
+    Raises:
+        NoResultFound: If the concept is not found.
+    """
+    with read_session(engine) as session:
+        if is_sqlite(session):
+            concept = get_concept(
+                session, concept_iri, version=version, lang=lang, fields=fields
+            )
+            return (
+                concept,
+                [concept_scheme.iri for concept_scheme in concept.concept_schemes],
+                get_relations(session, concept_iri, version=version),
+            )
+        statement = select_concept_with_relations(
+            version is not None, lang, labels_table=True, fields=fields
+        )
+        concept, concept_scheme_iris, relations = session.execute(
+            statement, iri_parameters(concept_iri, version)
+        ).one()
+    return (
+        concept,
+        concept_scheme_iris,
+        [
+            SemanticRelation(
+                **{**relation, "type": SemanticRelationType[relation["type"]]}
+            )
+            for relation in relations
+        ],
+    )
+
+
+def get_relation_concept_rows(
+    engine: Engine | Session,
+    relations: Sequence[SemanticRelation],
+    lang: str = "en",
+) -> dict[str, RowMapping]:
+    """
+    Get the source and target concepts of relations from the database as rows,
+    with their preferred label in a single language, in a single query by their
+    ids instead of one query per concept.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        relations (Sequence[SemanticRelation]): The relations.
+        lang (str): The language code of the preferred labels. Defaults to "en".
+
+    Returns:
+        dict[str, RowMapping]: The concepts by IRI, as selected by
+            `select_member_rows` with the `prefLabel` field only.
+    """
+    concept_ids = sorted(
+        {relation.source_concept_id for relation in relations}
+        | {relation.target_concept_id for relation in relations}
+    )
+    if not concept_ids:
+        return {}
+    statement = select_member_rows(lang, frozenset({"prefLabel"})).where(
+        Member.id.in_(concept_ids)
+    )
+    with read_session(engine) as session:
+        return {row["iri"]: row for row in session.execute(statement).mappings()}
+
+
+def get_member_rows_by_iri(
+    engine: Engine | Session,
+    iris: Sequence[str],
+    lang: str = "en",
+    version: str | None = None,
+    member_type: MemberType | None = None,
+) -> list[RowMapping]:
+    """
+    Get the members with the given IRIs from the database as rows, with their
+    labels in a single language, in a single query, see `iris_match`. The IRIs
+    which are not found are left out.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        iris (Sequence[str]): The member IRIs.
+        lang (str): The language code of the labels. Defaults to "en".
+        version (str | None): The dataset version. If given, the members must
+            belong to it.
+        member_type (MemberType | None): The type of the members. Defaults to None,
+            for all the types.
+
+    Returns:
+        list[RowMapping]: The members, as selected by `select_member_rows`.
+    """
+    statement = select_member_rows(lang).where(
+        iris_match(Member, iris, sqlite=is_sqlite(engine)),
+        member_visible(Member, version),
+    )
+    if member_type is not None:
+        statement = statement.where(Member.member_type == member_type)
+    with read_session(engine) as session:
+        return list(session.execute(statement).mappings().all())
+
+
+def get_concept_scheme_rows_by_iri(
+    engine: Engine | Session,
+    iris: Sequence[str],
+    lang: str = "en",
+    version: str | None = None,
+) -> list[RowMapping]:
+    """
+    Get the concept schemes with the given IRIs from the database as rows, like
+    `get_concept_scheme_row`, in a single query, see `iris_match`. The IRIs which
+    are not found are left out.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        iris (Sequence[str]): The concept scheme IRIs.
+        lang (str): The language code of the preferred labels. Defaults to "en".
+        version (str | None): The dataset version. If given, the concept schemes
+            must belong to it.
+
+    Returns:
+        list[RowMapping]: The concept schemes, with the keys of
+            `ConceptScheme.to_dict`.
+    """
+    statement = (
+        select(
+            label("iri", ConceptScheme.iri),
+            ConceptScheme.notation,
+            ConceptScheme.scopeNote,
+            json_in_language(ConceptScheme.prefLabels, lang).label("prefLabel"),
+        )
+        .where(
+            iris_match(ConceptScheme, iris, sqlite=is_sqlite(engine)),
+            scheme_visible(ConceptScheme, version),
+        )
+        .order_by(ConceptScheme.id)
+    )
+    with read_session(engine) as session:
+        return list(session.execute(statement).mappings().all())
 
 
 def search_database(
-    engine: Engine,
+    engine: Engine | Session,
     search_term: str,
     lang: str = "en",
+    version: str | None = None,
 ) -> list[Concept]:
     """
     Search the database for concepts with the search_term in the preferred or
     alternative labels, in the specified language.
 
     Args:
-        engine (Engine): The database engine.
+        engine (Engine | Session): The database engine, or the session to read in.
         search_term (str): The search term to match against.
         lang (str, optional): The language of the labels. Defaults to "en".
+        version (str | None): The dataset version. If None, search in all the
+            versions.
 
     Returns:
         list[Concept]: The concepts that matches the search term.
     """
-    with Session(engine) as session:
-        concepts = session.query(Concept).all()
+    with read_session(engine) as session:
+        query = session.query(Concept).options(
+            *load_in_language(
+                Concept, lang, Concept, labels_table=not is_sqlite(engine)
+            )
+        )
+        query = query.where(member_visible(Concept, version))
+        if is_sqlite(engine) and len(search_term) >= LABELS_FTS_MIN_LENGTH:
+            query = query.where(labels_fts_match(Concept.id, search_term))
+        concepts = query.all()
         return [
             concept
             for concept in concepts
-            if search_term in concept.get_in_language(concept.prefLabels, lang)
-            or search_term in concept.get_in_language(concept.altLabels, lang)
+            if search_term in concept.get_pref_label(lang)
+            or search_term in (concept.altLabelsInLanguage or [])
         ]
+
+
+def search_database_rows(  # pylint: disable=too-many-arguments
+    engine: Engine | Session,
+    search_term: str,
+    lang: str = "en",
+    version: str | None = None,
+    limit: int | None = None,
+    after: tuple[str, str] | None = None,
+    fields: frozenset[str] | None = None,
+) -> list[RowMapping]:
+    """
+    Search the database for concepts with the search_term in the preferred label,
+    or as an alternative label, in the specified language, like `search_database`,
+    matching and projecting the labels in the database. On SQLite files, the
+    concepts are first narrowed down with the `LABELS_FTS` index.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        search_term (str): The search term to match against.
+        lang (str, optional): The language of the labels. Defaults to "en".
+        version (str | None): The dataset version. If None, search in all the
+            versions.
+        limit (int | None): The maximum number of concepts. Defaults to None, for
+            all of them.
+        after (tuple[str, str] | None): The notation and IRI of the last concept of
+            the previous page, see `paginate_members`. Defaults to None.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `select_member_rows`. Defaults to None, for all the fields.
+
+    Returns:
+        list[RowMapping]: The concepts that matches the search term, as selected by
+            `select_member_rows`.
+    """
+    statement = paginate_members(
+        select_search_rows(
+            search_term, lang, version, sqlite=is_sqlite(engine), fields=fields
+        ),
+        limit,
+        after,
+    )
+    with read_session(engine) as session:
+        return list(session.execute(statement).mappings().all())
+
+
+def select_search_rows(
+    search_term: str,
+    lang: str = "en",
+    version: str | None = None,
+    sqlite: bool = False,
+    fields: frozenset[str] | None = None,
+) -> Select:
+    """
+    Build the statement of `search_database_rows`.
+
+    Args:
+        search_term (str): The search term to match against.
+        lang (str, optional): The language of the labels. Defaults to "en".
+        version (str | None): The dataset version. If None, search in all the
+            versions.
+        sqlite (bool): Whether the statement reads a SQLite file. Defaults to False.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `select_member_rows`. Defaults to None, for all the fields.
+
+    Returns:
+        Select: The statement, as built by `select_member_rows`.
+    """
+    pref_label = json_in_language(Member.prefLabels, lang)
+    alt_labels = json_list_in_language(Concept.__table__.c.altLabels, lang)
+    statement = select_member_rows(lang, fields).where(
+        Member.member_type == MemberType.CONCEPT
+    )
+    if sqlite:
+        alt_label = func.json_each(alt_labels).table_valued("value")
+        statement = statement.where(
+            pref_label.contains(search_term, autoescape=True)
+            | select(alt_label.c.value).where(alt_label.c.value == search_term).exists()
+        )
+        if len(search_term) >= LABELS_FTS_MIN_LENGTH:
+            statement = statement.where(labels_fts_match(Member.id, search_term))
+    else:
+        statement = statement.where(
+            pref_label.contains(search_term, autoescape=True)
+            | type_coerce(alt_labels, JSONB).has_key(search_term)
+        )
+    return statement.where(member_visible(Member, version))
+
+
+def stream_rows(engine: Engine, statement: Select) -> Iterator[Sequence[RowMapping]]:
+    """
+    Stream the rows of a statement in batches of `STREAM_BATCH_SIZE` rows, read
+    with a server-side cursor on PostgreSQL, so that the rows of a large result
+    are neither buffered by the driver nor loaded at once.
+
+    Args:
+        engine (Engine): The database engine.
+        statement (Select): The statement, selecting rows.
+
+    Yields:
+        Sequence[RowMapping]: The batches of rows.
+    """
+    # The session is opened here instead of by `read_session`, so that it is
+    # closed when the stream is closed before its end.
+    with Session(engine) as session:
+        result = session.execute(
+            statement, execution_options={"yield_per": STREAM_BATCH_SIZE}
+        )
+        yield from result.mappings().partitions()
+        session.commit()
+
+
+def save_documents(engine: Engine, documents: list[dict]) -> None:
+    """
+    Save precomputed response documents, replacing the stored documents with the
+    same type, IRI, language and version.
+
+    Args:
+        engine (Engine): The database engine.
+        documents (list[dict]): The documents, with the columns of `Document`.
+    """
+    if not documents:
+        return
+    statement = insert(Document)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Document.type, Document.iri, Document.lang, Document.version],
+        set_={"content": statement.excluded.content},
+    )
+    with Session(engine) as session:
+        session.execute(statement, documents)
+        session.commit()
+
+
+def get_document(
+    engine: Engine | Session,
+    document_type: DocumentType,
+    iri: str,
+    lang: str = "en",
+    version: str | None = None,
+) -> bytes | None:
+    """
+    Get a precomputed response document from the database.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+        document_type (DocumentType): The type of the document.
+        iri (str): The IRI of the concept, concept scheme or collection.
+        lang (str): The language code of the document. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for the
+            document of all the versions.
+
+    Returns:
+        bytes | None: The JSON document, or None if it was not precomputed.
+    """
+    with read_session(engine) as session:
+        return session.scalar(
+            select(Document.content).where(
+                Document.type == document_type,
+                Document.iri == iri,
+                Document.lang == lang,
+                Document.version == (version or ""),
+            )
+        )
+
+
+def bump_dataset_generation(engine: Engine) -> tuple[int, datetime]:
+    """
+    Bump the dataset generation stored in the database, see `DatasetGeneration`,
+    once the datasets are ingested, with the current date to the second of the HTTP
+    dates.
+
+    Args:
+        engine (Engine): The database engine.
+
+    Returns:
+        tuple[int, datetime]: The new generation and when it was bumped, in UTC.
+    """
+    statement = insert(DatasetGeneration).values(
+        id=1, generation=1, loaded_at=func.date_trunc("second", func.now())
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[DatasetGeneration.id],
+        set_={
+            "generation": DatasetGeneration.generation + 1,
+            "loaded_at": statement.excluded.loaded_at,
+        },
+    )
+    with Session(engine) as session:
+        generation, loaded_at = session.execute(
+            statement.returning(
+                DatasetGeneration.generation, DatasetGeneration.loaded_at
+            )
+        ).one()
+        session.commit()
+    return generation, loaded_at.astimezone(timezone.utc)
+
+
+def get_dataset_generation(engine: Engine | Session) -> tuple[int, datetime]:
+    """
+    Get the dataset generation stored in the database, see `DatasetGeneration`.
+
+    Args:
+        engine (Engine | Session): The database engine, or the session to read in.
+
+    Returns:
+        tuple[int, datetime]: The generation and when it was bumped, in UTC, or 0
+            and the `UNLOADED_AT` date if the datasets were never ingested.
+    """
+    with read_session(engine) as session:
+        row = session.execute(
+            select(DatasetGeneration.generation, DatasetGeneration.loaded_at)
+        ).one_or_none()
+    if row is None:
+        return 0, UNLOADED_AT
+    generation, loaded_at = row
+    # The SQLite files store the dates without their time zone.
+    if loaded_at.tzinfo is None:
+        loaded_at = loaded_at.replace(tzinfo=timezone.utc)
+    return generation, loaded_at.astimezone(timezone.utc)
@@ -34,3 +34,34 @@ class SemanticRelationType(Enum):
     RELATED: str = "related"
     BROADER_TRANSITIVE: str = "broaderTransitive"
     NARROWER_TRANSITIVE: str = "narrowerTransitive"
+
+
+class LabelKind(Enum):
+    """
+    Enum class for the kinds of labels stored per language.
+
+    Attributes:
+        PREF_LABEL (str): The preferred label.
+        ALT_LABEL (str): The alternative label.
+        SCOPE_NOTE (str): The scope note.
+    """
+
+    PREF_LABEL: str = "prefLabel"
+    ALT_LABEL: str = "altLabel"
+    SCOPE_NOTE: str = "scopeNote"
+
+
+class DocumentType(Enum):
+    """
+    Enum class for the types of precomputed response documents.
+
+    Attributes:
+        CONCEPT (str): The concept document, a `FullConceptResponse`.
+        CONCEPT_SCHEME (str): The concept scheme document, a
+            `FullConceptSchemeResponse`.
+        COLLECTION (str): The collection document, a `CollectionResponse`.
+    """
+
+    CONCEPT: str = "concept"
+    CONCEPT_SCHEME: str = "concept_scheme"
+    COLLECTION: str = "collection"
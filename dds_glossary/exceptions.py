@@ -35,3 +35,54 @@ class CollectionNotFoundException(EntityNotFound):
 
     def __init__(self, collection_iri: str) -> None:
         super().__init__("Collection", collection_iri)
+
+
+class InvalidCursorException(DDSGlossaryException):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str) -> None:
+        super().__init__(HTTPStatus.BAD_REQUEST, f"Invalid cursor {cursor}.")
+
+
+class InvalidFieldsException(DDSGlossaryException):
+    """Exception raised when a sparse fieldset selects unknown fields."""
+
+    def __init__(self, fields: str) -> None:
+        super().__init__(HTTPStatus.BAD_REQUEST, f"Invalid fields {fields}.")
+
+
+class NotModifiedException(DDSGlossaryException):
+    """Exception raised when the client of a read request holds its response."""
+
+    def __init__(self, headers: dict[str, str]) -> None:
+        super().__init__(HTTPStatus.NOT_MODIFIED, headers=headers)
+
+
+class QueryTimeoutException(DDSGlossaryException):
+    """Exception raised when the query time budget of a request is exceeded."""
+
+    def __init__(self, seconds: float) -> None:
+        super().__init__(
+            HTTPStatus.GATEWAY_TIMEOUT,
+            f"The query time budget of {seconds}s was exceeded.",
+        )
+
+
+class QueryCancelledException(DDSGlossaryException):
+    """Exception raised when the queries of a disconnected client are cancelled."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            HTTPStatus.SERVICE_UNAVAILABLE, "The queries of the request were cancelled."
+        )
+
+
+class DatabaseBusyException(DDSGlossaryException):
+    """Exception raised when no database connection is available in time."""
+
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__(
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            "The database is busy, please retry later.",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,35 @@
+"""Sparse fieldsets of the members responses for the dds_glossary package."""
+
+from typing import Final
+
+from .exceptions import InvalidFieldsException
+from .schema import ConceptResponse
+
+# The fields always included in the members responses, which identify and order
+# the members, see `database.paginate_members`.
+KEY_FIELDS: Final[frozenset[str]] = frozenset({"iri", "notation"})
+
+# The fields which can be selected, those of a `ConceptResponse`.
+MEMBER_FIELDS: Final[frozenset[str]] = frozenset(ConceptResponse.model_fields)
+
+
+def decode_fields(fields: str | None) -> frozenset[str] | None:
+    """
+    Decode a sparse fieldset, the comma separated fields of the members to include
+    in the responses, along with the `KEY_FIELDS`.
+
+    Args:
+        fields (str | None): The sparse fieldset, or None for all the fields.
+
+    Returns:
+        frozenset[str] | None: The fields, or None for all the fields.
+
+    Raises:
+        InvalidFieldsException: If a field is not one of the `MEMBER_FIELDS`.
+    """
+    if fields is None:
+        return None
+    selected = frozenset(field.strip() for field in fields.split(",")) - {""}
+    if not selected <= MEMBER_FIELDS:
+        raise InvalidFieldsException(fields)
+    return selected | KEY_FIELDS
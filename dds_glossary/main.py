@@ -1,16 +1,34 @@
 """Main entry for the dds_glossary server."""
 
 import argparse
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 import sentry_sdk
 import uvicorn
 from fastapi import FastAPI
 from fastapi_versioning import VersionedFastAPI
 
+from .conditional import ConditionalRequestMiddleware
 from .routes import router_non_versioned, router_versioned
+from .services import dispose_engines
 from .settings import get_settings
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Close the connections of the shared database engines on shutdown.
+
+    Args:
+        _app (FastAPI): The application.
+
+    Yields:
+        None: The application running.
+    """
+    yield
+    await dispose_engines()
+
+
 def create_app() -> FastAPI:
     """Create the FastAPI application object
     Returns:
@@ -29,8 +47,11 @@ def create_app() -> FastAPI:
 
     app = FastAPI()
     app.include_router(router_versioned)
-    app = VersionedFastAPI(app, enable_latest=True, default_version=(0, 1))
+    app = VersionedFastAPI(
+        app, enable_latest=True, default_version=(0, 1), lifespan=lifespan
+    )
     app.include_router(router_non_versioned)
+    app.add_middleware(ConditionalRequestMiddleware)
 
     return app
 
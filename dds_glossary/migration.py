@@ -0,0 +1,125 @@
+"""Migration helpers for the dds_glossary package."""
+
+import logging
+from typing import Callable
+
+from sqlalchemy import TextClause, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote an SQL identifier, keeping its case.
+
+    Args:
+        name (str): The identifier to quote.
+
+    Returns:
+        str: The quoted identifier.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def jsonb_map_values(column: str, value_expression: str) -> str:
+    """
+    Build an SQL expression applying `value_expression` to every value of a JSONB
+    object. Inside `value_expression`, the current key and value are available as
+    `key` and `value`. An empty object is returned for empty or NULL objects.
+
+    Args:
+        column (str): The quoted JSONB column or expression to map.
+        value_expression (str): The SQL expression computing the new value.
+
+    Returns:
+        str: The SQL expression of the mapped JSONB object.
+    """
+    return (
+        f"COALESCE((SELECT jsonb_object_agg(key, {value_expression}) "
+        f"FROM jsonb_each({column})), jsonb_build_object())"
+    )
+
+
+def update_column(  # pylint: disable=too-many-arguments,too-many-locals
+    connection: Connection,
+    table_name: str,
+    column_name: str,
+    expression: str,
+    where: str | None = None,
+    batch_size: int | None = None,
+    key_column: str = "iri",
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """
+    Update a column with a set-based SQL expression, computed by the database.
+
+    Without `batch_size`, a single `UPDATE` statement is issued. With `batch_size`,
+    the rows are updated in batches walking the `key_column` in order, so that
+    each statement only locks a bounded number of rows. Run the batches inside
+    alembic's `autocommit_block` to commit each of them separately.
+
+    Args:
+        connection (Connection): The database connection.
+        table_name (str): The name of the table to update.
+        column_name (str): The name of the column to update.
+        expression (str): The SQL expression of the new value. The quoted column
+            can be referenced with the `{column}` placeholder.
+        where (str | None): An optional SQL condition on the updated rows. The
+            quoted column can be referenced with the `{column}` placeholder.
+        batch_size (int | None): The number of rows to update per statement. If
+            None, update all the rows in one statement.
+        key_column (str): The unique column used to walk the table in batches.
+            Defaults to "iri".
+        progress (Callable[[int], None] | None): Called with the total number of
+            updated rows after each statement.
+
+    Returns:
+        int: The number of updated rows.
+    """
+    table = quote_identifier(table_name)
+    column = quote_identifier(column_name)
+    key = quote_identifier(key_column)
+    value = expression.format(column=column)
+    condition = where.format(column=column) if where else "TRUE"
+
+    if batch_size is None:
+        result = connection.execute(
+            text(f"UPDATE {table} SET {column} = {value} WHERE {condition}")
+        )
+        _report(table_name, column_name, result.rowcount, progress)
+        return result.rowcount
+
+    # The last key of a batch is computed by the database, so that the next batch
+    # starts according to the database ordering of the key column.
+    def batch_statement(after: str) -> TextClause:
+        return text(
+            f"WITH batch AS (SELECT {key} FROM {table} "
+            f"WHERE {after}({condition}) ORDER BY {key} LIMIT :batch_size), "
+            f"updated AS (UPDATE {table} SET {column} = {value} FROM batch "
+            f"WHERE {table}.{key} = batch.{key} RETURNING {table}.{key}) "
+            f"SELECT count(*), max({key}) FROM updated"
+        )
+
+    statement = batch_statement("")
+    next_statement = batch_statement(f"{key} > :last_key AND ")
+    parameters: dict = {"batch_size": batch_size}
+    updated = 0
+    while True:
+        count, parameters["last_key"] = connection.execute(statement, parameters).one()
+        if not count:
+            return updated
+        updated += count
+        _report(table_name, column_name, updated, progress)
+        statement = next_statement
+
+
+def _report(
+    table_name: str,
+    column_name: str,
+    updated: int,
+    progress: Callable[[int], None] | None,
+) -> None:
+    logger.info("Updated %d rows of %s.%s", updated, table_name, column_name)
+    if progress is not None:
+        progress(updated)
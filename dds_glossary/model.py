@@ -1,14 +1,50 @@
+# pylint: disable=too-many-lines
 """Model classes for the dds_glossary package."""
 
-from abc import abstractmethod
-from typing import ClassVar
+# The hybrid IRI property makes pylint infer `Mapped` as unsubscriptable.
+# pylint: disable=unsubscriptable-object
 
-from pydantic import BaseModel
-from sqlalchemy import Column, ForeignKey, String, Table
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from abc import abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import ClassVar, Final, Iterable
+
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+from sqlalchemy import (
+    JSON,
+    Column,
+    ColumnElement,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    ScalarSelect,
+    String,
+    Table,
+    and_,
+    any_,
+    event,
+    false,
+    inspect,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlalchemy.ext.hybrid import Comparator, hybrid_property
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    column_property,
+    declared_attr,
+    mapped_column,
+    query_expression,
+    relationship,
+)
 
-from .enums import MemberType, SemanticRelationType
+from .enums import DocumentType, LabelKind, MemberType, SemanticRelationType
 from .xml import (
     get_element_attribute,
     get_sub_element_as_str,
@@ -25,10 +61,29 @@ class Dataset(BaseModel):
     Attributes:
         name (str): The name of the dataset.
         url (str): The URL of the dataset.
+        version (str): The version of the dataset, used to query a release of a
+            classification alongside the others. Defaults to the name of the
+            dataset without its extension.
     """
 
     name: str
     url: str
+    version: str = Field(default="", validate_default=True)
+
+    @field_validator("version")
+    @classmethod
+    def default_version(cls, version: str, info: ValidationInfo) -> str:
+        """
+        Default the version to the name of the dataset without its extension.
+
+        Args:
+            version (str): The version of the dataset.
+            info (ValidationInfo): The validation info, holding the name.
+
+        Returns:
+            str: The version of the dataset.
+        """
+        return version or Path(info.data.get("name", "")).stem
 
 
 class FailedDataset(Dataset):
@@ -42,12 +97,17 @@ class FailedDataset(Dataset):
     error: str
 
 
+# The type of the labels by language columns, JSONB on PostgreSQL and JSON text on
+# SQLite, for the read-only files written by `database.export_sqlite`.
+LABELS_JSON: Final = JSON().with_variant(JSONB(), "postgresql")
+
+
 class Base(DeclarativeBase):
     """Base class for all models."""
 
     type_annotation_map: ClassVar[dict] = {
-        dict[str, str]: JSONB,
-        dict[str, list[str]]: JSONB,
+        dict[str, str]: LABELS_JSON,
+        dict[str, list[str]]: LABELS_JSON,
     }
 
     def __eq__(self, other: object) -> bool:
@@ -97,7 +157,172 @@ class Base(DeclarativeBase):
         """
 
 
-class ConceptScheme(Base):
+class IriPrefix(Base):
+    """
+    Prefix shared by the IRIs of the concept schemes and members, such as
+    `http://data.europa.eu/xsp/cn2024/`, stored once instead of in every row.
+
+    Attributes:
+        id (int): The surrogate key of the prefix.
+        prefix (str): The prefix, up to and including the last `/` or `#` of the
+            IRIs.
+    """
+
+    __tablename__ = "iri_prefixes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    prefix: Mapped[str] = mapped_column(unique=True)
+
+    @staticmethod
+    def split(iri: str) -> tuple[str, str]:
+        """
+        Split an IRI into its prefix and local name.
+
+        Args:
+            iri (str): The IRI to split.
+
+        Returns:
+            tuple[str, str]: The prefix and the local name of the IRI.
+        """
+        end = max(iri.rfind("/"), iri.rfind("#")) + 1
+        return iri[:end], iri[end:]
+
+    @classmethod
+    def split_all(cls, iris: Iterable[str]) -> dict[str, list[str]]:
+        """
+        Split IRIs into their prefixes and local names, see `split`.
+
+        Args:
+            iris (Iterable[str]): The IRIs to split.
+
+        Returns:
+            dict[str, list[str]]: The local names of the IRIs by prefix.
+        """
+        local_names: dict[str, list[str]] = {}
+        for iri in iris:
+            prefix, local_name = cls.split(iri)
+            local_names.setdefault(prefix, []).append(local_name)
+        return local_names
+
+    @classmethod
+    def select_id(cls, prefix: str) -> ScalarSelect[int]:
+        """
+        Build a subquery selecting the id of a prefix.
+
+        Args:
+            prefix (str): The prefix.
+
+        Returns:
+            ScalarSelect[int]: The subquery.
+        """
+        return select(cls.id).where(cls.prefix == prefix).scalar_subquery()
+
+    def to_dict(self) -> dict:
+        """
+        Return the IriPrefix instance as a dictionary.
+
+        Returns:
+            dict: The IriPrefix instance as a dictionary.
+        """
+        return {"prefix": self.prefix}
+
+
+class IriComparator(  # pylint: disable=abstract-method,too-many-ancestors
+    Comparator[str]
+):
+    """
+    Comparator of the IRIs stored as a prefix and a local name. Comparisons with
+    full IRIs are rewritten on the prefix id and local name, so that they use the
+    index on both columns. Comparisons with parameters or expressions,
+    whose IRI is only known to the database, are made on the concatenated IRI.
+    """
+
+    def __init__(self, entity) -> None:
+        self.entity = entity
+        super().__init__(
+            select(IriPrefix.prefix)
+            .where(IriPrefix.id == entity.prefix_id)
+            .scalar_subquery()
+            + entity.local_name
+        )
+
+    def __eq__(self, other: object) -> ColumnElement[bool]:  # type: ignore[override]
+        if not isinstance(other, str):
+            return self.expression == other  # type: ignore[return-value]
+        prefix, local_name = IriPrefix.split(other)
+        return and_(
+            self.entity.prefix_id == IriPrefix.select_id(prefix),
+            self.entity.local_name == local_name,
+        )
+
+    def in_(self, other: Iterable[str]) -> ColumnElement[bool]:  # type: ignore
+        return or_(
+            false(),
+            *(
+                and_(
+                    self.entity.prefix_id == IriPrefix.select_id(prefix),
+                    self.entity.local_name == any_(literal(names, ARRAY(String))),
+                )
+                for prefix, names in IriPrefix.split_all(other).items()
+            ),
+        )
+
+
+class IriEntity(Base):  # pylint: disable=abstract-method
+    """
+    Base class for the entities identified by an IRI, stored as a shared prefix and a
+    local name. The full IRI is available, and can be queried, as the `iri`
+    attribute.
+
+    An IRI can be stored in several rows, one per content it had in the ingested
+    releases, the `current` one holding its content in the last ingested release.
+
+    Attributes:
+        prefix_id (int): The id of the IRI prefix.
+        local_name (str): The IRI without its prefix.
+        current (bool): Whether the row holds the content of the IRI in the last
+            ingested release, served when no dataset version is requested.
+        prefix (IriPrefix): The IRI prefix.
+    """
+
+    __abstract__ = True
+
+    prefix_id: Mapped[int] = mapped_column(ForeignKey(IriPrefix.id))
+    local_name: Mapped[str] = mapped_column()
+    current: Mapped[bool] = mapped_column(default=True)
+
+    @declared_attr
+    def prefix(cls) -> "Mapped[IriPrefix]":  # pylint: disable=no-self-argument
+        """The IRI prefix, loaded with the entity."""
+        return relationship(IriPrefix, lazy="joined", innerjoin=True)
+
+    @hybrid_property
+    def iri(self) -> str:
+        """The Internationalized Resource Identifier of the entity."""
+        return self.prefix.prefix + self.local_name
+
+    @iri.inplace.setter
+    def _iri_setter(self, value: str) -> None:
+        prefix, self.local_name = IriPrefix.split(value)
+        self.prefix = IriPrefix(prefix=prefix)
+
+    @iri.inplace.comparator
+    @classmethod
+    def _iri_comparator(cls) -> IriComparator:
+        return IriComparator(cls)
+
+    @abstractmethod
+    def get_content(self) -> tuple:
+        """
+        Get the content of the entity, compared with its stored rows to share them
+        between the releases holding the same content.
+
+        Returns:
+            tuple: The content of the entity.
+        """
+
+
+class ConceptScheme(IriEntity):
     """
     A SKOS concept scheme can be viewed as an aggregation of one or more SKOS concepts.
     Semantic relationships (links) between those concepts may also be viewed as part of
@@ -111,7 +336,10 @@ class ConceptScheme(Base):
     For more information, check: https://www.w3.org/TR/skos-reference/#schemes.
 
     Attributes:
-        iri (str): The Internationalized Resource Identifier of the concept scheme.
+        id (int): The surrogate key of the concept scheme, referenced by the other
+            tables instead of the IRI.
+        iri (str): The Internationalized Resource Identifier of the concept scheme,
+            stored as a shared prefix and a local name.
         notation (str): The notation of the concept scheme.
         scopeNote (str): The scope note of the concept scheme.
         prefLabels (dict[str, str]): The preferred labels of the concept scheme. This
@@ -122,8 +350,21 @@ class ConceptScheme(Base):
     """
 
     __tablename__ = "concept_schemes"
+    # The rows of an IRI are looked up by the first index, and its current row is
+    # kept unique by the second one.
+    __table_args__ = (
+        Index("ix_concept_schemes_iri", "prefix_id", "local_name"),
+        Index(
+            "ix_concept_schemes_current_iri",
+            "prefix_id",
+            "local_name",
+            unique=True,
+            postgresql_where=sql_text("current"),
+            sqlite_where=sql_text("current"),
+        ),
+    )
 
-    iri: Mapped[str] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     notation: Mapped[str] = mapped_column()
     scopeNote: Mapped[str] = mapped_column()
     prefLabels: Mapped[dict[str, str]] = mapped_column()
@@ -169,13 +410,26 @@ class ConceptScheme(Base):
             "prefLabel": self.get_in_language(self.prefLabels, lang=lang),
         }
 
+    def get_content(self) -> tuple:
+        """
+        Get the content of the concept scheme, its notation, scope note and
+        preferred labels in every language.
+
+        Returns:
+            tuple: The content of the concept scheme.
+        """
+        return (self.notation, self.scopeNote, self.prefLabels)
 
-class Member(Base):
+
+class Member(IriEntity):
     """
     Base classe for the collection members.
 
     Attributes:
-        iri (str): The Internationalized Resource Identifier of the collection member.
+        id (int): The surrogate key of the collection member, referenced by the other
+            tables instead of the IRI.
+        iri (str): The Internationalized Resource Identifier of the collection
+            member, stored as a shared prefix and a local name.
         notation (str): The notation of the collection member.
         prefLabels (dict[str, str]): The preferred labels of the collection member. This
             is a dictionary where the key is the language code and the value is the
@@ -185,11 +439,32 @@ class Member(Base):
         concept_schemes (list[ConceptScheme]): The concept schemes to which the member
             belongs.
         collections (list[Collection]): The collections to which the member belongs.
+        labels (list[Label]): The labels of the collection member, one per language,
+            kept consistent with `prefLabels` when the member is flushed.
+        prefLabelInLanguage (str | None): The preferred label in the language of the
+            query, only loaded by the queries reading a single language.
     """
 
     __tablename__ = "collection_members"
+    # The rows of an IRI are looked up by the first index, and its current row is
+    # kept unique by the second one.
+    __table_args__ = (
+        Index("ix_collection_members_iri", "prefix_id", "local_name"),
+        Index(
+            "ix_collection_members_current_iri",
+            "prefix_id",
+            "local_name",
+            unique=True,
+            postgresql_where=sql_text("current"),
+            sqlite_where=sql_text("current"),
+        ),
+        # The keyset of the member pages, see `database.paginate_members`.
+        Index(
+            "ix_collection_members_notation_iri", "notation", "prefix_id", "local_name"
+        ),
+    )
 
-    iri: Mapped[str] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     notation: Mapped[str] = mapped_column()
     prefLabels: Mapped[dict[str, str]] = mapped_column()
     member_type: Mapped[MemberType] = mapped_column()
@@ -209,6 +484,11 @@ class Member(Base):
         secondary="in_collection",
         back_populates="members",
     )
+    labels: Mapped[list["Label"]] = relationship(
+        "Label",
+        cascade="all, delete-orphan",
+    )
+    prefLabelInLanguage: Mapped[str | None] = query_expression()
 
     @classmethod
     def get_concept_schemes(
@@ -234,6 +514,45 @@ class Member(Base):
             if concept_scheme.iri in scheme_iris
         ]
 
+    def get_labels(self) -> list["Label"]:
+        """
+        Get the labels of the member, from its labels in every language.
+
+        Returns:
+            list[Label]: The labels of the member.
+        """
+        return [
+            Label(kind=LabelKind.PREF_LABEL, lang=lang, text=text, position=0)
+            for lang, text in self.prefLabels.items()
+        ]
+
+    def get_content(self) -> tuple:
+        """
+        Get the content of the member, its type, notation and preferred labels in
+        every language. The members of a collection are left out, as they are
+        merged between the releases instead.
+
+        Returns:
+            tuple: The content of the member.
+        """
+        return (self.member_type, self.notation, self.prefLabels)
+
+    def get_pref_label(self, lang: str = "en") -> str:
+        """
+        Get the preferred label in the specified language, loaded by the query if it
+        read a single language, otherwise looked up in `prefLabels`.
+
+        Args:
+            lang (str): The language code of the preferred label.
+
+        Returns:
+            str: The preferred label in the specified language if available,
+                otherwise in English.
+        """
+        if self.prefLabelInLanguage is not None:
+            return self.prefLabelInLanguage
+        return self.get_in_language(self.prefLabels, lang)
+
     def to_dict(self, lang: str = "en") -> dict:
         """
         Return the Member instance as a dictionary.
@@ -247,7 +566,7 @@ class Member(Base):
         return {
             "iri": self.iri,
             "notation": self.notation,
-            "prefLabel": self.get_in_language(self.prefLabels, lang),
+            "prefLabel": self.get_pref_label(lang),
         }
 
 
@@ -262,12 +581,13 @@ class Collection(Member):
     For more information, check: https://www.w3.org/TR/skos-reference/#collections.
 
     Attributes:
+        id (int): The surrogate key of the collection.
         iri (str): The Internationalized Resource Identifier of the collection.
     """
 
     __tablename__ = "collections"
 
-    iri: Mapped[str] = mapped_column(ForeignKey(Member.iri), primary_key=True)
+    id: Mapped[int] = mapped_column(ForeignKey(Member.id), primary_key=True)
     member_iris: list[str] = []
 
     members: Mapped[list[Member]] = relationship(
@@ -333,6 +653,7 @@ class Concept(Member):
     For more information, check: https://www.w3.org/TR/skos-reference/#concepts.
 
     Attributes:
+        id (int): The surrogate key of the concept.
         iri (str): The Internationalized Resource Identifier of the concept.
         identifier (str): The identifier of the concept.
         altLabels (dict[str, list[str]]): The alternative labels of the concept. This is
@@ -343,14 +664,20 @@ class Concept(Member):
             This is a dictionary where the key is the language code and the value is the
             note in that language. To get the scope note in a specific language, use the
             `get_in_language` method.
+        altLabelsInLanguage (list[str] | None): The alternative labels in the language
+            of the query, only loaded by the queries reading a single language.
+        scopeNoteInLanguage (str | None): The scope note in the language of the query,
+            only loaded by the queries reading a single language.
     """
 
     __tablename__ = "concepts"
 
-    iri: Mapped[str] = mapped_column(ForeignKey(Member.iri), primary_key=True)
+    id: Mapped[int] = mapped_column(ForeignKey(Member.id), primary_key=True)
     identifier: Mapped[str] = mapped_column()
     altLabels: Mapped[dict[str, list[str]]] = mapped_column()
     scopeNotes: Mapped[dict[str, str]] = mapped_column()
+    altLabelsInLanguage: Mapped[list[str] | None] = query_expression()
+    scopeNoteInLanguage: Mapped[str | None] = query_expression()
 
     __mapper_args__ = {
         "polymorphic_identity": MemberType.CONCEPT,
@@ -383,6 +710,41 @@ class Concept(Member):
             concept_schemes=cls.get_concept_schemes(element, concept_schemes),
         )
 
+    def get_labels(self) -> list["Label"]:
+        """
+        Get the labels of the concept, from its labels in every language.
+
+        Returns:
+            list[Label]: The labels of the concept.
+        """
+        return [
+            *super().get_labels(),
+            *(
+                Label(kind=LabelKind.ALT_LABEL, lang=lang, text=text, position=position)
+                for lang, texts in self.altLabels.items()
+                for position, text in enumerate(texts)
+            ),
+            *(
+                Label(kind=LabelKind.SCOPE_NOTE, lang=lang, text=text, position=0)
+                for lang, text in self.scopeNotes.items()
+            ),
+        ]
+
+    def get_content(self) -> tuple:
+        """
+        Get the content of the concept, the content of a member with its
+        identifier, alternative labels and scope notes in every language.
+
+        Returns:
+            tuple: The content of the concept.
+        """
+        return (
+            *super().get_content(),
+            self.identifier,
+            self.altLabels,
+            self.scopeNotes,
+        )
+
     def to_dict(self, lang: str = "en") -> dict:
         """
         Return the Concept instance as a dictionary.
@@ -394,13 +756,67 @@ class Concept(Member):
         Returns:
             dict: The Concept instance as a dictionary.
         """
+        if self.prefLabelInLanguage is not None:
+            alt_labels = self.altLabelsInLanguage
+            scope_note = self.scopeNoteInLanguage
+        else:
+            alt_labels = self.get_in_language_list(self.altLabels, lang=lang)
+            scope_note = self.get_in_language(self.scopeNotes, lang=lang)
         return {
             "iri": self.iri,
             "identifier": self.identifier,
             "notation": self.notation,
-            "prefLabel": self.get_in_language(self.prefLabels, lang=lang),
-            "altLabels": self.get_in_language_list(self.altLabels, lang=lang),
-            "scopeNote": self.get_in_language(self.scopeNotes, lang=lang),
+            "prefLabel": self.get_pref_label(lang),
+            "altLabels": alt_labels,
+            "scopeNote": scope_note,
+        }
+
+
+class Label(Base):
+    """
+    Label of a collection member in a single language, copied from its `prefLabels`,
+    `altLabels` or `scopeNotes`, so that the labels in one language can be read, and
+    looked up, with an index instead of loading the labels in every language.
+
+    Attributes:
+        member_id (int): The surrogate key of the collection member.
+        kind (LabelKind): The kind of the label.
+        lang (str): The language code of the label.
+        position (int): The position of the label among the labels of the same kind
+            and language, only above 0 for the alternative labels.
+        text (str): The label.
+    """
+
+    __tablename__ = "labels"
+    # The scope notes are left out, as they can exceed the size of an index entry.
+    __table_args__ = (
+        Index(
+            "ix_labels_lang_kind_text",
+            "lang",
+            "kind",
+            "text",
+            postgresql_where=sql_text(f"kind <> '{LabelKind.SCOPE_NOTE.name}'"),
+        ),
+    )
+
+    member_id: Mapped[int] = mapped_column(ForeignKey(Member.id), primary_key=True)
+    kind: Mapped[LabelKind] = mapped_column(primary_key=True)
+    lang: Mapped[str] = mapped_column(primary_key=True)
+    position: Mapped[int] = mapped_column(primary_key=True)
+    text: Mapped[str] = mapped_column()
+
+    def to_dict(self) -> dict:
+        """
+        Return the Label instance as a dictionary.
+
+        Returns:
+            dict: The Label instance as a dictionary.
+        """
+        return {
+            "kind": self.kind.value,
+            "lang": self.lang,
+            "position": self.position,
+            "text": self.text,
         }
 
 
@@ -449,10 +865,14 @@ class SemanticRelation(Base):
 
     Attributes:
         type (SemanticRelationType): The type of the semantic relation.
+        source_concept_id (int): The surrogate key of the source concept.
+        target_concept_id (int): The surrogate key of the target concept.
         source_concept_iri (str): The Internationalized Resource Identifier of the
-            source concept.
+            source concept, loaded from the source concept.
         target_concept_iri (str): The Internationalized Resource Identifier of the
-            target concept.
+            target concept, loaded from the target concept.
+        version (str): The dataset version in which the relation is asserted. Empty
+            for relations saved without a version.
         source_concept (Concept): The source concept of the semantic relation.
         target_concept (Concept): The target concept of the semantic relation.
     """
@@ -461,16 +881,30 @@ class SemanticRelation(Base):
 
     type: Mapped[SemanticRelationType] = mapped_column()
 
-    source_concept_iri: Mapped[str] = mapped_column(
-        ForeignKey(Concept.iri),
+    source_concept_id: Mapped[int] = mapped_column(
+        ForeignKey(Concept.id),
         primary_key=True,
     )
-    target_concept_iri: Mapped[str] = mapped_column(
-        ForeignKey(Concept.iri),
+    target_concept_id: Mapped[int] = mapped_column(
+        ForeignKey(Concept.id),
         primary_key=True,
+        index=True,
+    )
+    version: Mapped[str] = mapped_column(primary_key=True, default="")
+    source_concept: Mapped["Concept"] = relationship(foreign_keys=[source_concept_id])
+    target_concept: Mapped["Concept"] = relationship(foreign_keys=[target_concept_id])
+    source_concept_iri: Mapped[str] = column_property(
+        select(IriPrefix.prefix + Member.local_name)
+        .where(Member.id == source_concept_id, IriPrefix.id == Member.prefix_id)
+        .correlate_except(Member, IriPrefix)
+        .scalar_subquery()
+    )
+    target_concept_iri: Mapped[str] = column_property(
+        select(IriPrefix.prefix + Member.local_name)
+        .where(Member.id == target_concept_id, IriPrefix.id == Member.prefix_id)
+        .correlate_except(Member, IriPrefix)
+        .scalar_subquery()
     )
-    source_concept: Mapped["Concept"] = relationship(foreign_keys=[source_concept_iri])
-    target_concept: Mapped["Concept"] = relationship(foreign_keys=[target_concept_iri])
 
     @classmethod
     def from_xml_element(cls, element) -> list["SemanticRelation"]:
@@ -498,6 +932,19 @@ class SemanticRelation(Base):
             for target_concept_iri in target_concept_iris
         ]
 
+    def resolve_concepts_from_xml(self, concepts: dict[str, Concept]) -> None:
+        """
+        Resolve the source and target concepts from their IRIs.
+
+        Args:
+            concepts (dict[str, Concept]): The available concepts by IRI.
+
+        Returns:
+            None
+        """
+        self.source_concept = concepts[self.source_concept_iri]
+        self.target_concept = concepts[self.target_concept_iri]
+
     def to_dict(self) -> dict:
         """
         Return the SemanticRelation instance as a dictionary.
@@ -512,17 +959,175 @@ class SemanticRelation(Base):
         }
 
 
+class Document(Base):
+    """
+    Response document of a concept, concept scheme or collection, rendered as JSON
+    in a language after the ingestion, so that it is served as is instead of being
+    built from the stored entities on every request.
+
+    Attributes:
+        type (DocumentType): The type of the document.
+        iri (str): The Internationalized Resource Identifier of the concept, concept
+            scheme or collection.
+        lang (str): The language code of the labels of the document.
+        version (str): The dataset version of the document. Empty for the documents
+            of all the versions.
+        content (bytes): The JSON document.
+    """
+
+    __tablename__ = "documents"
+
+    type: Mapped[DocumentType] = mapped_column(primary_key=True)
+    iri: Mapped[str] = mapped_column(primary_key=True)
+    lang: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[str] = mapped_column(primary_key=True, default="")
+    content: Mapped[bytes] = mapped_column()
+
+    def to_dict(self) -> dict:
+        """
+        Return the Document instance as a dictionary.
+
+        Returns:
+            dict: The Document instance as a dictionary.
+        """
+        return {
+            "type": self.type.value,
+            "iri": self.iri,
+            "lang": self.lang,
+            "version": self.version,
+            "content": self.content,
+        }
+
+
+# The date of the dataset generation of the databases whose datasets were never
+# ingested, see `DatasetGeneration`.
+UNLOADED_AT: Final[datetime] = datetime.fromtimestamp(0, timezone.utc)
+
+
+class DatasetGeneration(Base):
+    """
+    Generation of the stored datasets, the single row bumped by each ingestion, so
+    that the processes serving the datasets identify the data they read, for their
+    response caches and the validators of their responses.
+
+    Attributes:
+        id (int): The id of the row, always 1.
+        generation (int): The dataset generation.
+        loaded_at (datetime): When the datasets were last ingested, to the second.
+    """
+
+    __tablename__ = "dataset_generation"
+
+    id: Mapped[int] = mapped_column(primary_key=True, default=1)
+    generation: Mapped[int] = mapped_column()
+    loaded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    def to_dict(self) -> dict:
+        """
+        Return the DatasetGeneration instance as a dictionary.
+
+        Returns:
+            dict: The DatasetGeneration instance as a dictionary.
+        """
+        return {
+            "id": self.id,
+            "generation": self.generation,
+            "loaded_at": self.loaded_at,
+        }
+
+
 in_scheme = Table(
     "in_scheme",
     Base.metadata,
-    Column("scheme_iri", String, ForeignKey(ConceptScheme.iri), primary_key=True),
-    Column("member_iri", String, ForeignKey(Member.iri), primary_key=True),
+    Column("scheme_id", Integer, ForeignKey(ConceptScheme.id), primary_key=True),
+    Column(
+        "member_id",
+        Integer,
+        ForeignKey(Member.id),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 
 in_collection = Table(
     "in_collection",
     Base.metadata,
-    Column("collection_iri", String, ForeignKey(Collection.iri), primary_key=True),
-    Column("member_iri", String, ForeignKey(Member.iri), primary_key=True),
+    Column("collection_id", Integer, ForeignKey(Collection.id), primary_key=True),
+    Column(
+        "member_id",
+        Integer,
+        ForeignKey(Member.id),
+        primary_key=True,
+        index=True,
+    ),
+)
+
+
+in_version = Table(
+    "in_version",
+    Base.metadata,
+    Column("version", String, primary_key=True),
+    Column("member_id", Integer, ForeignKey(Member.id), primary_key=True),
+)
+
+
+scheme_in_version = Table(
+    "scheme_in_version",
+    Base.metadata,
+    Column("version", String, primary_key=True),
+    Column("scheme_id", Integer, ForeignKey(ConceptScheme.id), primary_key=True),
 )
+
+
+@event.listens_for(Session, "before_flush")
+def share_iri_prefixes(session: Session, *_) -> None:
+    """
+    Replace the new IRI prefixes of the flushed entities by the stored ones, storing
+    the missing prefixes first, so that every prefix is stored once.
+
+    Args:
+        session (Session): The flushed session.
+    """
+    new_prefixes = [entity for entity in session.new if isinstance(entity, IriPrefix)]
+    if not new_prefixes:
+        return
+    prefixes = sorted({prefix.prefix for prefix in new_prefixes})
+    session.execute(
+        insert(IriPrefix).on_conflict_do_nothing(),
+        [{"prefix": prefix} for prefix in prefixes],
+    )
+    with session.no_autoflush:
+        stored = {
+            prefix.prefix: prefix
+            for prefix in session.scalars(
+                select(IriPrefix).where(IriPrefix.prefix.in_(prefixes))
+            )
+        }
+        for entity in [*session.new, *session.dirty]:
+            if isinstance(entity, IriEntity) and entity.prefix.id is None:
+                entity.prefix = stored[entity.prefix.prefix]
+        for prefix in new_prefixes:
+            session.expunge(prefix)
+
+
+@event.listens_for(Session, "before_flush")
+def sync_labels(session: Session, *_) -> None:
+    """
+    Rebuild the labels of the flushed members that are new or whose labels in every
+    language changed, so that the labels table stays consistent with them.
+
+    Args:
+        session (Session): The flushed session.
+    """
+    with session.no_autoflush:
+        for entity in [*session.new, *session.dirty]:
+            if not isinstance(entity, Member):
+                continue
+            state = inspect(entity)
+            if entity in session.new or any(
+                state.attrs[name].history.has_changes()
+                for name in ("prefLabels", "altLabels", "scopeNotes")
+                if name in state.attrs
+            ):
+                entity.labels = entity.get_labels()
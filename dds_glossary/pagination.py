@@ -0,0 +1,65 @@
+"""Keyset pagination cursors for the dds_glossary package."""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, Mapping, Sequence
+
+from .exceptions import InvalidCursorException
+
+
+def encode_cursor(notation: str, iri: str) -> str:
+    """
+    Encode the notation and IRI of the last member of a page as the cursor of the
+    next page, see `database.paginate_members`.
+
+    Args:
+        notation (str): The notation of the member.
+        iri (str): The IRI of the member.
+
+    Returns:
+        str: The cursor.
+    """
+    return urlsafe_b64encode(json.dumps([notation, iri]).encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> tuple[str, str] | None:
+    """
+    Decode a cursor encoded by `encode_cursor`.
+
+    Args:
+        cursor (str | None): The cursor, or None for the first page.
+
+    Returns:
+        tuple[str, str] | None: The notation and IRI of the last member of the
+            previous page, or None for the first page.
+
+    Raises:
+        InvalidCursorException: If the cursor is invalid.
+    """
+    if cursor is None:
+        return None
+    try:
+        notation, iri = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError) as error:
+        raise InvalidCursorException(cursor) from error
+    if not isinstance(notation, str) or not isinstance(iri, str):
+        raise InvalidCursorException(cursor)
+    return notation, iri
+
+
+def next_cursor(members: Sequence[Mapping[Any, Any]], limit: int | None) -> str | None:
+    """
+    Get the cursor of the page after the members, when they fill a page.
+
+    Args:
+        members (Sequence[Mapping[Any, Any]]): The members of the page, as rows
+            with their `notation` and `iri`.
+        limit (int | None): The maximum number of members of the page, or None if
+            the members are not paginated.
+
+    Returns:
+        str | None: The cursor of the next page, or None if there is none.
+    """
+    if limit is None or len(members) < limit:
+        return None
+    return encode_cursor(members[-1]["notation"], members[-1]["iri"])
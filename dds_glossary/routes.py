@@ -1,35 +1,113 @@
 """Routes for the dds_glossary server."""
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import RedirectResponse
+from typing import Annotated, Final, Literal, Mapping, Sequence
+
+import orjson
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from fastapi_versioning import version
+from pydantic import BaseModel
 from starlette.templating import Jinja2Templates, _TemplateResponse
 
 from .auth import get_api_key
+from .cache import ResponseCache
+from .enums import DocumentType
+from .pagination import encode_cursor
 from .schema import (
+    BatchRequest,
+    CacheStatisticsResponse,
     CollectionResponse,
     ConceptResponse,
     ConceptSchemeResponse,
     EntityResponse,
+    ExpandedConceptResponse,
     FullConceptResponse,
     FullConceptSchemeResponse,
     InitDatasetsResponse,
     VersionResponse,
 )
-from .services import GlossaryController, get_controller, get_templates
+from .services import (
+    GlossaryController,
+    check_not_modified,
+    get_controller,
+    get_ingestion_controller,
+    get_response_cache,
+    get_templates,
+)
+
+# The media type of the streamed responses, one JSON document per line.
+NDJSON_MEDIA_TYPE: Final[str] = "application/x-ndjson"
 
 router_versioned = APIRouter()
 router_non_versioned = APIRouter()
 
 
-@router_non_versioned.get("/")
-def home(
+def accepts_ndjson(request: Request) -> bool:
+    """
+    Check whether a request accepts the responses streamed as newline delimited
+    JSON, `NDJSON_MEDIA_TYPE`, from its `Accept` header.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        bool: Whether the request accepts the streamed responses.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def json_response(
+    content: BaseModel | Sequence[BaseModel] | Mapping[str, BaseModel | None],
+) -> Response:
+    """
+    Serialize the response models of a route with orjson. The models are built
+    from trusted internal data, so returning them as a response skips their
+    validation against the `response_model` of the route, and their encoding
+    with the standard JSON encoder.
+
+    Args:
+        content (BaseModel | Sequence[BaseModel] | Mapping[str, BaseModel | None]):
+            The response models.
+
+    Returns:
+        Response: The JSON response.
+    """
+    return Response(
+        content=orjson.dumps(content, default=BaseModel.model_dump),
+        media_type="application/json",
+    )
+
+
+def set_next_cursor(
+    response: Response,
+    entities: Sequence[EntityResponse],
+    limit: int | None,
+) -> None:
+    """
+    Set the `X-Next-Cursor` header of a paginated list response to the cursor of
+    its next page, when its entities fill the page.
+
+    Args:
+        response (Response): The response.
+        entities (Sequence[EntityResponse]): The entities of the page.
+        limit (int | None): The maximum number of entities of the page, or None if
+            the entities are not paginated.
+    """
+    if limit is not None and len(entities) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            entities[-1].notation, entities[-1].iri
+        )
+
+
+@router_non_versioned.get("/", dependencies=[Depends(check_not_modified)])
+async def home(  # pylint: disable=too-many-arguments
     request: Request,
     controller: GlossaryController = Depends(get_controller),
     templates: Jinja2Templates = Depends(get_templates),
     search_term: str = "",
     concept_scheme_iri: str = "",
     lang: str = "en",
+    version: str | None = None,  # pylint: disable=redefined-outer-name
 ) -> _TemplateResponse:
     """Get the home page.
     If a `search_term` term is provided, it will filter the concepts by the search term.
@@ -44,20 +122,33 @@ def home(
         concept_scheme_iri (str): The concept scheme IRI to filter the concepts.
             Defaults to "".
         lang (str): The language to use for searching concepts. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
 
     Returns:
         _TemplateResponse: The home page with search results if any.
     """
     if concept_scheme_iri:
-        concepts = controller.get_concepts(concept_scheme_iri, lang=lang)
+        concepts = await controller.run_within_budget(
+            request,
+            controller.get_concepts,
+            concept_scheme_iri,
+            lang=lang,
+            version=version,
+        )
     else:
-        concepts = controller.search_database(search_term, lang=lang)
+        concepts = await controller.run_within_budget(
+            request, controller.search_database, search_term, lang=lang, version=version
+        )
+    schemes = await controller.run_within_budget(
+        request, controller.get_concept_schemes, lang=lang, version=version
+    )
 
     return templates.TemplateResponse(
         "home.html",
         {
             "request": request,
-            "schemes": controller.get_concept_schemes(lang=lang),
+            "schemes": schemes,
             "concepts": concepts,
         },
     )
@@ -70,25 +161,68 @@ def status() -> RedirectResponse:
     return RedirectResponse(url="https://sentier.instatus.com/")
 
 
-@router_versioned.get("/search")
+@router_versioned.get(
+    "/search",
+    response_model=list[ConceptResponse],
+    dependencies=[Depends(check_not_modified)],
+)
 @version(0, 1)
-def search(
+async def search(  # pylint: disable=too-many-arguments
+    request: Request,
     search_term: str,
     controller: GlossaryController = Depends(get_controller),
     lang: str = "en",
-) -> list[ConceptResponse]:
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> Response:
     """Search concepts according to given expression.
     Note: This will be removed once #35 (Add elasticsearch) is closed.
 
     Args:
+        request (Request): The request.
         search_term (str): The search term to filter the concepts.
         controller (GlossaryController): The glossary controller.
         lang (str): The language to use for searching concepts. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
+        limit (int | None): The maximum number of concepts. Defaults to None, for
+            all of them.
+        cursor (str | None): The cursor of the page, from the `X-Next-Cursor`
+            header of the previous page. Defaults to None, for the first page.
+        fields (str | None): The comma separated fields of the concepts to include,
+            besides their `iri` and `notation`. Defaults to None, for all the fields.
 
     Returns:
-        list[ConceptResponse]: The search results, if any.
+        Response: The search results, if any, streamed as newline delimited JSON
+            if accepted.
     """
-    return controller.search_database(search_term, lang=lang)
+    if accepts_ndjson(request):
+        lines = await controller.run_within_budget(
+            request,
+            controller.stream_search,
+            search_term,
+            lang=lang,
+            version=version,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+        )
+        return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+    concepts = await controller.run_within_budget(
+        request,
+        controller.search_database,
+        search_term,
+        lang=lang,
+        version=version,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+    response = json_response(concepts)
+    set_next_cursor(response, concepts, limit)
+    return response
 
 
 @router_versioned.get("/version")
@@ -102,12 +236,29 @@ def get_version() -> VersionResponse:
     return VersionResponse()
 
 
+@router_versioned.get("/cache")
+@version(0, 1)
+def get_cache_statistics(
+    cache: ResponseCache = Depends(get_response_cache),
+) -> CacheStatisticsResponse:
+    """Get the statistics of the response cache.
+
+    Args:
+        cache (ResponseCache): The response cache.
+
+    Returns:
+        CacheStatisticsResponse: The statistics of the response cache.
+    """
+    return cache.statistics()
+
+
 @router_versioned.post("/init_datasets")
 @version(0, 1)
 def init_datasets(
-    controller: GlossaryController = Depends(get_controller),
+    controller: GlossaryController = Depends(get_ingestion_controller),
     _api_key: dict = Depends(get_api_key),
     reload: bool = False,
+    drop_database: bool = False,
 ) -> InitDatasetsResponse:
     """Initialize the datasets.
 
@@ -115,133 +266,477 @@ def init_datasets(
         controller (GlossaryController): The glossary controller.
         _api_key (dict): The API key.
         reload (bool): Flag to reload the datasets. Defaults to False.
+        drop_database (bool): Flag to drop the database first, deleting every
+            stored version. Defaults to False.
 
     Returns:
         InitDatasetsResponse: The response.
     """
-    return controller.init_datasets(reload=reload)
+    return controller.init_datasets(reload=reload, drop_database=drop_database)
 
 
-@router_versioned.get("/schemes")
+@router_versioned.get(
+    "/schemes",
+    response_model=list[ConceptSchemeResponse],
+    dependencies=[Depends(check_not_modified)],
+)
 @version(0, 1)
-def get_concept_schemes(
+async def get_concept_schemes(
+    request: Request,
     controller: GlossaryController = Depends(get_controller),
     lang: str = "en",
-) -> list[ConceptSchemeResponse]:
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+) -> Response:
     """
     Returns all the saved concept schemes.
 
     Args:
+        request (Request): The request.
         controller (GlossaryController): The glossary controller.
         lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
 
     Returns:
-        list[ConceptSchemeResponse]: The concept schemes.
+        Response: The concept schemes.
     """
-    return controller.get_concept_schemes(lang=lang)
+    return json_response(
+        await controller.run_within_budget(
+            request, controller.get_concept_schemes, lang=lang, version=version
+        )
+    )
 
 
-@router_versioned.get("/scheme")
+@router_versioned.get(
+    "/scheme",
+    response_model=FullConceptSchemeResponse,
+    dependencies=[Depends(check_not_modified)],
+)
 @version(0, 1)
-def get_concept_scheme(
+async def get_concept_scheme(  # pylint: disable=too-many-arguments
+    request: Request,
     concept_scheme_iri: str,
     controller: GlossaryController = Depends(get_controller),
     lang: str = "en",
-) -> FullConceptSchemeResponse:
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> Response:
     """
     Returns a concept scheme.
 
     Args:
+        request (Request): The request.
         concept_scheme_iri (str): The concept scheme IRI.
         controller (GlossaryController): The glossary controller.
         lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
+        limit (int | None): The maximum number of members. Defaults to None, for
+            all of them.
+        cursor (str | None): The cursor of the page, from the `X-Next-Cursor`
+            header or the `next_cursor` of the previous page. Defaults to None, for
+            the first page.
+        fields (str | None): The comma separated fields of the members to include,
+            besides their `iri` and `notation`. Defaults to None, for all the fields.
 
     Returns:
-        FullConceptSchemeResponse: The concept scheme with member
-            concepts and collections.
+        Response: The concept scheme with member concepts and collections, served
+            as is if precomputed, or streamed as newline delimited JSON if accepted.
     """
-    return controller.get_concept_scheme(concept_scheme_iri, lang=lang)
+    if accepts_ndjson(request):
+        lines = await controller.run_within_budget(
+            request,
+            controller.stream_concept_scheme,
+            concept_scheme_iri,
+            lang=lang,
+            version=version,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+        )
+        return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+    if limit is None and cursor is None and fields is None:
+        document = await controller.run_within_budget(
+            request,
+            controller.get_document,
+            DocumentType.CONCEPT_SCHEME,
+            concept_scheme_iri,
+            lang=lang,
+            version=version,
+        )
+        if document is not None:
+            return Response(content=document, media_type="application/json")
+    concept_scheme = await controller.run_within_budget(
+        request,
+        controller.get_concept_scheme,
+        concept_scheme_iri,
+        lang=lang,
+        version=version,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+    response = json_response(concept_scheme)
+    if concept_scheme.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = concept_scheme.next_cursor
+    return response
 
 
-@router_versioned.get("/collections")
+@router_versioned.get(
+    "/collections",
+    response_model=list[EntityResponse],
+    dependencies=[Depends(check_not_modified)],
+)
 @version(0, 1)
-def get_collections(
+async def get_collections(  # pylint: disable=too-many-arguments
+    request: Request,
     concept_scheme_iri: str,
     controller: GlossaryController = Depends(get_controller),
     lang: str = "en",
-) -> list[EntityResponse]:
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> Response:
     """
     Returns all the collections.
 
     Args:
+        request (Request): The request.
         concept_scheme_iri (str): The concept scheme IRI.
         controller (GlossaryController): The glossary controller.
         lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
+        limit (int | None): The maximum number of collections. Defaults to None, for
+            all of them.
+        cursor (str | None): The cursor of the page, from the `X-Next-Cursor`
+            header of the previous page. Defaults to None, for the first page.
+        fields (str | None): The comma separated fields of the collections to include,
+            besides their `iri` and `notation`. Defaults to None, for all the fields.
 
     Returns:
-        list[CollectionResponse]: The collections.
+        Response: The collections.
     """
-    return controller.get_collections(concept_scheme_iri, lang=lang)
+    collections = await controller.run_within_budget(
+        request,
+        controller.get_collections,
+        concept_scheme_iri,
+        lang=lang,
+        version=version,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+    response = json_response(collections)
+    set_next_cursor(response, collections, limit)
+    return response
 
 
-@router_versioned.get("/collection")
+@router_versioned.get(
+    "/collection",
+    response_model=CollectionResponse,
+    dependencies=[Depends(check_not_modified)],
+)
 @version(0, 1)
-def get_collection(
+async def get_collection(  # pylint: disable=too-many-arguments
+    request: Request,
     collection_iri: str,
     controller: GlossaryController = Depends(get_controller),
     lang: str = "en",
-) -> CollectionResponse:
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> Response:
     """
     Returns a collection.
 
     Args:
+        request (Request): The request.
         collection_iri (str): The collection IRI.
         controller (GlossaryController): The glossary controller.
         lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
+        limit (int | None): The maximum number of members. Defaults to None, for
+            all of them.
+        cursor (str | None): The cursor of the page, from the `X-Next-Cursor`
+            header or the `next_cursor` of the previous page. Defaults to None, for
+            the first page.
+        fields (str | None): The comma separated fields of the members to include,
+            besides their `iri` and `notation`. Defaults to None, for all the fields.
 
     Returns:
-        CollectionResponse: The collection with member collections
-            and concepts.
+        Response: The collection with member collections and concepts, served as
+            is if precomputed, or streamed as newline delimited JSON if accepted.
     """
-    return controller.get_collection(collection_iri, lang=lang)
+    if accepts_ndjson(request):
+        lines = await controller.run_within_budget(
+            request,
+            controller.stream_collection,
+            collection_iri,
+            lang=lang,
+            version=version,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+        )
+        return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+    if limit is None and cursor is None and fields is None:
+        document = await controller.run_within_budget(
+            request,
+            controller.get_document,
+            DocumentType.COLLECTION,
+            collection_iri,
+            lang=lang,
+            version=version,
+        )
+        if document is not None:
+            return Response(content=document, media_type="application/json")
+    collection = await controller.run_within_budget(
+        request,
+        controller.get_collection,
+        collection_iri,
+        lang=lang,
+        version=version,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+    response = json_response(collection)
+    if collection.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = collection.next_cursor
+    return response
 
 
-@router_versioned.get("/concepts")
+@router_versioned.get(
+    "/concepts",
+    response_model=list[ConceptResponse],
+    dependencies=[Depends(check_not_modified)],
+)
 @version(0, 1)
-def get_concepts(
+async def get_concepts(  # pylint: disable=too-many-arguments
+    request: Request,
     concept_scheme_iri: str,
     controller: GlossaryController = Depends(get_controller),
     lang: str = "en",
-) -> list[ConceptResponse]:
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> Response:
     """
     Returns all the concepts in a concept scheme.
 
     Args:
+        request (Request): The request.
         concept_scheme_iri (str): The concept scheme IRI.
         controller (GlossaryController): The glossary controller.
         lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
+        limit (int | None): The maximum number of concepts. Defaults to None, for
+            all of them.
+        cursor (str | None): The cursor of the page, from the `X-Next-Cursor`
+            header of the previous page. Defaults to None, for the first page.
+        fields (str | None): The comma separated fields of the concepts to include,
+            besides their `iri` and `notation`. Defaults to None, for all the fields.
 
     Returns:
-        list[ConceptResponse]: The concepts.
+        Response: The concepts, streamed as newline delimited JSON if accepted.
     """
-    return controller.get_concepts(concept_scheme_iri, lang=lang)
+    if accepts_ndjson(request):
+        lines = await controller.run_within_budget(
+            request,
+            controller.stream_concepts,
+            concept_scheme_iri,
+            lang=lang,
+            version=version,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+        )
+        return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+    concepts = await controller.run_within_budget(
+        request,
+        controller.get_concepts,
+        concept_scheme_iri,
+        lang=lang,
+        version=version,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+    response = json_response(concepts)
+    set_next_cursor(response, concepts, limit)
+    return response
 
 
-@router_versioned.get("/concept")
+@router_versioned.get(
+    "/concept",
+    response_model=FullConceptResponse | ExpandedConceptResponse,
+    dependencies=[Depends(check_not_modified)],
+)
 @version(0, 1)
-def get_concept(
+async def get_concept(  # pylint: disable=too-many-arguments
+    request: Request,
     concept_iri: str,
     controller: GlossaryController = Depends(get_controller),
     lang: str = "en",
-) -> FullConceptResponse:
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+    expand: Literal["relations"] | None = None,
+    fields: str | None = None,
+) -> Response:
     """
     Returns a concept.
 
     Args:
+        request (Request): The request.
         concept_iri (str): The concept IRI.
         lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
+        expand (Literal["relations"] | None): With "relations", the relations are
+            expanded with the notation and preferred label of their concepts.
+            Defaults to None, for no expansion.
+        fields (str | None): The comma separated fields of the concept to include,
+            besides its `iri`, `notation`, concept schemes and relations. Defaults
+            to None, for all the fields.
+
+    Returns:
+        Response: The concept with concept scheme and relations, served as is if
+            precomputed.
+    """
+    if expand is None and fields is None:
+        document = await controller.run_within_budget(
+            request,
+            controller.get_document,
+            DocumentType.CONCEPT,
+            concept_iri,
+            lang=lang,
+            version=version,
+        )
+        if document is not None:
+            return Response(content=document, media_type="application/json")
+    return json_response(
+        await controller.run_within_budget(
+            request,
+            controller.get_concept,
+            concept_iri,
+            lang=lang,
+            version=version,
+            expand_relations=expand == "relations",
+            fields=fields,
+        )
+    )
+
+
+@router_versioned.post(
+    "/schemes/batch", response_model=dict[str, ConceptSchemeResponse | None]
+)
+@version(0, 1)
+async def get_concept_schemes_batch(
+    request: Request,
+    batch: BatchRequest,
+    controller: GlossaryController = Depends(get_controller),
+    lang: str = "en",
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+) -> Response:
+    """
+    Returns the concept schemes with the given IRIs, looked up in a single query.
+
+    Args:
+        request (Request): The request.
+        batch (BatchRequest): The IRIs of the concept schemes.
+        controller (GlossaryController): The glossary controller.
+        lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
+
+    Returns:
+        Response: The concept schemes by IRI, null for those not found.
+    """
+    return json_response(
+        await controller.run_within_budget(
+            request,
+            controller.get_concept_schemes_by_iri,
+            batch.iris,
+            lang=lang,
+            version=version,
+        )
+    )
+
+
+@router_versioned.post(
+    "/collections/batch", response_model=dict[str, EntityResponse | None]
+)
+@version(0, 1)
+async def get_collections_batch(
+    request: Request,
+    batch: BatchRequest,
+    controller: GlossaryController = Depends(get_controller),
+    lang: str = "en",
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+) -> Response:
+    """
+    Returns the collections with the given IRIs, looked up in a single query.
+
+    Args:
+        request (Request): The request.
+        batch (BatchRequest): The IRIs of the collections.
+        controller (GlossaryController): The glossary controller.
+        lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
 
     Returns:
-        FullConceptResponse: The concept with concept scheme and relations.
+        Response: The collections by IRI, null for those not found.
     """
-    return controller.get_concept(concept_iri, lang=lang)
+    return json_response(
+        await controller.run_within_budget(
+            request,
+            controller.get_collections_by_iri,
+            batch.iris,
+            lang=lang,
+            version=version,
+        )
+    )
+
+
+@router_versioned.post(
+    "/concepts/batch", response_model=dict[str, ConceptResponse | None]
+)
+@version(0, 1)
+async def get_concepts_batch(
+    request: Request,
+    batch: BatchRequest,
+    controller: GlossaryController = Depends(get_controller),
+    lang: str = "en",
+    version: str | None = None,  # pylint: disable=redefined-outer-name
+) -> Response:
+    """
+    Returns the concepts with the given IRIs, looked up in a single query.
+
+    Args:
+        request (Request): The request.
+        batch (BatchRequest): The IRIs of the concepts.
+        controller (GlossaryController): The glossary controller.
+        lang (str): The language. Defaults to "en".
+        version (str | None): The dataset version. Defaults to None, for all the
+            versions.
+
+    Returns:
+        Response: The concepts by IRI, null for those not found.
+    """
+    return json_response(
+        await controller.run_within_budget(
+            request,
+            controller.get_concepts_by_iri,
+            batch.iris,
+            lang=lang,
+            version=version,
+        )
+    )
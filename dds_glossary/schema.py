@@ -1,10 +1,15 @@
 """Schema classes for the dds_glossary package."""
 
+from typing import Final
+
 from pydantic import BaseModel, Field
 
 from . import __version__
 from .model import Dataset, FailedDataset
 
+# The maximum number of IRIs looked up by a batch request.
+MAX_BATCH_IRIS: Final[int] = 1000
+
 
 class VersionResponse(BaseModel):
     """
@@ -17,6 +22,27 @@ class VersionResponse(BaseModel):
     version: str = __version__
 
 
+class CacheStatisticsResponse(BaseModel):
+    """
+    Response model for the cache endpoint.
+
+    Attributes:
+        generation (int): The dataset generation.
+        entries (int): The number of cached results.
+        bytes (int): The total size of the cached results, in bytes.
+        hits (int): The number of results served from the cache.
+        misses (int): The number of results computed.
+        evictions (int): The number of results evicted.
+    """
+
+    generation: int
+    entries: int
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
 class InitDatasetsResponse(BaseModel):
     """
     Response model for the init_datasets endpoint.
@@ -30,6 +56,17 @@ class InitDatasetsResponse(BaseModel):
     failed_datasets: list[FailedDataset] = Field(default_factory=list)
 
 
+class BatchRequest(BaseModel):
+    """
+    Request model for the batch endpoints, looking up entities by IRI.
+
+    Attributes:
+        iris (list[str]): The IRIs of the entities, at most `MAX_BATCH_IRIS`.
+    """
+
+    iris: list[str] = Field(min_length=1, max_length=MAX_BATCH_IRIS)
+
+
 class EntityResponse(BaseModel):
     """
     Base response model for the ConceptScheme, Collection and Concept models.
@@ -72,6 +109,19 @@ class RelationResponse(BaseModel):
     target_concept_iri: str
 
 
+class ExpandedRelationResponse(RelationResponse):
+    """
+    Response model for the SemanticRelation model with its concepts.
+
+    Attributes:
+        source_concept (EntityResponse): The source concept.
+        target_concept (EntityResponse): The target concept.
+    """
+
+    source_concept: EntityResponse
+    target_concept: EntityResponse
+
+
 class ConceptResponse(EntityResponse):
     """
     Response model for the Concept model.
@@ -94,10 +144,13 @@ class FullConceptSchemeResponse(ConceptSchemeResponse):
     Attributes:
         collections (list[EntityResponse]): The collections.
         concepts (list[ConceptResponse]): The concepts.
+        next_cursor (str | None): The cursor of the next page of the members, or
+            None if they are not paginated or if this is the last page.
     """
 
     collections: list[EntityResponse]
     concepts: list[ConceptResponse]
+    next_cursor: str | None = None
 
 
 class CollectionResponse(EntityResponse):
@@ -107,10 +160,13 @@ class CollectionResponse(EntityResponse):
     Attributes:
         collections (list[EntityResponse]): The collections.
         concepts (list[ConceptResponse]): The concepts.
+        next_cursor (str | None): The cursor of the next page of the members, or
+            None if they are not paginated or if this is the last page.
     """
 
     collections: list[EntityResponse]
     concepts: list[ConceptResponse]
+    next_cursor: str | None = None
 
 
 class FullConceptResponse(ConceptResponse):
@@ -124,3 +180,17 @@ class FullConceptResponse(ConceptResponse):
 
     concept_schemes: list[str]
     relations: list[RelationResponse]
+
+
+class ExpandedConceptResponse(ConceptResponse):
+    """
+    Response model for the Concept model with concept schemes and relations
+    expanded with their concepts.
+
+    Attributes:
+        concept_schemes (list[str]): The IRIs of the concept schemes.
+        relations (list[ExpandedRelationResponse]): The relations.
+    """
+
+    concept_schemes: list[str]
+    relations: list[ExpandedRelationResponse]
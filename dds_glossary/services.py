@@ -1,31 +1,84 @@
+# pylint: disable=too-many-lines
 """Services classes and utils for the dds_glossary package."""
 
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain, product
 from pathlib import Path
-from typing import ClassVar
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Final,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TypeVar,
+)
 
+import orjson
+from anyio import create_task_group, sleep
 from appdirs import user_data_dir
 from defusedxml.lxml import parse as parse_xml
+from fastapi import Depends, Header, Request
 from fastapi.templating import Jinja2Templates
 from owlready2 import get_ontology, onto_path
 from sqlalchemy import Engine
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy.exc import NoResultFound, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.util import greenlet_spawn
+from starlette.concurrency import run_in_threadpool
 
+from .cache import ResponseCache, cached
+from .conditional import STATE_KEY, conditional_headers, is_not_modified
 from .database import (
-    get_collection,
-    get_concept,
-    get_concept_scheme,
+    QueryBudget,
+    ReplicaSet,
+    bump_dataset_generation,
+    delete_version,
+    export_sqlite,
+    get_collection_member_rows,
+    get_collection_row,
+    get_concept_scheme_row,
+    get_concept_scheme_rows_by_iri,
     get_concept_schemes,
-    get_relations,
+    get_concept_with_relations,
+    get_dataset_generation,
+    get_document,
+    get_member_rows_by_iri,
+    get_relation_concept_rows,
+    get_scheme_member_rows,
+    has_iri_prefix,
+    init_async_engine,
     init_engine,
+    is_sqlite,
+    paginate_members,
     save_dataset,
-    search_database,
+    save_documents,
+    search_database_rows,
+    select_collection_member_rows,
+    select_scheme_member_rows,
+    select_search_rows,
+    stream_rows,
 )
-from .enums import MemberType
+from .enums import DocumentType, MemberType
 from .exceptions import (
     CollectionNotFoundException,
     ConceptNotFoundException,
     ConceptSchemeNotFoundException,
+    DatabaseBusyException,
+    InvalidCursorException,
+    NotModifiedException,
+    QueryCancelledException,
+    QueryTimeoutException,
 )
+from .fieldsets import decode_fields
 from .model import (
     Collection,
     Concept,
@@ -35,24 +88,68 @@ from .model import (
     Member,
     SemanticRelation,
 )
+from .pagination import decode_cursor, next_cursor
 from .schema import (
     CollectionResponse,
     ConceptResponse,
     ConceptSchemeResponse,
     EntityResponse,
+    ExpandedConceptResponse,
+    ExpandedRelationResponse,
     FullConceptResponse,
     FullConceptSchemeResponse,
     InitDatasetsResponse,
     RelationResponse,
 )
+from .settings import get_settings
+
+ResultT = TypeVar("ResultT")
+EntityResponseT = TypeVar("EntityResponseT", bound=EntityResponse)
+
+# The seconds between two checks of a request running within its time budget
+# whether its client disconnected.
+DISCONNECT_POLL_SECONDS: Final[float] = 0.1
 
+# The fields of the responses of the members, by member type.
+MEMBER_RESPONSE_FIELDS: Final[dict[MemberType, tuple[str, ...]]] = {
+    MemberType.CONCEPT: tuple(ConceptResponse.model_fields),
+    MemberType.COLLECTION: tuple(EntityResponse.model_fields),
+}
 
+# The attributes of a concept loaded with its labels in a single language holding
+# the fields of its response, see `database.load_in_language`.
+CONCEPT_FIELD_ATTRIBUTES: Final[dict[str, str]] = {
+    "iri": "iri",
+    "notation": "notation",
+    "prefLabel": "prefLabelInLanguage",
+    "identifier": "identifier",
+    "altLabels": "altLabelsInLanguage",
+    "scopeNote": "scopeNoteInLanguage",
+}
+
+
+# pylint: disable-next=too-many-instance-attributes,too-many-public-methods
 class GlossaryController:
     """
     Controller for the glossary.
 
     Attributes:
-        engine (Engine): The database engine.
+        engine (Engine): The database engine, of the primary database.
+        replicas (ReplicaSet): The read replicas of the database.
+        read_primary (bool): Whether the read methods use the primary engine
+            instead of the replicas.
+        budget (QueryBudget | None): The time budget of the queries of the read
+            methods, or None for no budget.
+        async_engine (AsyncEngine | None): The async engine of the primary
+            database, used by the read methods run by `run_async`.
+        reads_async (bool): Whether the read methods are being run on the event
+            loop by `run_async`.
+        unit_of_work (bool): Whether the read methods share a single session, see
+            `read_bind`, until `end_unit_of_work` is awaited.
+        session (Session | None): The session of the unit of work, or None if it
+            is not opened yet.
+        cache (ResponseCache | None): The cache of the results of the read methods,
+            see `cached`, or None for no cache.
         data_dir (Path): The data directory for saving the datasets.
     """
 
@@ -91,17 +188,213 @@ class GlossaryController:
         Dataset(name="ICC11.rdf", url=fao_url + "ICCv1.1/ICC11.rdf"),
         Dataset(name="WCACROPS.rdf", url=fao_url + "WCA2020Crops/WCACROPS.rdf"),
     ]
+    document_batch_size: ClassVar[int] = 1000
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         data_dir_path: str | Path = user_data_dir("dds_glossary", "dds_glossary"),
         engine: Engine | None = None,
+        replicas: ReplicaSet | None = None,
+        read_primary: bool = False,
+        budget: QueryBudget | None = None,
+        async_engine: AsyncEngine | None = None,
+        unit_of_work: bool = False,
+        cache: ResponseCache | None = None,
     ) -> None:
         self.engine = engine if engine else init_engine()
+        self.replicas = replicas if replicas is not None else get_replica_set()
+        self.read_primary = read_primary
+        self.budget = budget
+        self.async_engine = async_engine
+        self.reads_async = False
+        self.unit_of_work = unit_of_work
+        self.session: Session | None = None
+        self.cache = cache
         self.data_dir = Path(data_dir_path)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         onto_path.append(str(self.data_dir))
 
+    @property
+    def read_engine(self) -> Engine:
+        """
+        The engine of the read methods: the next replica, or the primary engine if
+        `read_primary` is set or if no replica is available, bound to the `budget`.
+        The primary engine is the `async_engine` while `reads_async` is set.
+        """
+        if self.reads_async and self.async_engine is not None:
+            engine = self.async_engine.sync_engine
+        else:
+            engine = self.stream_engine
+        return self.budget.bind(engine) if self.budget else engine
+
+    @property
+    def stream_engine(self) -> Engine:
+        """
+        The engine of the streamed responses, read in the threadpool once the read
+        method returned: the next replica, or the primary engine if `read_primary`
+        is set or if no replica is available. It is not bound to the `budget`, the
+        time of a stream growing with its size.
+        """
+        if self.read_primary:
+            return self.engine
+        return self.replicas.get_engine() or self.engine
+
+    @property
+    def read_bind(self) -> Engine | Session:
+        """
+        What the read methods read from: the `read_engine`, or with a
+        `unit_of_work`, the session opened on it by the first read, so that the
+        reads of a request share a single connection and transaction.
+        """
+        if not self.unit_of_work:
+            return self.read_engine
+        if self.session is None:
+            self.session = Session(self.read_engine, expire_on_commit=False)
+        return self.session
+
+    async def end_unit_of_work(self, commit: bool = True) -> None:
+        """
+        Close the session of the unit of work, if opened, committing its
+        transaction, see `read_session`, or rolling it back.
+
+        Args:
+            commit (bool): Whether to commit the transaction. Defaults to True.
+        """
+        session, self.session = self.session, None
+        if session is not None:
+            await self.run_async(close_session, session, commit)
+
+    @contextmanager
+    def primary_reads(self) -> Iterator[None]:
+        """
+        Read from the primary engine in the context, for the reads which must see
+        the data just saved, which the replicas may not have received yet.
+
+        Yields:
+            None: The context reading from the primary engine.
+        """
+        read_primary, self.read_primary = self.read_primary, True
+        unit_of_work, self.unit_of_work = self.unit_of_work, False
+        try:
+            yield
+        finally:
+            self.read_primary = read_primary
+            self.unit_of_work = unit_of_work
+
+    async def run_within_budget(
+        self,
+        request: Request,
+        method: Callable[..., ResultT],
+        *args: Any,
+        **kwargs: Any,
+    ) -> ResultT:
+        """
+        Run a read method, see `run_async`, within the `budget`, interrupting its
+        queries when the deadline is reached, and cancelling them when the client
+        of the request disconnects, so that a slow query holds neither a worker
+        thread nor a database connection past the budget.
+
+        Args:
+            request (Request): The request.
+            method (Callable[..., ResultT]): The read method.
+            *args (Any): The positional arguments of the method.
+            **kwargs (Any): The keyword arguments of the method.
+
+        Returns:
+            ResultT: The result of the method.
+
+        Raises:
+            QueryTimeoutException: If the budget is exceeded.
+            QueryCancelledException: If the client disconnected.
+            DatabaseBusyException: If no database connection is available in time.
+        """
+        budget = self.budget
+        if budget is None:
+            return await self.run_async(method, *args, **kwargs)
+        try:
+            async with create_task_group() as task_group:
+                task_group.start_soon(watch_budget, request, budget)
+                try:
+                    result = await self.run_async(method, *args, **kwargs)
+                finally:
+                    task_group.cancel_scope.cancel()
+        except ExceptionGroup as group:
+            # The watcher is only ever cancelled, the error is the one of the method.
+            error = group.exceptions[0]
+            raise error from error.__cause__
+        return result
+
+    async def run_async(
+        self, method: Callable[..., ResultT], *args: Any, **kwargs: Any
+    ) -> ResultT:
+        """
+        Run a read method as the async variant of the method. When the method reads
+        from the primary database and there is an `async_engine`, it runs on the
+        event loop, its queries awaited through the async engine, so that the
+        concurrent requests are limited by the connection pool instead of the
+        threadpool, the dataset generation of its cache being refreshed in the
+        threadpool first, see `ResponseCache.refresh`, as it is loaded by a
+        blocking query. Otherwise, for the replicas and the SQLite files, it runs
+        in the threadpool.
+
+        Args:
+            method (Callable[..., ResultT]): The read method.
+            *args (Any): The positional arguments of the method.
+            **kwargs (Any): The keyword arguments of the method.
+
+        Returns:
+            ResultT: The result of the method.
+        """
+        if self.async_engine is None or (
+            self.replicas.engines and not self.read_primary
+        ):
+            return await run_in_threadpool(self._call, method, *args, **kwargs)
+        if self.cache is not None and not self.read_primary:
+            await run_in_threadpool(self.cache.refresh)
+        self.reads_async = True
+        try:
+            return await greenlet_spawn(self._call, method, *args, **kwargs)
+        finally:
+            self.reads_async = False
+
+    def _call(
+        self, method: Callable[..., ResultT], *args: Any, **kwargs: Any
+    ) -> ResultT:
+        budget = self.budget
+        try:
+            return method(*args, **kwargs)
+        except PoolTimeoutError as error:
+            raise DatabaseBusyException() from error
+        except (OperationalError, TimeoutError) as error:
+            if budget is None:
+                raise
+            if budget.cancelled:
+                raise QueryCancelledException() from error
+            if budget.exceeded:
+                raise QueryTimeoutException(budget.seconds) from error
+            raise
+
+    def decode_cursor(self, cursor: str | None) -> tuple[str, str] | None:
+        """
+        Decode a cursor, see `pagination.decode_cursor`, whose IRI prefix must be
+        stored in the database, see `has_iri_prefix`, as it would otherwise select
+        no member.
+
+        Args:
+            cursor (str | None): The cursor, or None for the first page.
+
+        Returns:
+            tuple[str, str] | None: The notation and IRI of the last member of the
+                previous page, or None for the first page.
+
+        Raises:
+            InvalidCursorException: If the cursor is invalid.
+        """
+        after = decode_cursor(cursor)
+        if after is not None and not has_iri_prefix(self.read_bind, after[1]):
+            raise InvalidCursorException(str(cursor))
+        return after
+
     @staticmethod
     def get_scheme_members(
         members: list[Member], member_type: MemberType
@@ -164,30 +457,46 @@ class GlossaryController:
     def init_datasets(
         self,
         reload: bool = False,
+        drop_database: bool = False,
     ) -> InitDatasetsResponse:
         """
         Download and save the datasets, if they do not exist or if the reload flag is
-        set.
+        set. Each dataset replaces its version, deleted by `delete_version` once the
+        dataset is parsed, in the transaction saving it, the other stored versions
+        being kept. Then bump the dataset generation, see `bump_generation`,
+        precompute the documents in the `DOCUMENT_LANGUAGES` settings, export the
+        database to the `SQLITE_EXPORT_PATH` settings, and export the analytics
+        files to the `ANALYTICS_EXPORT_DIR` settings, if they are set.
 
         Args:
             reload (bool): Flag to reload the datasets. Defaults to False.
+            drop_database (bool): Flag to drop the database first, deleting every
+                stored version. Defaults to False.
 
         Returns:
             InitDatasetsResponse: The response with the saved and failed datasets.
         """
         saved_datasets: list[Dataset] = []
         failed_datasets: list[FailedDataset] = []
-        self.engine = init_engine(drop_database_flag=True)
+        if drop_database:
+            self.engine = init_engine(drop_database_flag=True)
         for dataset in self.datasets:
             dataset_path = self.data_dir / dataset.name
             try:
                 ontology = get_ontology(dataset.url).load(reload=reload)
                 ontology.save(file=str(dataset_path), format="rdfxml")
-                save_dataset(self.engine, *self.parse_dataset(dataset_path))
+                parsed_dataset = self.parse_dataset(dataset_path)
+                # The version is replaced in a single transaction, so that it is
+                # kept as is if the dataset fails to save.
+                with Session(self.engine) as session:
+                    delete_version(session, dataset.version)
+                    save_dataset(session, *parsed_dataset, version=dataset.version)
+                    session.commit()
                 saved_datasets.append(
                     Dataset(
                         name=dataset.name,
                         url=dataset.url,
+                        version=dataset.version,
                     )
                 )
             except Exception as error:  # pylint: disable=broad-except
@@ -195,31 +504,151 @@ class GlossaryController:
                     FailedDataset(
                         name=dataset.name,
                         url=dataset.url,
+                        version=dataset.version,
                         error=str(error),
                     )
                 )
+        # The results cached from the previous datasets are dropped before the
+        # documents are computed, then again once the documents are saved.
+        self.bump_generation()
+        settings = get_settings()
+        if settings.DOCUMENT_LANGUAGES:
+            self.materialize_documents(settings.DOCUMENT_LANGUAGES)
+            self.bump_generation()
+        if settings.SQLITE_EXPORT_PATH:
+            export_sqlite(self.engine, settings.SQLITE_EXPORT_PATH)
+        if settings.ANALYTICS_EXPORT_DIR:
+            # The analytics exports need the `analytics` optional dependencies.
+            # pylint: disable-next=import-outside-toplevel
+            from .analytics import export_analytics
+
+            export_analytics(
+                self.engine,
+                settings.ANALYTICS_EXPORT_DIR,
+                duckdb_path=settings.ANALYTICS_DUCKDB_PATH or None,
+            )
         return InitDatasetsResponse(
             saved_datasets=saved_datasets,
             failed_datasets=failed_datasets,
         )
 
-    def get_concept_schemes(self, lang: str = "en") -> list[ConceptSchemeResponse]:
+    def bump_generation(self) -> None:
+        """
+        Bump the dataset generation stored in the database, then refresh the
+        `cache`, if any, dropping its results once its replica serves the new
+        generation.
+        """
+        bump_dataset_generation(self.engine)
+        if self.cache is not None:
+            self.cache.refresh(force=True)
+
+    def materialize_documents(
+        self,
+        languages: list[str],
+        version: str | None = None,
+    ) -> int:
+        """
+        Render the responses of the concept schemes, and of their collections and
+        concepts, in each language and save them as documents served by
+        `get_document` until the next ingestion. The responses are read from the
+        primary database, which holds the ingested data before the replicas.
+
+        Args:
+            languages (list[str]): The languages of the documents.
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+
+        Returns:
+            int: The number of saved documents.
+        """
+        renderers: dict[DocumentType, Callable[..., Any]] = {
+            DocumentType.CONCEPT_SCHEME: self.get_concept_scheme,
+            DocumentType.COLLECTION: self.get_collection,
+            DocumentType.CONCEPT: self.get_concept,
+        }
+        keys: dict[tuple[DocumentType, str], None] = {}
+        for concept_scheme in get_concept_schemes(self.engine, version=version):
+            keys[(DocumentType.CONCEPT_SCHEME, concept_scheme.iri)] = None
+            for member in get_scheme_member_rows(
+                self.engine, concept_scheme.iri, version=version
+            ):
+                keys[(DocumentType(member["member_type"].value), member["iri"])] = None
+
+        documents: list[dict] = []
+        with self.primary_reads():
+            for (document_type, iri), lang in product(keys, languages):
+                response = renderers[document_type](iri, lang=lang, version=version)
+                documents.append(
+                    {
+                        "type": document_type,
+                        "iri": iri,
+                        "lang": lang,
+                        "version": version or "",
+                        "content": response.model_dump_json().encode(),
+                    }
+                )
+                if len(documents) == self.document_batch_size:
+                    save_documents(self.engine, documents)
+                    documents.clear()
+        save_documents(self.engine, documents)
+        return len(keys) * len(languages)
+
+    @cached
+    def get_document(
+        self,
+        document_type: DocumentType,
+        iri: str,
+        lang: str = "en",
+        version: str | None = None,
+    ) -> bytes | None:
+        """
+        Get the precomputed response of a concept, concept scheme or collection.
+
+        Args:
+            document_type (DocumentType): The type of the document.
+            iri (str): The IRI of the concept, concept scheme or collection.
+            lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+
+        Returns:
+            bytes | None: The JSON response, or None if it was not precomputed.
+        """
+        return get_document(
+            self.read_bind, document_type, iri, lang=lang, version=version
+        )
+
+    @cached
+    def get_concept_schemes(
+        self,
+        lang: str = "en",
+        version: str | None = None,
+    ) -> list[ConceptSchemeResponse]:
         """
         Get the concept schemes.
 
         Args:
             lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
 
         Returns:
             list[ConceptSchemeResponse]: The concept schemes.
         """
         return [
             ConceptSchemeResponse(**concept_scheme.to_dict(lang=lang))
-            for concept_scheme in get_concept_schemes(self.engine)
+            for concept_scheme in get_concept_schemes(self.read_bind, version=version)
         ]
 
-    def get_concept_scheme(
-        self, concept_scheme_iri: str, lang: str = "en"
+    @cached
+    def get_concept_scheme(  # pylint: disable=too-many-arguments
+        self,
+        concept_scheme_iri: str,
+        lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
     ) -> FullConceptSchemeResponse:
         """
         Get the concept scheme.
@@ -227,6 +656,14 @@ class GlossaryController:
         Args:
             concept_scheme_iri (str): The concept scheme IRI.
             lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of members. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
 
         Returns:
             FullConceptSchemeResponse: The concept scheme with its member
@@ -234,31 +671,51 @@ class GlossaryController:
 
         Raises:
             ConceptSchemeNotFoundException: If the concept scheme is not found.
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
         """
+        engine = self.read_bind
+        selected_fields = decode_fields(fields)
         try:
-            concept_scheme = get_concept_scheme(self.engine, concept_scheme_iri)
+            concept_scheme = get_concept_scheme_row(
+                engine, concept_scheme_iri, lang=lang, version=version
+            )
         except NoResultFound as nrf:
             raise ConceptSchemeNotFoundException(concept_scheme_iri) from nrf
 
-        collections = self.get_scheme_members(
-            concept_scheme.members, MemberType.COLLECTION
+        members = get_scheme_member_rows(
+            engine,
+            concept_scheme_iri,
+            lang=lang,
+            version=version,
+            limit=limit,
+            after=self.decode_cursor(cursor),
+            fields=selected_fields,
         )
-        concepts = self.get_scheme_members(concept_scheme.members, MemberType.CONCEPT)
         return FullConceptSchemeResponse(
-            **concept_scheme.to_dict(lang=lang),
+            **concept_scheme,
             collections=[
-                EntityResponse(**collection.to_dict(lang=lang))
-                for collection in collections
+                member_response(EntityResponse, member, selected_fields)
+                for member in members
+                if member["member_type"] == MemberType.COLLECTION
             ],
             concepts=[
-                ConceptResponse(**concept.to_dict(lang=lang)) for concept in concepts
+                member_response(ConceptResponse, member, selected_fields)
+                for member in members
+                if member["member_type"] == MemberType.CONCEPT
             ],
+            next_cursor=next_cursor(members, limit),
         )
 
-    def get_collections(
+    @cached
+    def get_collections(  # pylint: disable=too-many-arguments
         self,
         concept_scheme_iri: str,
         lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
     ) -> list[EntityResponse]:
         """
         Get the collections for a concept scheme.
@@ -266,28 +723,55 @@ class GlossaryController:
         Args:
             concept_scheme_iri (str): The concept scheme IRI.
             lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of collections. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
 
         Returns:
             list[EntityResponse]: The collections.
 
         Raises:
             ConceptSchemeNotFoundException: If the concept scheme is not found.
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
         """
+        engine = self.read_bind
+        selected_fields = decode_fields(fields)
         try:
-            concept_scheme = get_concept_scheme(self.engine, concept_scheme_iri)
+            get_concept_scheme_row(
+                engine, concept_scheme_iri, lang=lang, version=version
+            )
         except NoResultFound as nrf:
             raise ConceptSchemeNotFoundException(concept_scheme_iri) from nrf
 
-        collections = self.get_scheme_members(
-            concept_scheme.members, MemberType.COLLECTION
-        )
         return [
-            EntityResponse(**collection.to_dict(lang=lang))
-            for collection in collections
+            member_response(EntityResponse, collection, selected_fields)
+            for collection in get_scheme_member_rows(
+                engine,
+                concept_scheme_iri,
+                lang=lang,
+                version=version,
+                member_type=MemberType.COLLECTION,
+                limit=limit,
+                after=self.decode_cursor(cursor),
+                fields=selected_fields,
+            )
         ]
 
-    def get_collection(
-        self, collection_iri: str, lang: str = "en"
+    @cached
+    def get_collection(  # pylint: disable=too-many-arguments
+        self,
+        collection_iri: str,
+        lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
     ) -> CollectionResponse:
         """
         Get the collection.
@@ -295,6 +779,14 @@ class GlossaryController:
         Args:
             collection_iri (str): The collection IRI.
             lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of members. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
 
         Returns:
             CollectionResponse: The collection with its member collections
@@ -302,29 +794,51 @@ class GlossaryController:
 
         Raises:
             CollectionNotFoundException: If the collection is not found.
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
         """
+        engine = self.read_bind
+        selected_fields = decode_fields(fields)
         try:
-            collection = get_collection(self.engine, collection_iri)
+            collection = get_collection_row(
+                engine, collection_iri, lang=lang, version=version
+            )
         except NoResultFound as nrf:
             raise CollectionNotFoundException(collection_iri) from nrf
 
-        collections = self.get_scheme_members(collection.members, MemberType.COLLECTION)
-        concepts = self.get_scheme_members(collection.members, MemberType.CONCEPT)
+        members = get_collection_member_rows(
+            engine,
+            collection_iri,
+            lang=lang,
+            version=version,
+            limit=limit,
+            after=self.decode_cursor(cursor),
+            fields=selected_fields,
+        )
         return CollectionResponse(
-            **collection.to_dict(lang=lang),
+            **collection,
             collections=[
-                EntityResponse(**collection.to_dict(lang=lang))
-                for collection in collections
+                member_response(EntityResponse, member, selected_fields)
+                for member in members
+                if member["member_type"] == MemberType.COLLECTION
             ],
             concepts=[
-                ConceptResponse(**concept.to_dict(lang=lang)) for concept in concepts
+                member_response(ConceptResponse, member, selected_fields)
+                for member in members
+                if member["member_type"] == MemberType.CONCEPT
             ],
+            next_cursor=next_cursor(members, limit),
         )
 
-    def get_concepts(
+    @cached
+    def get_concepts(  # pylint: disable=too-many-arguments
         self,
         concept_scheme_iri: str,
         lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
     ) -> list[ConceptResponse]:
         """
         Get the concepts for a concept scheme.
@@ -332,51 +846,217 @@ class GlossaryController:
         Args:
             concept_scheme_iri (str): The concept scheme IRI.
             lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of concepts. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
 
         Returns:
             list[ConceptResponse]: The concepts.
 
         Raises:
             ConceptSchemeNotFoundException: If the concept scheme is not found.
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
         """
+        engine = self.read_bind
+        selected_fields = decode_fields(fields)
         try:
-            concept_scheme = get_concept_scheme(self.engine, concept_scheme_iri)
+            get_concept_scheme_row(
+                engine, concept_scheme_iri, lang=lang, version=version
+            )
         except NoResultFound as nrf:
             raise ConceptSchemeNotFoundException(concept_scheme_iri) from nrf
 
-        concepts = self.get_scheme_members(concept_scheme.members, MemberType.CONCEPT)
-        return [ConceptResponse(**concept.to_dict(lang=lang)) for concept in concepts]
+        return [
+            member_response(ConceptResponse, concept, selected_fields)
+            for concept in get_scheme_member_rows(
+                engine,
+                concept_scheme_iri,
+                lang=lang,
+                version=version,
+                member_type=MemberType.CONCEPT,
+                limit=limit,
+                after=self.decode_cursor(cursor),
+                fields=selected_fields,
+            )
+        ]
 
-    def get_concept(self, concept_iri: str, lang: str = "en") -> FullConceptResponse:
+    @cached
+    def get_concept(
+        self,
+        concept_iri: str,
+        lang: str = "en",
+        version: str | None = None,
+        expand_relations: bool = False,
+        fields: str | None = None,
+    ) -> FullConceptResponse | ExpandedConceptResponse:
         """
         Get the concept and al its relations.
 
         Args:
             concept_iri (str): The concept IRI.
             lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            expand_relations (bool): Whether to expand the relations with the
+                notation and preferred label of their source and target concepts,
+                read in a single query, see `get_relation_concept_rows`. Defaults to
+                False.
+            fields (str | None): The sparse fieldset of the concept, see
+                `decode_fields`, its concept schemes and relations being always
+                included. Defaults to None, for all the fields.
 
         Returns:
-            FullConceptResponse: The concept with its concept schemes and relations.
+            FullConceptResponse | ExpandedConceptResponse: The concept with its
+                concept schemes and relations, expanded if requested.
 
         Raises:
             ConceptNotFoundException: If the concept is not found.
+            InvalidFieldsException: If the sparse fieldset is invalid.
         """
+        engine = self.read_bind
+        selected_fields = decode_fields(fields)
         try:
-            concept = get_concept(self.engine, concept_iri)
+            concept, concept_scheme_iris, relations = get_concept_with_relations(
+                engine, concept_iri, version=version, lang=lang, fields=selected_fields
+            )
         except NoResultFound as nrf:
             raise ConceptNotFoundException(concept_iri) from nrf
 
-        return FullConceptResponse(
-            **concept.to_dict(lang=lang),
-            concept_schemes=[scheme.iri for scheme in concept.concept_schemes],
+        if not expand_relations:
+            return concept_response(
+                FullConceptResponse,
+                concept,
+                lang,
+                selected_fields,
+                concept_schemes=concept_scheme_iris,
+                relations=[
+                    RelationResponse(**relation.to_dict()) for relation in relations
+                ],
+            )
+        concepts = get_relation_concept_rows(engine, relations, lang=lang)
+        return concept_response(
+            ExpandedConceptResponse,
+            concept,
+            lang,
+            selected_fields,
+            concept_schemes=concept_scheme_iris,
             relations=[
-                RelationResponse(**relation.to_dict())
-                for relation in get_relations(self.engine, concept_iri)
+                ExpandedRelationResponse(
+                    **relation.to_dict(),
+                    source_concept=EntityResponse(
+                        **concepts[relation.source_concept_iri]
+                    ),
+                    target_concept=EntityResponse(
+                        **concepts[relation.target_concept_iri]
+                    ),
+                )
+                for relation in relations
             ],
         )
 
-    def search_database(
-        self, search_term: str, lang: str = "en"
+    def get_concept_schemes_by_iri(
+        self,
+        iris: list[str],
+        lang: str = "en",
+        version: str | None = None,
+    ) -> dict[str, ConceptSchemeResponse | None]:
+        """
+        Get the concept schemes with the given IRIs, in a single query.
+
+        Args:
+            iris (list[str]): The concept scheme IRIs.
+            lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+
+        Returns:
+            dict[str, ConceptSchemeResponse | None]: The concept schemes by IRI, in
+                the order of the IRIs, None for those not found.
+        """
+        concept_schemes = {
+            concept_scheme["iri"]: ConceptSchemeResponse(**concept_scheme)
+            for concept_scheme in get_concept_scheme_rows_by_iri(
+                self.read_bind, iris, lang=lang, version=version
+            )
+        }
+        return {iri: concept_schemes.get(iri) for iri in iris}
+
+    def get_collections_by_iri(
+        self,
+        iris: list[str],
+        lang: str = "en",
+        version: str | None = None,
+    ) -> dict[str, EntityResponse | None]:
+        """
+        Get the collections with the given IRIs, in a single query.
+
+        Args:
+            iris (list[str]): The collection IRIs.
+            lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+
+        Returns:
+            dict[str, EntityResponse | None]: The collections by IRI, in the order
+                of the IRIs, None for those not found.
+        """
+        collections = {
+            collection["iri"]: EntityResponse(**collection)
+            for collection in get_member_rows_by_iri(
+                self.read_bind,
+                iris,
+                lang=lang,
+                version=version,
+                member_type=MemberType.COLLECTION,
+            )
+        }
+        return {iri: collections.get(iri) for iri in iris}
+
+    def get_concepts_by_iri(
+        self,
+        iris: list[str],
+        lang: str = "en",
+        version: str | None = None,
+    ) -> dict[str, ConceptResponse | None]:
+        """
+        Get the concepts with the given IRIs, in a single query.
+
+        Args:
+            iris (list[str]): The concept IRIs.
+            lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+
+        Returns:
+            dict[str, ConceptResponse | None]: The concepts by IRI, in the order of
+                the IRIs, None for those not found.
+        """
+        concepts = {
+            concept["iri"]: ConceptResponse(**concept)
+            for concept in get_member_rows_by_iri(
+                self.read_bind,
+                iris,
+                lang=lang,
+                version=version,
+                member_type=MemberType.CONCEPT,
+            )
+        }
+        return {iri: concepts.get(iri) for iri in iris}
+
+    def search_database(  # pylint: disable=too-many-arguments
+        self,
+        search_term: str,
+        lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
     ) -> list[ConceptResponse]:
         """
         Search the database for concepts that match the `search_term` in the
@@ -385,24 +1065,584 @@ class GlossaryController:
         Args:
             search_term (str): The search term to match against.
             lang (str): The language to use for matching. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of concepts. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
 
         Returns:
             list[ConceptResponse]: The result concepts matching the `search_term`.
+
+        Raises:
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
         """
+        selected_fields = decode_fields(fields)
         return [
-            ConceptResponse(**concept.to_dict(lang=lang))
-            for concept in search_database(self.engine, search_term, lang=lang)
+            member_response(ConceptResponse, concept, selected_fields)
+            for concept in search_database_rows(
+                self.read_bind,
+                search_term,
+                lang=lang,
+                version=version,
+                limit=limit,
+                after=self.decode_cursor(cursor),
+                fields=selected_fields,
+            )
         ]
 
+    def stream_concept_scheme(  # pylint: disable=too-many-arguments
+        self,
+        concept_scheme_iri: str,
+        lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Stream the concept scheme as newline delimited JSON: its
+        `ConceptSchemeResponse` on the first line, then one member per line, read
+        with `stream_rows` once the returned iterator is consumed.
+
+        Args:
+            concept_scheme_iri (str): The concept scheme IRI.
+            lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of members. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
+
+        Returns:
+            Iterator[bytes]: The lines of the concept scheme and its members.
+
+        Raises:
+            ConceptSchemeNotFoundException: If the concept scheme is not found.
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
+        """
+        try:
+            concept_scheme = get_concept_scheme_row(
+                self.read_bind, concept_scheme_iri, lang=lang, version=version
+            )
+        except NoResultFound as nrf:
+            raise ConceptSchemeNotFoundException(concept_scheme_iri) from nrf
+
+        selected_fields = decode_fields(fields)
+        statement = paginate_members(
+            select_scheme_member_rows(
+                concept_scheme_iri, lang, version, fields=selected_fields
+            ),
+            limit,
+            self.decode_cursor(cursor),
+        )
+        return chain(
+            [
+                ConceptSchemeResponse(**concept_scheme).model_dump_json().encode()
+                + b"\n"
+            ],
+            ndjson_members(stream_rows(self.stream_engine, statement), selected_fields),
+        )
+
+    def stream_collection(  # pylint: disable=too-many-arguments
+        self,
+        collection_iri: str,
+        lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Stream the collection as newline delimited JSON, like
+        `stream_concept_scheme`: its `EntityResponse` on the first line, then one
+        member per line.
+
+        Args:
+            collection_iri (str): The collection IRI.
+            lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of members. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
+
+        Returns:
+            Iterator[bytes]: The lines of the collection and its members.
+
+        Raises:
+            CollectionNotFoundException: If the collection is not found.
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
+        """
+        try:
+            collection = get_collection_row(
+                self.read_bind, collection_iri, lang=lang, version=version
+            )
+        except NoResultFound as nrf:
+            raise CollectionNotFoundException(collection_iri) from nrf
+
+        selected_fields = decode_fields(fields)
+        statement = paginate_members(
+            select_collection_member_rows(
+                collection_iri, lang, version, selected_fields
+            ),
+            limit,
+            self.decode_cursor(cursor),
+        )
+        return chain(
+            [EntityResponse(**collection).model_dump_json().encode() + b"\n"],
+            ndjson_members(stream_rows(self.stream_engine, statement), selected_fields),
+        )
+
+    def stream_concepts(  # pylint: disable=too-many-arguments
+        self,
+        concept_scheme_iri: str,
+        lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Stream the concepts of a concept scheme as newline delimited JSON, one
+        `ConceptResponse` per line, like `stream_concept_scheme`.
+
+        Args:
+            concept_scheme_iri (str): The concept scheme IRI.
+            lang (str): The language. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of concepts. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
+
+        Returns:
+            Iterator[bytes]: The lines of the concepts.
+
+        Raises:
+            ConceptSchemeNotFoundException: If the concept scheme is not found.
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
+        """
+        try:
+            get_concept_scheme_row(
+                self.read_bind, concept_scheme_iri, lang=lang, version=version
+            )
+        except NoResultFound as nrf:
+            raise ConceptSchemeNotFoundException(concept_scheme_iri) from nrf
+
+        selected_fields = decode_fields(fields)
+        statement = paginate_members(
+            select_scheme_member_rows(
+                concept_scheme_iri, lang, version, MemberType.CONCEPT, selected_fields
+            ),
+            limit,
+            self.decode_cursor(cursor),
+        )
+        return ndjson_members(
+            stream_rows(self.stream_engine, statement), selected_fields
+        )
+
+    def stream_search(  # pylint: disable=too-many-arguments
+        self,
+        search_term: str,
+        lang: str = "en",
+        version: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Stream the concepts matching the `search_term` as newline delimited JSON,
+        one `ConceptResponse` per line, like `stream_concept_scheme`.
+
+        Args:
+            search_term (str): The search term to match against.
+            lang (str): The language to use for matching. Defaults to "en".
+            version (str | None): The dataset version. Defaults to None, for all the
+                versions.
+            limit (int | None): The maximum number of concepts. Defaults to None,
+                for all of them.
+            cursor (str | None): The cursor of the page, see `encode_cursor`.
+                Defaults to None, for the first page.
+            fields (str | None): The sparse fieldset of the members, see
+                `decode_fields`. Defaults to None, for all the fields.
+
+        Returns:
+            Iterator[bytes]: The lines of the result concepts.
+
+        Raises:
+            InvalidCursorException: If the cursor is invalid.
+            InvalidFieldsException: If the sparse fieldset is invalid.
+        """
+        engine = self.stream_engine
+        selected_fields = decode_fields(fields)
+        statement = paginate_members(
+            select_search_rows(
+                search_term,
+                lang,
+                version,
+                sqlite=is_sqlite(engine),
+                fields=selected_fields,
+            ),
+            limit,
+            self.decode_cursor(cursor),
+        )
+        return ndjson_members(stream_rows(engine, statement), selected_fields)
+
+
+def member_content(
+    member: Mapping[Any, Any],
+    fields: frozenset[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Get the content of a member row as a plain dict, with the
+    `MEMBER_RESPONSE_FIELDS` of its type, those of a `ConceptResponse` for the
+    concepts and of an `EntityResponse` for the collections. The rows are trusted
+    internal data, so they are not validated.
+
+    Args:
+        member (Mapping[Any, Any]): The member, as selected by `select_member_rows`.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `decode_fields`. Defaults to None, for all the fields.
+
+    Returns:
+        dict[str, Any]: The content of the member.
+    """
+    return {
+        field: member[field]
+        for field in MEMBER_RESPONSE_FIELDS[member["member_type"]]
+        if fields is None or field in fields
+    }
+
+
+def member_response(
+    response_type: type[EntityResponseT],
+    member: Mapping[Any, Any],
+    fields: frozenset[str] | None = None,
+) -> EntityResponseT:
+    """
+    Get the response of a member row. With a sparse fieldset, the response is
+    constructed without validation with the selected fields only, see
+    `member_content`, and is serialized without the other fields.
+
+    Args:
+        response_type (type[EntityResponseT]): The response type of the member.
+        member (Mapping[Any, Any]): The member, as selected by `select_member_rows`.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `decode_fields`. Defaults to None, for all the fields.
+
+    Returns:
+        EntityResponseT: The response of the member.
+    """
+    if fields is None:
+        return response_type(**member)
+    return response_type.model_construct(**member_content(member, fields))
+
+
+def concept_response(
+    response_type: type[EntityResponseT],
+    concept: Concept,
+    lang: str,
+    fields: frozenset[str] | None = None,
+    **extra: Any,
+) -> EntityResponseT:
+    """
+    Get the response of a concept loaded with its labels in a single language, like
+    `member_response`: with a sparse fieldset, the response is constructed without
+    validation with the selected fields only, read from the
+    `CONCEPT_FIELD_ATTRIBUTES` of the concept, the other ones not being loaded.
+
+    Args:
+        response_type (type[EntityResponseT]): The response type of the concept.
+        concept (Concept): The concept, see `database.load_in_language`.
+        lang (str): The language code of the labels.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `decode_fields`. Defaults to None, for all the fields.
+        **extra (Any): The other fields of the response.
+
+    Returns:
+        EntityResponseT: The response of the concept.
+    """
+    if fields is None:
+        return response_type(**concept.to_dict(lang=lang), **extra)
+    return response_type.model_construct(
+        **{
+            field: getattr(concept, CONCEPT_FIELD_ATTRIBUTES[field])
+            for field in MEMBER_RESPONSE_FIELDS[MemberType.CONCEPT]
+            if field in fields
+        },
+        **extra,
+    )
+
+
+def ndjson_members(
+    batches: Iterable[Sequence[Mapping[Any, Any]]],
+    fields: frozenset[str] | None = None,
+) -> Iterator[bytes]:
+    """
+    Serialize batches of member rows as newline delimited JSON with orjson, one
+    member per line, see `member_content`, lazily so that a single batch is held at
+    once.
+
+    Args:
+        batches (Iterable[Sequence[Mapping[Any, Any]]]): The batches of member
+            rows, see `stream_rows`.
+        fields (frozenset[str] | None): The fields of the sparse fieldset, see
+            `decode_fields`. Defaults to None, for all the fields.
+
+    Yields:
+        bytes: The lines of each batch.
+    """
+    for members in batches:
+        yield b"".join(
+            orjson.dumps(
+                member_content(member, fields), option=orjson.OPT_APPEND_NEWLINE
+            )
+            for member in members
+        )
+
+
+def close_session(session: Session, commit: bool = True) -> None:
+    """
+    Close a session, committing its transaction or rolling it back.
+
+    Args:
+        session (Session): The session.
+        commit (bool): Whether to commit the transaction. Defaults to True.
+    """
+    with session:
+        if commit:
+            session.commit()
+
+
+async def watch_budget(request: Request, budget: QueryBudget) -> None:
+    """
+    Watch a request running within a time budget, cancelling its queries when its
+    client disconnects, and interrupting them when the deadline is reached.
+
+    Args:
+        request (Request): The request.
+        budget (QueryBudget): The time budget.
+    """
+    while not budget.exceeded:
+        if await request.is_disconnected():
+            budget.cancel()
+            return
+        await sleep(min(DISCONNECT_POLL_SECONDS, budget.remaining()))
+    budget.interrupt()
+
+
+def get_query_budget(request: Request) -> QueryBudget | None:
+    """
+    Get the time budget of the queries of a request, of the
+    `QUERY_TIME_BUDGETS` setting of its endpoint, by name, defaulting to the
+    `QUERY_TIME_BUDGET` setting.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        QueryBudget | None: The time budget, or None if the budget of the endpoint
+            is 0, for no budget.
+    """
+    settings = get_settings()
+    route = request.scope.get("route")
+    seconds = settings.QUERY_TIME_BUDGETS.get(
+        getattr(route, "name", ""), settings.QUERY_TIME_BUDGET
+    )
+    return QueryBudget(seconds) if seconds > 0 else None
+
+
+@lru_cache()
+def get_engine() -> Engine:
+    """
+    Get the engine of the primary database, shared by the controllers so that the
+    requests share its connection pool.
+
+    Returns:
+        Engine: The database engine.
+    """
+    return init_engine()
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine | None:
+    """
+    Get the async engine of the primary database, shared by the controllers like
+    `get_engine`.
+
+    Returns:
+        AsyncEngine | None: The async engine, or None if there is none, see
+            `init_async_engine`.
+    """
+    return init_async_engine()
+
+
+async def dispose_engines() -> None:
+    """
+    Close the connections of the shared engines, when the application shuts down,
+    and forget them, as the async connections belong to the event loop.
+    """
+    # pylint: disable=too-many-function-args
+    if get_async_engine.cache_info().currsize:
+        async_engine = get_async_engine()
+        if async_engine is not None:
+            await async_engine.dispose()
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+    get_async_engine.cache_clear()
+    get_engine.cache_clear()
+
+
+@lru_cache()
+def get_replica_set() -> ReplicaSet:
+    """
+    Get the read replicas of the `DATABASE_REPLICA_URLS` settings, shared by the
+    controllers so that the ejected replicas stay ejected across requests.
+
+    Returns:
+        ReplicaSet: The read replicas.
+    """
+    settings = get_settings()
+    return ReplicaSet.from_urls(
+        [url.get_secret_value() for url in settings.DATABASE_REPLICA_URLS],
+        eject_seconds=settings.DATABASE_REPLICA_EJECT_SECONDS,
+    )
+
+
+def load_dataset_generation() -> tuple[int, datetime]:
+    """
+    Load the dataset generation from the next replica, which the cached results are
+    read from, or from the primary database if no replica is available.
+
+    Returns:
+        tuple[int, datetime]: The generation and when it was bumped, see
+            `get_dataset_generation`.
+    """
+    return get_dataset_generation(get_replica_set().get_engine() or get_engine())
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    """
+    Get the response cache sized by the `RESPONSE_CACHE_ENTRIES` and
+    `RESPONSE_CACHE_BYTES` settings, following the dataset generation of
+    `load_dataset_generation` every `DATASET_GENERATION_TTL` seconds, shared by the
+    controllers so that the requests share the cached results.
+
+    Returns:
+        ResponseCache: The response cache.
+    """
+    settings = get_settings()
+    return ResponseCache(
+        load_dataset_generation,
+        max_entries=settings.RESPONSE_CACHE_ENTRIES,
+        max_bytes=settings.RESPONSE_CACHE_BYTES,
+        ttl=settings.DATASET_GENERATION_TTL,
+    )
+
+
+def check_not_modified(
+    request: Request,
+    cache: Annotated[ResponseCache, Depends(get_response_cache)],
+    read_primary: Annotated[bool, Header(alias="X-Read-Primary")] = False,
+) -> None:
+    """
+    Check whether the client of a read request holds its response, before its
+    route reads the database, by the validators of `conditional_headers` with the
+    `Cache-Control` policy of the `CACHE_CONTROLS` setting of its endpoint, by
+    name, defaulting to the `CACHE_CONTROL` setting. Otherwise, store the
+    validators in the request state, for the `ConditionalRequestMiddleware` to set
+    them on the response. The validators are built from the dataset generation
+    stored in the database, refreshed by the cache first, so that every process
+    gives the same validators to the same data. The requests reading from the
+    primary database have no validators, as the cache generation may not cover
+    the latest ingested data.
+
+    Args:
+        request (Request): The request.
+        cache (ResponseCache): The response cache, see `get_response_cache`.
+        read_primary (bool): Whether to read from the primary database, from the
+            `X-Read-Primary` header. Defaults to False.
+
+    Raises:
+        NotModifiedException: If the client holds the response.
+    """
+    if read_primary:
+        return
+    cache.refresh()
+    settings = get_settings()
+    route = request.scope.get("route")
+    headers = conditional_headers(
+        cache,
+        request,
+        settings.CACHE_CONTROLS.get(getattr(route, "name", ""), settings.CACHE_CONTROL),
+    )
+    if is_not_modified(request.headers, headers):
+        raise NotModifiedException(headers)
+    setattr(request.state, STATE_KEY, headers)
+
+
+async def get_controller(
+    read_primary: Annotated[bool, Header(alias="X-Read-Primary")] = False,
+    budget: Annotated[QueryBudget | None, Depends(get_query_budget)] = None,
+) -> AsyncIterator[GlossaryController]:
+    """
+    Get the glossary controller, whose reads share a unit of work for the request,
+    committed when the request succeeds and rolled back when it fails.
+
+    Args:
+        read_primary (bool): Whether to read from the primary database instead of
+            the replicas, to see the latest ingested data, from the
+            `X-Read-Primary` header. Defaults to False.
+        budget (QueryBudget | None): The time budget of the queries of the
+            request, see `get_query_budget`. Defaults to None, for no budget.
+
+    Yields:
+        GlossaryController: The glossary controller.
+    """
+    controller = GlossaryController(
+        engine=get_engine(),
+        read_primary=read_primary,
+        budget=budget,
+        async_engine=get_async_engine(),
+        unit_of_work=True,
+        cache=get_response_cache(),
+    )
+    try:
+        yield controller
+    except Exception:
+        await controller.end_unit_of_work(commit=False)
+        raise
+    await controller.end_unit_of_work()
+
 
-def get_controller() -> GlossaryController:
+def get_ingestion_controller() -> GlossaryController:
     """
-    Get the glossary controller.
+    Get the glossary controller of the ingestion, without the time budget of the
+    read requests, as the ingestion downloads, parses and saves the datasets, then
+    precomputes their documents, for much longer than a read.
 
     Returns:
         GlossaryController: The glossary controller.
     """
-    return GlossaryController()
+    return GlossaryController(engine=get_engine(), cache=get_response_cache())
 
 
 def get_templates() -> Jinja2Templates:
@@ -11,9 +11,22 @@ class Settings(BaseSettings):
 
     API_KEY: SecretStr
     DATABASE_URL: SecretStr
+    DATABASE_REPLICA_URLS: list[SecretStr] = []
+    DATABASE_REPLICA_EJECT_SECONDS: float = 30.0
     SENTRY_DSN: SecretStr = SecretStr("")
 
     HOST_IP: str = "127.0.0.1"
+    QUERY_TIME_BUDGET: float = 10.0
+    QUERY_TIME_BUDGETS: dict[str, float] = {}
+    DOCUMENT_LANGUAGES: list[str] = []
+    SQLITE_EXPORT_PATH: str = ""
+    ANALYTICS_EXPORT_DIR: str = ""
+    ANALYTICS_DUCKDB_PATH: str = ""
+    RESPONSE_CACHE_ENTRIES: int = 1024
+    RESPONSE_CACHE_BYTES: int = 64 << 20
+    DATASET_GENERATION_TTL: float = 1.0
+    CACHE_CONTROL: str = "no-cache"
+    CACHE_CONTROLS: dict[str, str] = {}
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
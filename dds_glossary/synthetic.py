@@ -0,0 +1,245 @@
+"""Synthetic SKOS datasets for the dds_glossary package."""
+
+from math import ceil
+from pathlib import Path
+from random import Random
+from typing import ClassVar, Final
+from xml.sax.saxutils import escape, quoteattr
+
+from pydantic import BaseModel, Field
+
+RDF_NAMESPACE: Final[str] = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+CORE_NAMESPACE: Final[str] = "http://www.w3.org/2004/02/skos/core#"
+DC_NAMESPACE: Final[str] = "http://purl.org/dc/elements/1.1/"
+NAMESPACES: Final[dict[str, str]] = {
+    "rdf": RDF_NAMESPACE,
+    "core": CORE_NAMESPACE,
+    "x_1.1": DC_NAMESPACE,
+}
+
+
+class SyntheticDataset(BaseModel):
+    """
+    Deterministic synthetic SKOS dataset, written as RDF/XML in the shape parsed by
+    `GlossaryController.parse_dataset`.
+
+    The concepts form a forest where every concept has `fan_out` narrower concepts,
+    with as many top concepts as needed to fit `concepts` in `depth` levels. The
+    same configuration and `seed` always produce the same file, and the file is
+    written one element at a time, so that multi-million concept datasets can be
+    generated with a constant memory footprint.
+
+    Attributes:
+        concepts (int): The number of concepts.
+        depth (int): The maximum depth of the concept hierarchy.
+        fan_out (int): The number of narrower concepts of every concept.
+        languages (int): The number of languages of the labels.
+        alt_labels (int): The number of alternative labels per concept and language.
+        collections (int): The number of collections, each one holding every
+            `collections`-th concept and the next collection.
+        polyhierarchy (float): The probability for a concept to have a second
+            broader concept.
+        seed (int): The seed of the random labels and polyhierarchy.
+        base_iri (str): The prefix of the generated IRIs.
+    """
+
+    # fmt: off
+    language_codes: ClassVar[list[str]] = [
+        "en", "bg", "cs", "da", "de", "el", "es", "et", "fi", "fr", "ga", "hr",
+        "hu", "it", "lt", "lv", "mt", "nl", "pl", "pt", "ro", "sk", "sl", "sv",
+    ]
+    words: ClassVar[list[str]] = [
+        "live", "animals", "meat", "fish", "dairy", "produce", "cereals", "oils",
+        "fats", "sugars", "beverages", "tobacco", "minerals", "fuels", "chemicals",
+        "plastics", "rubber", "leather", "wood", "paper", "textiles", "footwear",
+        "stone", "glass", "metals", "machinery", "vehicles", "instruments",
+    ]
+    # fmt: on
+    label_bits: ClassVar[int] = 12
+
+    concepts: int = Field(default=1000, ge=0)
+    depth: int = Field(default=4, ge=1)
+    fan_out: int = Field(default=10, ge=1)
+    languages: int = Field(default=2, ge=1, le=len(language_codes))
+    alt_labels: int = Field(default=1, ge=0)
+    collections: int = Field(default=0, ge=0)
+    polyhierarchy: float = Field(default=0.0, ge=0.0, le=1.0)
+    seed: int = 0
+    base_iri: str = "http://example.org/synthetic/"
+
+    @property
+    def scheme_iri(self) -> str:
+        """The IRI of the concept scheme."""
+        return f"{self.base_iri}scheme"
+
+    def concept_iri(self, index: int) -> str:
+        """
+        Get the IRI of a concept.
+
+        Args:
+            index (int): The index of the concept.
+
+        Returns:
+            str: The IRI of the concept.
+        """
+        return f"{self.base_iri}concept{index:010d}"
+
+    def collection_iri(self, index: int) -> str:
+        """
+        Get the IRI of a collection.
+
+        Args:
+            index (int): The index of the collection.
+
+        Returns:
+            str: The IRI of the collection.
+        """
+        return f"{self.base_iri}collection{index:06d}"
+
+    def level_starts(self) -> list[int]:
+        """
+        Get the index of the first concept of every level of the hierarchy, with the
+        number of concepts as last element.
+
+        Returns:
+            list[int]: The level start indexes.
+        """
+        capacity = sum(self.fan_out**level for level in range(self.depth))
+        level_size = max(1, ceil(self.concepts / capacity))
+        starts = [0]
+        while starts[-1] < self.concepts:
+            starts.append(min(starts[-1] + level_size, self.concepts))
+            level_size *= self.fan_out
+        return starts
+
+    def broader(self, index: int, rng: Random, starts: list[int]) -> list[int]:
+        """
+        Get the broader concepts of a concept.
+
+        Args:
+            index (int): The index of the concept.
+            rng (Random): The random generator of the polyhierarchy.
+            starts (list[int]): The level start indexes.
+
+        Returns:
+            list[int]: The indexes of the broader concepts.
+        """
+        if index < starts[1]:
+            return []
+        parent = (index - starts[1]) // self.fan_out
+        parents = [parent]
+        if self.polyhierarchy and rng.random() < self.polyhierarchy:
+            level = next(
+                level for level in range(len(starts) - 1) if parent < starts[level + 1]
+            )
+            other = rng.randrange(starts[level], starts[level + 1])
+            if other != parent:
+                parents.append(other)
+        return parents
+
+    def labels(self, rng: Random) -> list[str]:
+        """
+        Get the pool of random labels, picked from by the concepts.
+
+        Args:
+            rng (Random): The random generator of the labels.
+
+        Returns:
+            list[str]: The labels, as many as `2 ** label_bits`.
+        """
+        return [
+            " ".join(rng.choices(self.words, k=rng.randint(1, 4)))
+            for _ in range(2**self.label_bits)
+        ]
+
+    def write(self, path: str | Path) -> Path:
+        """
+        Write the dataset as an RDF/XML file.
+
+        Args:
+            path (str | Path): The path of the file.
+
+        Returns:
+            Path: The path of the file.
+        """
+        path = Path(path)
+        rng = Random(self.seed)
+        labels = self.labels(rng)
+        starts = self.level_starts()
+        languages = self.language_codes[: self.languages]
+        namespaces = " ".join(
+            f"xmlns:{prefix}={quoteattr(namespace)}"
+            for prefix, namespace in NAMESPACES.items()
+        )
+
+        with path.open("w", encoding="utf-8") as file:
+            file.write(
+                f'<?xml version="1.0" encoding="utf-8"?>\n<rdf:RDF {namespaces}>\n'
+            )
+            file.write(f"<core:ConceptScheme rdf:about={quoteattr(self.scheme_iri)}>")
+            file.write(self._text("notation", "SYNTHETIC"))
+            for lang in languages:
+                file.write(self._text("prefLabel", "Synthetic", lang))
+            file.write(self._text("scopeNote", self.base_iri))
+            file.write("</core:ConceptScheme>\n")
+
+            for index in range(self.concepts):
+                file.write(self._concept(index, rng, labels, starts, languages))
+            for index in range(self.collections):
+                file.write(self._collection(index))
+            file.write("</rdf:RDF>\n")
+        return path
+
+    def _concept(
+        self,
+        index: int,
+        rng: Random,
+        labels: list[str],
+        starts: list[int],
+        languages: list[str],
+    ) -> str:
+        parts = [
+            f"<core:Concept rdf:about={quoteattr(self.concept_iri(index))}>",
+            self._resource("inScheme", self.scheme_iri),
+        ]
+        parts.extend(
+            self._resource("broader", self.concept_iri(parent))
+            for parent in self.broader(index, rng, starts)
+        )
+        parts.append(f"<x_1.1:identifier>{index:010d}</x_1.1:identifier>")
+        parts.append(self._text("notation", f"{index:010d}"))
+        bits = self.label_bits
+        for lang in languages:
+            parts.append(self._text("prefLabel", labels[rng.getrandbits(bits)], lang))
+            parts.extend(
+                self._text("altLabel", labels[rng.getrandbits(bits)], lang)
+                for _ in range(self.alt_labels)
+            )
+            parts.append(self._text("scopeNote", labels[rng.getrandbits(bits)], lang))
+        parts.append("</core:Concept>\n")
+        return "".join(parts)
+
+    def _collection(self, index: int) -> str:
+        parts = [
+            f"<core:Collection rdf:about={quoteattr(self.collection_iri(index))}>",
+            self._resource("inScheme", self.scheme_iri),
+        ]
+        parts.extend(
+            self._resource("member", self.concept_iri(member))
+            for member in range(index, self.concepts, self.collections)
+        )
+        if index + 1 < self.collections:
+            parts.append(self._resource("member", self.collection_iri(index + 1)))
+        parts.append(self._text("notation", f"C{index:06d}"))
+        parts.append(self._text("prefLabel", f"Collection {index}", "en"))
+        parts.append("</core:Collection>\n")
+        return "".join(parts)
+
+    @staticmethod
+    def _resource(name: str, iri: str) -> str:
+        return f"<core:{name} rdf:resource={quoteattr(iri)}/>"
+
+    @staticmethod
+    def _text(name: str, text: str, lang: str | None = None) -> str:
+        attributes = f" xml:lang={quoteattr(lang)}" if lang else ""
+        return f"<core:{name}{attributes}>{escape(text)}</core:{name}>"
@@ -86,14 +86,16 @@ def precommit(ctx: Context) -> None:
 def test(
     ctx: Context,
     integration: bool = False,
+    benchmarks: bool = False,
     report: bool = False,
 ) -> None:
     """
-    Run unit and integration tests.
+    Run unit, integration and benchmark tests.
 
     Args:
         ctx: The Invoke context.
         integration: Whether to run integration tests.
+        benchmarks: Whether to run the benchmarks, timed without coverage.
         report: If report, show the command output.
     """
     hide = not report
@@ -108,3 +110,52 @@ def test(
         result = ctx.run("pytest tests/integration", hide=hide, warn=True)
         if hide and result:
             print(result.stdout.splitlines()[-1])
+
+    if benchmarks:
+        print("Running benchmarks...")
+        result = ctx.run("pytest tests/benchmarks --no-cov", hide=hide, warn=True)
+        if hide and result:
+            print(result.stdout.splitlines()[-1])
+
+
+@task
+def generate(  # pylint: disable=too-many-arguments
+    ctx: Context,  # pylint: disable=unused-argument
+    path: str = "synthetic.rdf",
+    concepts: int = 1000,
+    depth: int = 4,
+    fan_out: int = 10,
+    languages: int = 2,
+    alt_labels: int = 1,
+    collections: int = 0,
+    polyhierarchy: float = 0.0,
+    seed: int = 0,
+) -> None:
+    """
+    Generate a deterministic synthetic SKOS dataset.
+
+    Args:
+        ctx: The Invoke context.
+        path: The path of the generated RDF/XML file.
+        concepts: The number of concepts.
+        depth: The maximum depth of the concept hierarchy.
+        fan_out: The number of narrower concepts of every concept.
+        languages: The number of languages of the labels.
+        alt_labels: The number of alternative labels per concept and language.
+        collections: The number of collections.
+        polyhierarchy: The probability for a concept to have a second broader one.
+        seed: The seed of the random labels and polyhierarchy.
+    """
+    # pylint: disable=import-outside-toplevel
+    from dds_glossary.synthetic import SyntheticDataset
+
+    SyntheticDataset(
+        concepts=concepts,
+        depth=depth,
+        fan_out=fan_out,
+        languages=languages,
+        alt_labels=alt_labels,
+        collections=collections,
+        polyhierarchy=polyhierarchy,
+        seed=seed,
+    ).write(path)
@@ -0,0 +1 @@
+"""Benchmarks suite for the dds_glossary package."""
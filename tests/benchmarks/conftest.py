@@ -0,0 +1,26 @@
+"""Fixtures for dds_glossary benchmarks."""
+
+from typing import Callable
+
+from _pytest.capture import CaptureManager
+from _pytest.terminal import TerminalReporter
+from pytest import Config, fixture
+
+
+@fixture(name="report")
+def _report(pytestconfig: Config) -> Callable[[str, dict[str, float]], None]:
+    """Report the timings of a benchmark with the terminal reporter of pytest,
+    outside the output capture, if the reporter is enabled."""
+    plugins = pytestconfig.pluginmanager
+    reporter: TerminalReporter | None = plugins.get_plugin("terminalreporter")
+    capture: CaptureManager | None = plugins.get_plugin("capturemanager")
+
+    def report(title: str, timings: dict[str, float]) -> None:
+        if reporter is None or capture is None:
+            return
+        with capture.global_and_fixture_disabled():
+            reporter.write_line(title)
+            for name, timing in timings.items():
+                reporter.write_line(f"  {name:<40} {timing:10.1f} us/call")
+
+    return report
@@ -0,0 +1,68 @@
+"""Benchmarks of the serialization of the dds_glossary responses."""
+
+from asyncio import run
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from dds_glossary.enums import MemberType
+from dds_glossary.routes import json_response
+from dds_glossary.schema import ConceptResponse
+from dds_glossary.services import ndjson_members
+
+from .utils import time_per_call
+
+# The number of concepts of the benchmarked list, as large as a big scheme.
+SIZE = 10000
+
+
+def concept_row(index: int) -> dict:
+    """Build a concept row, as selected by `select_member_rows`."""
+    return {
+        "member_type": MemberType.CONCEPT,
+        "iri": f"http://data.europa.eu/xsp/cn2024/{index:012d}",
+        "notation": f"0203 {index:04d}",
+        "prefLabel": "Carcases and half-carcases of swine, fresh or chilled",
+        "identifier": f"{index:012d}",
+        "scopeNote": "Meat of swine, fresh, chilled or frozen",
+        "altLabels": ["Carcases of swine", "Half-carcases of swine"],
+    }
+
+
+def standard_response(concepts: list[ConceptResponse]) -> bytes:
+    """Serialize the concepts like FastAPI does for a `response_model`, validating
+    them again and encoding them with the standard JSON encoder."""
+    field = create_response_field(name="Response", type_=list[ConceptResponse])
+    content = run(
+        serialize_response(field=field, response_content=concepts, is_coroutine=True)
+    )
+    return JSONResponse(content).body
+
+
+def test_serialization_overhead(
+    report: Callable[[str, dict[str, float]], None],
+) -> None:
+    """Benchmark the per-concept overhead of serializing a large list of concepts:
+    validated twice and encoded with the standard JSON encoder, validated once and
+    encoded by `json_response`, and streamed from plain dicts by `ndjson_members`.
+    """
+    rows = [concept_row(index) for index in range(SIZE)]
+    timings = {
+        "validated twice, standard encoder": time_per_call(
+            lambda: standard_response([ConceptResponse(**row) for row in rows]), 5
+        ),
+        "validated once, json_response": time_per_call(
+            lambda: json_response([ConceptResponse(**row) for row in rows]), 5
+        ),
+        "plain dicts, ndjson_members": time_per_call(
+            lambda: list(ndjson_members([rows])), 5
+        ),
+    }
+    timings = {name: timing / SIZE for name, timing in timings.items()}
+    report(f"Serialization overhead per concept, of {SIZE}", timings)
+    assert (
+        timings["validated once, json_response"]
+        < timings["validated twice, standard encoder"]
+    )
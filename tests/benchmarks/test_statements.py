@@ -0,0 +1,47 @@
+"""Benchmarks of the cached statements of dds_glossary.database module."""
+
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import joinedload
+
+from dds_glossary.database import load_in_language, select_concept
+from dds_glossary.model import Concept
+
+from .utils import time_per_call
+
+CONCEPT_IRI = "http://data.europa.eu/xsp/cn2024/020321000080"
+
+
+def rebuild_concept_statement():
+    """Build the statement of `get_concept` like it was before being cached."""
+    return (
+        select(Concept)
+        .where(Concept.iri == CONCEPT_IRI)
+        .options(
+            *load_in_language(Concept, "en", Concept),
+            joinedload(Concept.concept_schemes),
+        )
+    )
+
+
+def test_statement_overhead(report: Callable[[str, dict[str, float]], None]) -> None:
+    """Benchmark the per-call overhead of the statement of `get_concept`: building
+    and compiling it, building it and computing its key in the compiled cache, and
+    getting it from `select_concept`, whose key is computed once."""
+    dialect = postgresql.psycopg.dialect()
+    # pylint: disable=protected-access
+    timings = {
+        "rebuilt and compiled": time_per_call(
+            lambda: rebuild_concept_statement().compile(dialect=dialect), 200
+        ),
+        "rebuilt, compiled cache hit": time_per_call(
+            lambda: rebuild_concept_statement()._generate_cache_key()
+        ),
+        "cached by select_concept": time_per_call(
+            lambda: select_concept(False, "en", True)._generate_cache_key()
+        ),
+    }
+    report("get_concept statement overhead", timings)
+    assert timings["cached by select_concept"] < timings["rebuilt, compiled cache hit"]
@@ -0,0 +1,22 @@
+"""Utils for the benchmarks."""
+
+from time import perf_counter
+from typing import Callable
+
+
+def time_per_call(function: Callable[[], object], calls: int = 1000) -> float:
+    """
+    Time a function, after a warm-up call.
+
+    Args:
+        function (Callable[[], object]): The function.
+        calls (int): The number of timed calls. Defaults to 1000.
+
+    Returns:
+        float: The mean time per call, in microseconds.
+    """
+    function()
+    start = perf_counter()
+    for _ in range(calls):
+        function()
+    return (perf_counter() - start) / calls * 1e6
@@ -1,10 +1,13 @@
 """Common functions for tests."""
 
+from datetime import datetime, timedelta
+
 from sqlalchemy import Engine
 from sqlalchemy.orm import Session
 
 from dds_glossary.enums import SemanticRelationType
 from dds_glossary.model import (
+    UNLOADED_AT,
     Collection,
     Concept,
     ConceptScheme,
@@ -89,6 +92,7 @@ def add_collections(
 def add_relations(engine: Engine, concept_iris: list[tuple[str, str]]) -> list[dict]:
     """Add semantic relations to the database."""
     with Session(engine) as session:
+        concepts = {concept.iri: concept for concept in session.query(Concept).all()}
         relations = [
             SemanticRelation(
                 type=SemanticRelationType.BROADER,
@@ -97,6 +101,21 @@ def add_relations(engine: Engine, concept_iris: list[tuple[str, str]]) -> list[d
             )
             for source_iri, target_iri in concept_iris
         ]
+        for relation in relations:
+            relation.resolve_concepts_from_xml(concepts)
         session.add_all(relations)
         session.commit()
         return [relation.to_dict() for relation in relations]
+
+
+class GenerationLoader:  # pylint: disable=too-few-public-methods
+    """Loader of a dataset generation held in memory, counting its loads."""
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self.loads = 0
+
+    def __call__(self) -> tuple[int, datetime]:
+        """Load the generation, bumped a second after the previous one."""
+        self.loads += 1
+        return self.generation, UNLOADED_AT + timedelta(seconds=self.generation)
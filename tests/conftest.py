@@ -113,6 +113,7 @@ def _client(
             engine=engine,
         ),
     )
+    dds_glossary.services.get_response_cache.cache_clear()
     app = create_app()
     onto_path.append(str(tmp_path))
     with TestClient(app) as client:
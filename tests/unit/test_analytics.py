@@ -0,0 +1,45 @@
+"""Tests for dds_glossary.analytics module."""
+
+from pathlib import Path
+
+import duckdb
+from pyarrow import parquet
+
+from dds_glossary.analytics import export_analytics
+from dds_glossary.database import get_scheme_member_rows, save_dataset
+from dds_glossary.services import GlossaryController
+
+
+def test_export_analytics(
+    controller: GlossaryController,
+    file_rdf: Path,
+    tmp_path: Path,
+) -> None:
+    """Test the export_analytics function."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+
+    paths = export_analytics(engine, tmp_path / "analytics", tmp_path / "g.duckdb")
+    names = [path.stem for path in paths]
+    assert {"concepts", "semantic_relations", "relations", "labels_sk"} <= set(names)
+    assert parquet.read_table(
+        tmp_path / "analytics" / "relations.parquet"
+    ).to_pylist() == [
+        {
+            "source_concept_iri": "http://data.europa.eu/xsp/cn2024/020321000080",
+            "target_concept_iri": "http://data.europa.eu/xsp/cn2024/020321000010",
+            "type": "broader",
+            "version": "v1",
+        }
+    ]
+    labels = parquet.read_table(tmp_path / "analytics" / "labels_sk.parquet")
+    assert labels.to_pylist() == [
+        {**row, "member_type": row["member_type"].value}
+        for row in get_scheme_member_rows(engine, concept_scheme_iri, lang="sk")
+    ]
+    with duckdb.connect(str(tmp_path / "g.duckdb")) as connection:
+        assert connection.execute("SELECT count(*) FROM labels_sk").fetchone() == (
+            labels.num_rows,
+        )
+        assert len(connection.execute("SHOW TABLES").fetchall()) == len(names)
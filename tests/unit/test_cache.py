@@ -0,0 +1,122 @@
+"""Tests for dds_glossary.cache module."""
+
+from functools import partial
+
+from dds_glossary.cache import ResponseCache, cached, result_size
+from dds_glossary.model import UNLOADED_AT
+from dds_glossary.schema import EntityResponse
+
+from ..common import GenerationLoader
+
+
+class Reader:  # pylint: disable=too-few-public-methods
+    """Reader with a cached read method, counting its calls."""
+
+    def __init__(self, cache: ResponseCache | None, read_primary: bool = False):
+        self.cache = cache
+        self.read_primary = read_primary
+        self.reads_async = False
+        self.calls = 0
+
+    @cached
+    def read(self, iri: str, lang: str = "en") -> EntityResponse:
+        """Read an entity."""
+        self.calls += 1
+        return EntityResponse(iri=iri, notation=lang, prefLabel=str(self.calls))
+
+
+def test_result_size() -> None:
+    """Test the size of the results is the size of their JSON serialization."""
+    entity = EntityResponse(iri="a", notation="b", prefLabel="c")
+    assert result_size(entity) == len(entity.model_dump_json())
+    assert result_size([entity, entity]) == 2 * len(entity.model_dump_json()) + 3
+    assert result_size(b"document") == 8
+    assert result_size(None) == 4
+
+
+def test_cached() -> None:
+    """Test the cached methods share their results by arguments, with their
+    defaults, and count the hits and misses."""
+    cache = ResponseCache(GenerationLoader())
+    reader = Reader(cache)
+    assert reader.read("a") is reader.read("a", lang="en")
+    assert reader.read("a", "fr").prefLabel == "2"
+    assert reader.calls == 2
+    statistics = cache.statistics()
+    assert (statistics.hits, statistics.misses, statistics.entries) == (1, 2, 2)
+    assert statistics.bytes == cache.size > 0
+
+
+def test_cached_refresh() -> None:
+    """Test the cached methods refresh the dataset generation, except when they
+    are run on the event loop."""
+    loader = GenerationLoader()
+    reader = Reader(ResponseCache(loader, ttl=0.0))
+    reader.read("a")
+    assert loader.loads == 1
+    reader.reads_async = True
+    reader.read("a")
+    assert loader.loads == 1
+
+
+def test_cached_bypassed() -> None:
+    """Test the cached methods are called without a cache, or reading from the
+    primary database."""
+    for reader in [
+        Reader(None),
+        Reader(ResponseCache(GenerationLoader()), read_primary=True),
+    ]:
+        reader.read("a")
+        reader.read("a")
+        assert reader.calls == 2
+
+
+def test_eviction() -> None:
+    """Test the least recently used results are evicted by entries and bytes."""
+    cache = ResponseCache(GenerationLoader(), max_entries=2)
+    for key in ["a", "b", "a", "c"]:
+        cache.get_or_call(key, partial(str, key))
+    assert list(cache._entries) == ["a", "c"]  # pylint: disable=protected-access
+    assert cache.evictions == 1
+
+    cache = ResponseCache(GenerationLoader(), max_bytes=10)
+    cache.get_or_call("a", lambda: "1234")
+    cache.get_or_call("b", lambda: "1234")
+    assert len(cache) == 1 and cache.size == 6
+    cache.get_or_call("c", lambda: "x" * 20)
+    assert "c" not in cache._entries  # pylint: disable=protected-access
+
+
+def test_refresh() -> None:
+    """Test the generation is loaded at most once per TTL unless forced, that its
+    change drops the results, and that the results computed meanwhile are not
+    stored."""
+    loader = GenerationLoader()
+    cache = ResponseCache(loader, ttl=60.0)
+    assert (cache.generation, cache.modified) == (0, UNLOADED_AT)
+    assert cache.refresh() == 0
+    cache.get_or_call("a", lambda: 1)
+    loader.generation = 1
+    assert cache.refresh() == 0
+    assert cache.get_or_call("a", lambda: 2) == 1
+    assert loader.loads == 1
+    assert cache.refresh(force=True) == 1
+    assert cache.modified > UNLOADED_AT
+    assert len(cache) == 0 and cache.size == 0
+
+    def bump() -> int:
+        loader.generation = 2
+        return cache.refresh(force=True)
+
+    assert cache.get_or_call("a", bump) == 2
+    assert len(cache) == 0
+    assert cache.get_or_call("a", lambda: 3) == 3
+    assert cache.get_or_call("a", lambda: 4) == 3
+
+    cache = ResponseCache(loader, ttl=0.0)
+    cache.refresh()
+    cache.get_or_call("a", lambda: 1)
+    loader.generation = 3
+    assert cache.refresh() == 3
+    assert cache.get_or_call("a", lambda: 2) == 2
+    assert cache.statistics().generation == 3
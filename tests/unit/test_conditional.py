@@ -0,0 +1,81 @@
+"""Tests for dds_glossary.conditional module."""
+
+from datetime import timedelta
+from email.utils import format_datetime
+
+from pytest import mark
+from starlette.requests import Request
+
+from dds_glossary.cache import ResponseCache
+from dds_glossary.conditional import conditional_headers, entity_tag, is_not_modified
+
+from ..common import GenerationLoader
+
+
+def build_request(query_string: str, accept: str = "application/json") -> Request:
+    """Build a read request of the /latest/concepts endpoint."""
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/latest/concepts",
+            "query_string": query_string.encode(),
+            "headers": [(b"accept", accept.encode())],
+        }
+    )
+
+
+def test_entity_tag() -> None:
+    """Test the entity tags are shared by the requests selecting the same response
+    of the same generation, whatever the order of their query parameters."""
+    loader = GenerationLoader()
+    cache = ResponseCache(loader)
+    etag = entity_tag(cache, build_request("lang=en&concept_scheme_iri=a"))
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == entity_tag(cache, build_request("concept_scheme_iri=a&lang=en"))
+    assert etag != entity_tag(cache, build_request("concept_scheme_iri=a&lang=de"))
+    assert etag != entity_tag(
+        cache, build_request("lang=en&concept_scheme_iri=a", "application/x-ndjson")
+    )
+    loader.generation = 1
+    cache.refresh(force=True)
+    assert etag != entity_tag(cache, build_request("lang=en&concept_scheme_iri=a"))
+
+
+def test_conditional_headers() -> None:
+    """Test the validators of a response, with its Cache-Control policy if any."""
+    cache = ResponseCache(GenerationLoader())
+    headers = conditional_headers(cache, build_request(""), "no-cache")
+    assert headers["Last-Modified"] == format_datetime(cache.modified, usegmt=True)
+    assert headers["Cache-Control"] == "no-cache"
+    assert "Cache-Control" not in conditional_headers(cache, build_request(""), "")
+
+
+@mark.parametrize(
+    ("request_headers", "expected"),
+    [
+        ({}, False),
+        ({"if-none-match": '"tag"'}, True),
+        ({"if-none-match": '"other", W/"tag"'}, True),
+        ({"if-none-match": "*"}, True),
+        ({"if-none-match": '"other"', "if-modified-since": "now"}, False),
+        ({"if-modified-since": "invalid"}, False),
+    ],
+)
+def test_is_not_modified(request_headers: dict[str, str], expected: bool) -> None:
+    """Test the clients holding the response are detected by its entity tag."""
+    headers = conditional_headers(
+        ResponseCache(GenerationLoader()), build_request(""), ""
+    )
+    headers["ETag"] = '"tag"'
+    assert is_not_modified(request_headers, headers) == expected
+
+
+def test_is_not_modified_since() -> None:
+    """Test the clients holding the response are detected by its date, without an
+    entity tag."""
+    cache = ResponseCache(GenerationLoader())
+    headers = conditional_headers(cache, build_request(""), "")
+    for delta, expected in [(0, True), (60, True), (-60, False)]:
+        since = format_datetime(cache.modified + timedelta(seconds=delta), usegmt=True)
+        assert is_not_modified({"if-modified-since": since}, headers) == expected
@@ -1,22 +1,59 @@
+# pylint: disable=too-many-lines
 """Tests for dds_glossary.database module."""
 
+import re
+from operator import itemgetter
+from pathlib import Path
+from threading import Timer
+from typing import Callable
+
 import pytest
-from sqlalchemy import inspect
-from sqlalchemy.engine import Engine
+from sqlalchemy import bindparam, event, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import NoResultFound, OperationalError
 from sqlalchemy.orm import Session
 
 from dds_glossary.database import (
+    QueryBudget,
+    ReplicaSet,
+    bump_dataset_generation,
+    delete_version,
+    export_sqlite,
     get_collection,
+    get_collection_member_rows,
+    get_collection_row,
     get_concept,
     get_concept_scheme,
+    get_concept_scheme_row,
+    get_concept_scheme_rows_by_iri,
     get_concept_schemes,
+    get_concept_with_relations,
+    get_dataset_generation,
+    get_document,
+    get_member_rows_by_iri,
+    get_relation_concept_rows,
     get_relations,
+    get_scheme_member_rows,
     init_engine,
     save_dataset,
+    save_documents,
     search_database,
+    search_database_rows,
+    select_concept,
+)
+from dds_glossary.enums import DocumentType, LabelKind, MemberType, SemanticRelationType
+from dds_glossary.model import (
+    UNLOADED_AT,
+    Collection,
+    Concept,
+    ConceptScheme,
+    IriPrefix,
+    Label,
+    SemanticRelation,
+    in_version,
 )
-from dds_glossary.enums import SemanticRelationType
-from dds_glossary.model import Collection, Concept, ConceptScheme, SemanticRelation
+from dds_glossary.services import GlossaryController
+from dds_glossary.synthetic import SyntheticDataset
 
 from ..common import add_collections, add_concept_schemes, add_concepts, add_relations
 
@@ -39,6 +76,19 @@ def engine_init_checks(engine: Engine) -> None:
     assert inspector.has_table("semantic_relations")
     assert inspector.has_table("in_scheme")
     assert inspector.has_table("in_collection")
+    assert inspector.has_table("in_version")
+    assert inspector.has_table("scheme_in_version")
+    assert inspector.has_table("labels")
+    assert inspector.has_table("documents")
+    assert inspector.get_pk_constraint("in_scheme")["constrained_columns"] == [
+        "scheme_id",
+        "member_id",
+    ]
+    assert inspector.get_pk_constraint("semantic_relations")["constrained_columns"] == [
+        "source_concept_id",
+        "target_concept_id",
+        "version",
+    ]
 
 
 def test_init_engine_env_var_not_found(monkeypatch) -> None:
@@ -80,6 +130,74 @@ def test_init_engine_database_exists_drop() -> None:
     engine_init_checks(engine)
 
 
+def test_init_engine_sqlite_not_found(tmp_path: Path) -> None:
+    """Test the init_engine function with a SQLite file that does not exist."""
+    with pytest.raises(ValueError) as exc_info:
+        init_engine(f"sqlite:///{tmp_path / 'glossary.db'}")
+    assert "does not exist" in str(exc_info.value)
+
+
+def test_replica_set(engine: Engine) -> None:
+    """Test the replica set hands out the replicas round-robin, without the failing
+    ones until their ejection ends."""
+    broken_url = engine.url.set(query={"host": "/nonexistent"})
+    replicas = ReplicaSet.from_urls(
+        [engine.url.render_as_string(hide_password=False), str(broken_url)]
+    )
+    healthy, broken = replicas.engines
+    assert [replicas.get_engine() for _ in range(3)] == [healthy, broken, healthy]
+
+    with pytest.raises(OperationalError):
+        get_concept_schemes(broken)
+    assert [replicas.get_engine() for _ in range(3)] == [healthy] * 3
+    replicas.eject(healthy)
+    assert replicas.get_engine() is None
+    replicas.eject_seconds = 0
+    replicas.eject(healthy)
+    assert replicas.get_engine() in replicas.engines
+
+
+def test_query_budget(engine: Engine) -> None:
+    """Test the queries bound to a time budget run with a statement timeout, are
+    interrupted by the cancellation, and are not run once it is cancelled."""
+    budget = QueryBudget(60.0)
+    statement_timeout = text(
+        "SELECT setting::int FROM pg_settings WHERE name = 'statement_timeout'"
+    )
+    with budget.bind(engine).connect() as connection:
+        assert 0 < connection.execute(statement_timeout).scalar_one() <= 60000
+    with engine.connect() as connection:
+        assert connection.execute(statement_timeout).scalar_one() == 0
+
+    Timer(0.2, budget.cancel).start()
+    with pytest.raises(OperationalError, match="canceling statement"):
+        with budget.bind(engine).connect() as connection:
+            connection.execute(text("SELECT pg_sleep(10)"))
+    with pytest.raises(TimeoutError):
+        get_concept_schemes(budget.bind(engine))
+
+    budget = QueryBudget(0.2)
+    with pytest.raises(OperationalError, match="statement timeout"):
+        with budget.bind(engine).connect() as connection:
+            connection.execute(text("SELECT pg_sleep(10)"))
+    assert budget.exceeded and not budget.cancelled
+
+
+def test_cached_statements(engine: Engine) -> None:
+    """Test the statements of the hot read functions are built once by shape, and
+    prepared on the server when executed again."""
+    assert select_concept(False, "en", True) is select_concept(False, "en", True)
+    assert select_concept(True, "en", True) is not select_concept(False, "en", True)
+
+    for _ in range(2):
+        assert not get_relations(engine, "http://example.org/concept")
+    with engine.connect() as connection:
+        statements = connection.scalars(
+            text("SELECT statement FROM pg_prepared_statements")
+        ).all()
+    assert any("DISTINCT ON" in statement for statement in statements)
+
+
 def test_save_dataset_with_no_data(engine: Engine) -> None:
     """Test the save_dataset function with empty data."""
     save_dataset(engine, [], [], [], [])
@@ -100,7 +218,7 @@ def test_save_dataset_with_data(engine: Engine) -> None:
             iri=concept_scheme_iri,
             notation="Concept Scheme Notation",
             scopeNote="Concept Scheme Scope Note",
-            prefLabels=[{"en": "Concept Scheme Pref Label"}],
+            prefLabels={"en": "Concept Scheme Pref Label"},
         )
     ]
     concepts = [
@@ -108,24 +226,24 @@ def test_save_dataset_with_data(engine: Engine) -> None:
             iri=concept1_iri,
             identifier="Concept1 Identifier",
             notation="Concept Notation",
-            prefLabels=[{"en": "Concept1 Pref Label"}],
-            altLabels=[{"en": "Concept1 Alt Label"}],
-            scopeNotes=["Concept1 Scope Note"],
+            prefLabels={"en": "Concept1 Pref Label"},
+            altLabels={"en": ["Concept1 Alt Label"]},
+            scopeNotes={"en": "Concept1 Scope Note"},
         ),
         Concept(
             iri=concept2_iri,
             identifier="Concept2 Identifier",
             notation="Concept2 Notation",
-            prefLabels=[{"en": "Concept2 Pref Label"}],
-            altLabels=[{"en": "Concept2 Alt Label"}],
-            scopeNotes=["Concept2 Scope Note"],
+            prefLabels={"en": "Concept2 Pref Label"},
+            altLabels={"en": ["Concept2 Alt Label"]},
+            scopeNotes={"en": "Concept2 Scope Note"},
         ),
     ]
     collections = [
         Collection(
             iri="collection_iri0",
             notation="Collection Notation",
-            prefLabels=[{"en": "Collection Pref Label 0"}],
+            prefLabels={"en": "Collection Pref Label 0"},
             member_iris=[concept1_iri, concept2_iri],
         ),
     ]
@@ -147,6 +265,259 @@ def test_save_dataset_with_data(engine: Engine) -> None:
         assert session.query(Concept).all()[0].iri == concept1_iri
         assert session.query(SemanticRelation).one().source_concept_iri == concept1_iri
         assert session.query(SemanticRelation).one().target_concept_iri == concept2_iri
+        assert session.query(SemanticRelation).one().source_concept_id == (
+            session.query(Concept.id).where(Concept.iri == concept1_iri).scalar()
+        )
+
+
+def test_iri_comparisons(engine: Engine) -> None:
+    """Test the comparisons of the IRIs with strings, parameters and expressions."""
+    concept_scheme_dicts = add_concept_schemes(engine, 1)
+    add_concepts(engine, [concept_scheme_dicts[0]["iri"]] * 2)
+    with Session(engine) as session:
+        assert session.scalars(
+            select(Concept.notation).where(Concept.iri == "concept_iri1")
+        ).all() == ["notation1"]
+        assert session.scalars(
+            select(Concept.notation).where(Concept.iri == bindparam("iri")),
+            {"iri": "concept_iri1"},
+        ).all() == ["notation1"]
+        assert session.scalars(
+            select(Concept.notation)
+            .where(
+                Concept.iri
+                == func.concat("concept_iri", func.substr(Concept.notation, 9))
+            )
+            .order_by(Concept.notation)
+        ).all() == ["notation0", "notation1"]
+
+
+def test_save_dataset_shared_versions(
+    controller: GlossaryController,
+    file_rdf: Path,
+) -> None:
+    """Test the save_dataset function with two versions sharing their members."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v2")
+
+    with Session(engine) as session:
+        assert session.query(ConceptScheme).count() == 1
+        assert session.query(Concept).count() == 2
+        assert session.query(Collection).count() == 2
+        assert session.query(SemanticRelation).count() == 2
+        assert session.scalar(select(func.count()).select_from(in_version)) == 8
+        assert session.scalars(
+            select(IriPrefix.prefix).order_by(IriPrefix.prefix)
+        ).all() == [
+            "http://data.europa.eu/xsp/cn2024/",
+            "https://example.org/",
+        ]
+    concept_scheme = get_concept_scheme(engine, concept_scheme_iri, version="v2")
+    assert len(concept_scheme.members) == 4
+    assert len(get_collection(engine, "https://example.org/collection1").members) == 2
+    assert len(get_relations(engine, concept_iri)) == 1
+    assert len(get_relations(engine, concept_iri, version="v1")) == 1
+
+
+def test_save_dataset_changed_content(
+    controller: GlossaryController,
+    file_rdf: Path,
+) -> None:
+    """Test the save_dataset function with a concept changed in the second version."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    dataset = controller.parse_dataset(file_rdf)
+    changed = next(concept for concept in dataset[1] if concept.iri == concept_iri)
+    changed.prefLabels = {**changed.prefLabels, "en": "Changed"}
+    save_dataset(engine, *dataset, version="v2")
+
+    with Session(engine) as session:
+        assert session.query(ConceptScheme).count() == 1
+        assert session.query(Concept).count() == 3
+        assert session.query(Concept).where(Concept.current).count() == 2
+        assert session.query(SemanticRelation).count() == 2
+    v1_label = get_concept(engine, concept_iri, version="v1").get_pref_label()
+    assert v1_label != "Changed"
+    for version in ("v1", "v2", None):
+        assert (
+            len(get_concept_scheme(engine, concept_scheme_iri, version=version).members)
+            == 4
+        )
+        assert (
+            len(
+                get_collection(
+                    engine, "https://example.org/collection1", version=version
+                ).members
+            )
+            == 2
+        )
+        assert len(get_relations(engine, concept_iri, version=version)) == 1
+        concept, concept_scheme_iris, _ = get_concept_with_relations(
+            engine, concept_iri, version=version
+        )
+        assert concept_scheme_iris == [concept_scheme_iri]
+        assert concept.get_pref_label() == (v1_label if version == "v1" else "Changed")
+        assert get_concept(engine, concept_iri, version=version).get_pref_label() == (
+            concept.get_pref_label()
+        )
+
+
+def test_save_dataset_reload_previous_content(
+    controller: GlossaryController,
+    file_rdf: Path,
+) -> None:
+    """Test the save_dataset function reloading a version whose content was
+    replaced by a later version, which makes its stored rows current again."""
+    engine = controller.engine
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    v1_label = get_concept(engine, concept_iri).get_pref_label()
+    dataset = controller.parse_dataset(file_rdf)
+    changed = next(concept for concept in dataset[1] if concept.iri == concept_iri)
+    changed.prefLabels = {**changed.prefLabels, "en": "Changed"}
+    save_dataset(engine, *dataset, version="v2")
+    assert get_concept(engine, concept_iri).get_pref_label() == "Changed"
+
+    delete_version(engine, "v1")
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    with Session(engine) as session:
+        assert session.query(Concept).count() == 3
+        assert session.query(Concept).where(Concept.current).count() == 2
+    assert get_concept(engine, concept_iri).get_pref_label() == v1_label
+    assert get_concept(engine, concept_iri, version="v2").get_pref_label() == (
+        "Changed"
+    )
+
+
+def test_save_dataset_labels(controller: GlossaryController, file_rdf: Path) -> None:
+    """Test that the labels are saved with the members and follow their changes."""
+    engine = controller.engine
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(engine, *controller.parse_dataset(file_rdf))
+
+    with Session(engine) as session:
+        concept = session.query(Concept).where(Concept.iri == concept_iri).one()
+        assert sorted(
+            tuple(label.to_dict().values()) for label in concept.labels
+        ) == sorted(tuple(label.to_dict().values()) for label in concept.get_labels())
+        concept.prefLabels = {"en": "Carcases"}
+        session.commit()
+        assert session.scalars(
+            select(Label.text).where(
+                Label.member_id == concept.id,
+                Label.kind == LabelKind.PREF_LABEL,
+            )
+        ).all() == ["Carcases"]
+
+
+def test_get_in_language(controller: GlossaryController, file_rdf: Path) -> None:
+    """Test the get functions reading the labels in a single language."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(engine, *controller.parse_dataset(file_rdf))
+    expected = get_concept(engine, concept_iri).to_dict(lang="sk")
+
+    concept = get_concept(engine, concept_iri, lang="sk")
+    assert "prefLabels" not in concept.__dict__
+    assert concept.to_dict(lang="sk") == expected
+    assert concept.scopeNoteInLanguage == "Frozen carcases and half-carcases of swine"
+    concept_scheme = get_concept_scheme(engine, concept_scheme_iri, lang="sk")
+    assert expected in [member.to_dict(lang="sk") for member in concept_scheme.members]
+    assert search_database(engine, expected["prefLabel"], lang="sk")[0].iri == (
+        concept_iri
+    )
+
+
+@pytest.mark.parametrize("partitioned", [False, True])
+def test_delete_version(
+    controller: GlossaryController,
+    file_rdf: Path,
+    partitioned: bool,
+) -> None:
+    """Test the delete_version function, with and without partitioned tables."""
+    engine = init_engine(drop_database_flag=True, partitioned=partitioned)
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v2")
+    with engine.connect() as connection:
+        partitions = connection.scalars(
+            text(
+                "SELECT relname FROM pg_inherits "
+                "JOIN pg_class ON pg_class.oid = pg_inherits.inhrelid "
+                "WHERE inhparent = 'semantic_relations'::regclass"
+            )
+        ).all()
+    assert len(partitions) == (3 if partitioned else 0)
+    document = {"type": DocumentType.CONCEPT, "iri": concept_iri, "lang": "en"}
+    save_documents(
+        engine,
+        [
+            {**document, "version": version, "content": b"{}"}
+            for version in ("v1", "v2", "")
+        ],
+    )
+
+    delete_version(engine, "v1")
+    assert get_document(engine, DocumentType.CONCEPT, concept_iri, version="v1") is None
+    assert get_document(engine, DocumentType.CONCEPT, concept_iri) is None
+    assert get_document(engine, DocumentType.CONCEPT, concept_iri, version="v2")
+    assert not get_relations(engine, concept_iri, version="v1")
+    assert len(get_relations(engine, concept_iri, version="v2")) == 1
+    assert not get_concept_schemes(engine, version="v1")
+    with pytest.raises(NoResultFound):
+        get_concept(engine, concept_iri, version="v1")
+    assert get_concept(engine, concept_iri, version="v2").iri == concept_iri
+
+
+def test_documents(controller: GlossaryController, file_rdf: Path) -> None:
+    """Test the documents are saved, replaced and cleared by the next ingestion."""
+    engine = controller.engine
+    iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    document = {
+        "type": DocumentType.CONCEPT,
+        "iri": iri,
+        "lang": "en",
+        "version": "v1",
+        "content": b"{}",
+    }
+    save_documents(engine, [document])
+    save_documents(engine, [{**document, "content": b'{"iri": ""}'}])
+
+    assert get_document(engine, DocumentType.CONCEPT, iri, version="v1") == (
+        b'{"iri": ""}'
+    )
+    assert get_document(engine, DocumentType.CONCEPT, iri) is None
+    assert get_document(engine, DocumentType.COLLECTION, iri, version="v1") is None
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v2")
+    assert get_document(engine, DocumentType.CONCEPT, iri, version="v1")
+    save_dataset(engine, *controller.parse_dataset(file_rdf))
+    assert get_document(engine, DocumentType.CONCEPT, iri, version="v1") is None
+
+
+def test_get_with_missing_version(
+    controller: GlossaryController,
+    file_rdf: Path,
+) -> None:
+    """Test the get functions with a version that was not saved."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+
+    assert len(get_concept_schemes(engine, version="v1")) == 1
+    assert not get_concept_schemes(engine, version="v2")
+    assert not get_relations(engine, concept_iri, version="v2")
+    assert not search_database(engine, "Carcases", version="v2")
+    with pytest.raises(NoResultFound):
+        get_concept_scheme(engine, concept_scheme_iri, version="v2")
+    with pytest.raises(NoResultFound):
+        get_concept(engine, concept_iri, version="v2")
 
 
 def test_get_concept_schemes(engine: Engine) -> None:
@@ -216,6 +587,55 @@ def test_get_relations(engine: Engine) -> None:
     assert relations[0].to_dict() == relation_dicts[0]
 
 
+def test_get_concept_with_relations(
+    controller: GlossaryController, file_rdf: Path
+) -> None:
+    """Test the get_concept_with_relations reads the concept, its concept schemes
+    and its relations in a single query, like get_concept and get_relations."""
+    engine = controller.engine
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    statements: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    for version, lang in [(None, None), ("v1", "sk")]:
+        statements.clear()
+        concept, concept_scheme_iris, relations = get_concept_with_relations(
+            engine, concept_iri, version=version, lang=lang
+        )
+        assert len(statements) == 1
+        expected = get_concept(engine, concept_iri, version=version, lang=lang)
+        assert concept.to_dict(lang or "en") == expected.to_dict(lang or "en")
+        assert concept_scheme_iris == [
+            concept_scheme.iri for concept_scheme in expected.concept_schemes
+        ]
+        assert [relation.to_dict() for relation in relations] == [
+            relation.to_dict()
+            for relation in get_relations(engine, concept_iri, version=version)
+        ]
+        assert relations
+    with pytest.raises(NoResultFound):
+        get_concept_with_relations(engine, concept_iri, version="v2")
+
+
+def test_dataset_generation(engine: Engine, tmp_path: Path) -> None:
+    """Test the dataset generation is bumped in the database, to the second, and is
+    exported to the SQLite files."""
+    assert get_dataset_generation(engine) == (0, UNLOADED_AT)
+    generation, loaded_at = bump_dataset_generation(engine)
+    assert generation == 1
+    assert loaded_at > UNLOADED_AT and loaded_at.microsecond == 0
+    assert loaded_at.tzinfo == UNLOADED_AT.tzinfo
+    assert get_dataset_generation(engine) == (1, loaded_at)
+    assert bump_dataset_generation(engine)[0] == 2
+    sqlite_engine = init_engine(f"sqlite:///{export_sqlite(engine, tmp_path / 'g.db')}")
+    assert get_dataset_generation(sqlite_engine) == get_dataset_generation(engine)
+
+
 def test_search_database(engine: Engine) -> None:
     """Test the search_database."""
     concept_scheme_dicts = add_concept_schemes(engine, 1)
@@ -235,3 +655,399 @@ def test_search_database_no_results(engine: Engine) -> None:
 
     search_results = search_database(engine, "prefLabel2")
     assert len(search_results) == 0
+
+
+def test_get_rows(controller: GlossaryController, file_rdf: Path) -> None:
+    """Test the get functions returning rows with the labels in a single language."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    collection_iri = "https://example.org/collection1"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    concept = get_concept(engine, concept_iri).to_dict(lang="sk")
+
+    concept_scheme = get_concept_scheme_row(engine, concept_scheme_iri, lang="sk")
+    assert dict(concept_scheme) == get_concept_scheme(
+        engine, concept_scheme_iri
+    ).to_dict(lang="sk")
+    concepts = get_scheme_member_rows(
+        engine, concept_scheme_iri, lang="sk", member_type=MemberType.CONCEPT
+    )
+    assert len(concepts) == 2
+    assert {key: concepts[0][key] for key in concept} == concept
+    assert len(get_scheme_member_rows(engine, concept_scheme_iri, version="v1")) == 4
+    assert get_collection_row(engine, collection_iri)["prefLabel"] == (
+        get_collection(engine, collection_iri).to_dict()["prefLabel"]
+    )
+    assert len(get_collection_member_rows(engine, collection_iri)) == 2
+    assert [row["iri"] for row in search_database_rows(engine, "Carcases")] == [
+        concept_iri
+    ]
+    assert search_database_rows(engine, concept["altLabels"][0], lang="sk")
+    assert not search_database_rows(engine, "Carcases", version="v2")
+    with pytest.raises(NoResultFound):
+        get_concept_scheme_row(engine, concept_scheme_iri, version="v2")
+    with pytest.raises(NoResultFound):
+        get_collection_row(engine, concept_iri)
+
+
+def test_get_rows_by_iri(controller: GlossaryController, file_rdf: Path) -> None:
+    """Test the get functions returning the rows of the given IRIs, leaving out the
+    IRIs not found."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    collection_iri = "https://example.org/collection1"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    iris = [concept_iri, collection_iri, concept_scheme_iri, "http://example.org/x"]
+
+    members = get_member_rows_by_iri(engine, iris, lang="sk")
+    assert {member["iri"] for member in members} == {concept_iri, collection_iri}
+    concepts = get_member_rows_by_iri(engine, iris, member_type=MemberType.CONCEPT)
+    assert [concept["iri"] for concept in concepts] == [concept_iri]
+    assert not get_member_rows_by_iri(engine, iris, version="v2")
+    assert get_concept_scheme_rows_by_iri(engine, iris, lang="sk") == [
+        get_concept_scheme_row(engine, concept_scheme_iri, lang="sk")
+    ]
+
+
+def test_get_rows_fields(controller: GlossaryController, file_rdf: Path) -> None:
+    """Test the get functions returning rows select only the columns of the sparse
+    fieldset, besides the member type, IRI and notation."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    save_dataset(engine, *controller.parse_dataset(file_rdf))
+    fields = frozenset({"iri", "notation", "prefLabel"})
+
+    members = get_scheme_member_rows(engine, concept_scheme_iri, lang="sk")
+    sparse_members = get_scheme_member_rows(
+        engine, concept_scheme_iri, lang="sk", fields=fields
+    )
+    assert [list(member) for member in sparse_members] == [
+        ["member_type", "iri", "notation", "prefLabel"]
+    ] * len(members)
+    assert sparse_members == [
+        {key: member[key] for key in ["member_type", *sorted(fields)]}
+        for member in members
+    ]
+    assert search_database_rows(engine, "Carcases", fields=fields) == [
+        {key: concept[key] for key in ["member_type", *sorted(fields)]}
+        for concept in search_database_rows(engine, "Carcases")
+    ]
+
+
+def test_export_sqlite(
+    controller: GlossaryController,
+    file_rdf: Path,
+    tmp_path: Path,
+) -> None:
+    """Test the get functions read the same data from an exported SQLite file."""
+    engine = controller.engine
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    collection_iri = "https://example.org/collection1"
+    save_dataset(engine, *controller.parse_dataset(file_rdf), version="v1")
+    sqlite_engine = init_engine(f"sqlite:///{export_sqlite(engine, tmp_path / 'g.db')}")
+
+    for get in [
+        lambda engine: [scheme.to_dict() for scheme in get_concept_schemes(engine)],
+        lambda engine: get_concept_scheme_row(engine, concept_scheme_iri, lang="sk"),
+        lambda engine: get_scheme_member_rows(engine, concept_scheme_iri, "sk", "v1"),
+        lambda engine: get_collection_member_rows(engine, collection_iri, "sk"),
+        lambda engine: get_concept(engine, concept_iri, lang="sk").to_dict("sk"),
+        lambda engine: get_collection(engine, collection_iri, lang="sk").to_dict("sk"),
+        lambda engine: [relation.to_dict() for relation in get_relations(engine, "")],
+        lambda engine: [
+            relation.to_dict() for relation in get_relations(engine, concept_iri)
+        ],
+        lambda engine: search_database_rows(engine, "arcases"),
+        lambda engine: search_database_rows(
+            engine, "-- Trupy a polovičky trupov", "sk"
+        ),
+        lambda engine: search_database_rows(engine, "Ca"),
+        lambda engine: get_member_rows_by_iri(
+            engine, [concept_iri, collection_iri, concept_scheme_iri], "sk"
+        ),
+        lambda engine: get_concept_scheme_rows_by_iri(
+            engine, [concept_iri, concept_scheme_iri], "sk", "v1"
+        ),
+        lambda engine: search_database_rows(
+            engine, "arcases", fields=frozenset({"identifier"})
+        ),
+        lambda engine: [concept.iri for concept in search_database(engine, "arcases")],
+        lambda engine: [
+            relation.to_dict()
+            for relation in get_concept_with_relations(engine, concept_iri)[2]
+        ],
+        lambda engine: get_concept_with_relations(engine, concept_iri, "v1")[1],
+        lambda engine: get_relation_concept_rows(
+            engine, get_concept_with_relations(engine, concept_iri)[2], "sk"
+        ),
+    ]:
+        assert get(sqlite_engine) == get(engine)
+    assert len(search_database_rows(sqlite_engine, "arcases")) == 1
+    with pytest.raises(OperationalError):
+        save_dataset(sqlite_engine, *controller.parse_dataset(file_rdf))
+
+
+def unindexed_scans(
+    connection: Connection,
+    statement: str,
+    parameters: dict,
+    large_tables: set[str],
+) -> list[str]:
+    """Get the scans of large tables not restricted by an index in the plan of a
+    statement. The statement is planned with sequential scans, hash joins and merge
+    joins disabled, so that a sequential scan, or an index scan without a condition
+    on the leading column of the index, only remains when no index can serve the
+    statement. The index scans reading the rows of a limited statement in the order
+    of the index, the outer side of its plan up to the limit, only read the rows of
+    the limit and are kept.
+
+    Args:
+        connection (Connection): The database connection.
+        statement (str): The statement to explain.
+        parameters (dict): The statement parameters.
+        large_tables (set[str]): The tables that must not be fully scanned.
+
+    Returns:
+        list[str]: The unindexed scans, as node type and table.
+    """
+    indexes = {
+        index: (table, leading_column)
+        for index, table, leading_column in connection.execute(
+            text(
+                "SELECT index.relname, tab.relname, attribute.attname FROM pg_index "
+                "JOIN pg_class AS index ON index.oid = pg_index.indexrelid "
+                "JOIN pg_class AS tab ON tab.oid = pg_index.indrelid "
+                "JOIN pg_attribute AS attribute ON attribute.attrelid = tab.oid "
+                "AND attribute.attnum = pg_index.indkey[0]"
+            )
+        )
+    }
+    settings = ["enable_seqscan", "enable_hashjoin", "enable_mergejoin"]
+    for setting in settings:
+        connection.exec_driver_sql(f"SET {setting} = off")
+    plan = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    ).scalar_one()
+    for setting in settings:
+        connection.exec_driver_sql(f"RESET {setting}")
+
+    scans: list[str] = []
+    nodes = [(plan[0]["Plan"], False)]
+    while nodes:
+        node, limited = nodes.pop()
+        limits_outer = node["Node Type"] == "Limit" or (
+            limited and node["Node Type"] in ("Nested Loop", "Result")
+        )
+        nodes.extend(
+            (child, limits_outer and child.get("Parent Relationship") == "Outer")
+            for child in node.get("Plans", [])
+        )
+        if node["Node Type"] == "Seq Scan":
+            table = node["Relation Name"]
+        elif "Index Name" in node:
+            table, leading_column = indexes[node["Index Name"]]
+            if limited or re.search(
+                rf"\b{leading_column}\b", node.get("Index Cond", "")
+            ):
+                continue
+        else:
+            continue
+        if table in large_tables:
+            scans.append(f"{node['Node Type']} on {table}")
+    return scans
+
+
+def save_synthetic_datasets(engine: Engine, path: Path) -> list[SyntheticDataset]:
+    """Save synthetic datasets, each one in its own version, and analyze them.
+
+    Args:
+        engine (Engine): The database engine.
+        path (Path): The directory of the dataset files.
+
+    Returns:
+        list[SyntheticDataset]: The saved datasets.
+    """
+    controller = GlossaryController(data_dir_path=path, engine=engine)
+    datasets = [
+        SyntheticDataset(
+            concepts=500,
+            depth=3,
+            fan_out=5,
+            collections=5,
+            base_iri=f"http://example.org/dataset{i}/",
+        )
+        for i in range(10)
+    ]
+    for i, dataset in enumerate(datasets):
+        dataset_path = dataset.write(path / f"dataset{i}.rdf")
+        save_dataset(engine, *controller.parse_dataset(dataset_path), version=f"v{i}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    return datasets
+
+
+def index_queries(engine: Engine, dataset: SyntheticDataset) -> dict[str, Callable]:
+    """Get the queries of `test_queries_use_indexes` on a synthetic dataset.
+
+    Args:
+        engine (Engine): The database engine.
+        dataset (SyntheticDataset): The synthetic dataset.
+
+    Returns:
+        dict[str, Callable]: The queries by name.
+    """
+    after = itemgetter("notation", "iri")(
+        get_scheme_member_rows(engine, dataset.scheme_iri, version="v3", limit=20)[-1]
+    )
+    relations = get_relations(engine, dataset.concept_iri(42))
+    iris = [dataset.concept_iri(i) for i in range(0, 500, 50)]
+    return {
+        "get_concept_schemes": lambda: get_concept_schemes(engine, version="v3"),
+        "get_concept_scheme": lambda: get_concept_scheme(engine, dataset.scheme_iri),
+        "get_concept_scheme_version": lambda: get_concept_scheme(
+            engine, dataset.scheme_iri, version="v3"
+        ),
+        "get_collection": lambda: get_collection(engine, dataset.collection_iri(1)),
+        "get_collection_version": lambda: get_collection(
+            engine, dataset.collection_iri(1), version="v3"
+        ),
+        "get_concept": lambda: get_concept(engine, dataset.concept_iri(42)),
+        "get_concept_version": lambda: get_concept(
+            engine, dataset.concept_iri(42), version="v3"
+        ),
+        "get_concept_lang": lambda: get_concept(
+            engine, dataset.concept_iri(42), lang="bg"
+        ),
+        "get_concept_scheme_lang": lambda: get_concept_scheme(
+            engine, dataset.scheme_iri, version="v3", lang="bg"
+        ),
+        "get_collection_lang": lambda: get_collection(
+            engine, dataset.collection_iri(1), lang="bg"
+        ),
+        "get_concept_scheme_row": lambda: get_concept_scheme_row(
+            engine, dataset.scheme_iri, version="v3"
+        ),
+        "get_scheme_member_rows": lambda: get_scheme_member_rows(
+            engine, dataset.scheme_iri, version="v3"
+        ),
+        "get_collection_row": lambda: get_collection_row(
+            engine, dataset.collection_iri(1)
+        ),
+        "get_collection_member_rows": lambda: get_collection_member_rows(
+            engine, dataset.collection_iri(1), version="v3"
+        ),
+        "get_scheme_member_rows_page": lambda: get_scheme_member_rows(
+            engine, dataset.scheme_iri, version="v3", limit=20, after=after
+        ),
+        "get_scheme_member_rows_first_page": lambda: get_scheme_member_rows(
+            engine, dataset.scheme_iri, limit=20
+        ),
+        "get_scheme_member_rows_all_versions_page": lambda: get_scheme_member_rows(
+            engine, dataset.scheme_iri, limit=20, after=after
+        ),
+        "get_collection_member_rows_page": lambda: get_collection_member_rows(
+            engine, dataset.collection_iri(1), version="v3", limit=20, after=after
+        ),
+        "get_collection_member_rows_all_versions_page": lambda: (
+            get_collection_member_rows(
+                engine, dataset.collection_iri(1), limit=20, after=after
+            )
+        ),
+        "search_database_rows_page": lambda: search_database_rows(
+            engine, "a", version="v3", limit=20, after=after
+        ),
+        "search_database_rows_first_page": lambda: search_database_rows(
+            engine, "a", version="v3", limit=20
+        ),
+        "get_relations": lambda: get_relations(engine, dataset.concept_iri(42)),
+        "get_relations_version": lambda: get_relations(
+            engine, dataset.concept_iri(42), version="v3"
+        ),
+        "get_concept_with_relations": lambda: get_concept_with_relations(
+            engine, dataset.concept_iri(42), lang="bg"
+        ),
+        "get_concept_with_relations_version": lambda: get_concept_with_relations(
+            engine, dataset.concept_iri(42), version="v3", lang="bg"
+        ),
+        "get_relation_concept_rows": lambda: get_relation_concept_rows(
+            engine, relations, lang="bg"
+        ),
+        "get_member_rows_by_iri": lambda: get_member_rows_by_iri(engine, iris),
+        "get_member_rows_by_iri_version": lambda: get_member_rows_by_iri(
+            engine, iris, version="v3"
+        ),
+        "get_concept_scheme_rows_by_iri": lambda: get_concept_scheme_rows_by_iri(
+            engine, [dataset.scheme_iri], version="v3"
+        ),
+        "get_document": lambda: get_document(
+            engine, DocumentType.CONCEPT, dataset.concept_iri(42), version="v3"
+        ),
+    }
+
+
+def test_queries_use_indexes(engine: Engine, tmp_path: Path) -> None:
+    """Test that the queries only access the large tables through their indexes. The
+    unpaginated searches are left out, as they read all the concepts of the searched
+    versions."""
+    dataset = save_synthetic_datasets(engine, tmp_path)[3]
+    save_documents(
+        engine,
+        [
+            {
+                "type": DocumentType.CONCEPT,
+                "iri": dataset.concept_iri(i),
+                "lang": "en",
+                "version": version,
+                "content": b"{}",
+            }
+            for i in range(500)
+            for version in ("v3", "")
+        ],
+    )
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE documents")
+        large_tables = set(
+            connection.scalars(
+                text(
+                    "SELECT relname FROM pg_class "
+                    "WHERE relkind = 'r' AND reltuples >= 1000"
+                )
+            )
+        )
+    assert {
+        "collection_members",
+        "semantic_relations",
+        "in_scheme",
+        "labels",
+        "documents",
+    } <= large_tables
+
+    queries = index_queries(engine, dataset)
+    statements: list[tuple[str, dict]] = []
+
+    def record(*args) -> None:
+        statements.append((args[2], args[3]))
+
+    for name, query in queries.items():
+        event.listen(engine, "before_cursor_execute", record)
+        query()
+        event.remove(engine, "before_cursor_execute", record)
+        assert statements
+        with engine.connect() as connection:
+            for statement, parameters in statements:
+                scans = unindexed_scans(connection, statement, parameters, large_tables)
+                assert not scans, f"{name}: {scans}"
+        statements.clear()
+
+    # The pages of all the versions are read in the order of the keyset index.
+    event.listen(engine, "before_cursor_execute", record)
+    queries["get_scheme_member_rows_all_versions_page"]()
+    event.remove(engine, "before_cursor_execute", record)
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN {statements[0][0]}", statements[0][1]
+        )
+        assert "ix_collection_members_notation_iri" in "\n".join(plan.scalars())
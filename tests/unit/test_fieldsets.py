@@ -0,0 +1,25 @@
+"""Tests for dds_glossary.fieldsets module."""
+
+from pytest import raises as pytest_raises
+
+from dds_glossary.exceptions import InvalidFieldsException
+from dds_glossary.fieldsets import decode_fields
+
+
+def test_decode_fields() -> None:
+    """Test the sparse fieldsets decode to their fields and the key fields."""
+    assert decode_fields(None) is None
+    assert decode_fields("prefLabel, altLabels") == {
+        "iri",
+        "notation",
+        "prefLabel",
+        "altLabels",
+    }
+    assert decode_fields("") == {"iri", "notation"}
+
+
+def test_decode_fields_invalid() -> None:
+    """Test the sparse fieldsets with unknown fields are rejected."""
+    with pytest_raises(InvalidFieldsException) as exc_info:
+        decode_fields("prefLabel,member_type")
+    assert exc_info.value.detail == "Invalid fields prefLabel,member_type."
@@ -0,0 +1,67 @@
+"""Tests for dds_glossary.migration module."""
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from dds_glossary.migration import jsonb_map_values, quote_identifier, update_column
+from dds_glossary.model import Concept
+
+from ..common import add_concept_schemes, add_concepts
+
+
+def _alt_labels(engine: Engine) -> list[dict]:
+    with Session(engine) as session:
+        return [
+            concept.altLabels
+            for concept in session.query(Concept).order_by(Concept.iri).all()
+        ]
+
+
+def test_quote_identifier() -> None:
+    """It should quote the identifier and escape the quotes."""
+    assert quote_identifier("altLabels") == '"altLabels"'
+    assert quote_identifier('alt"Labels') == '"alt""Labels"'
+
+
+def test_update_column_single_statement(engine: Engine) -> None:
+    """It should update all the matching rows with one statement."""
+    concept_scheme_dicts = add_concept_schemes(engine, 1)
+    add_concepts(engine, [concept_scheme_dicts[0]["iri"]] * 2)
+
+    with engine.begin() as connection:
+        updated = update_column(
+            connection,
+            table_name="concepts",
+            column_name="altLabels",
+            expression=jsonb_map_values("{column}", "value -> 0"),
+            where="{column} <> jsonb_build_object()",
+        )
+
+    assert updated == 2
+    assert _alt_labels(engine) == [{"en": "altLabel0"}, {"en": "altLabel1"}]
+
+
+def test_update_column_batches(engine: Engine) -> None:
+    """It should update the rows in batches and report the progress."""
+    concept_scheme_dicts = add_concept_schemes(engine, 1)
+    add_concepts(engine, [concept_scheme_dicts[0]["iri"]] * 3)
+    progress: list[int] = []
+
+    with engine.begin() as connection:
+        updated = update_column(
+            connection,
+            table_name="concepts",
+            column_name="altLabels",
+            expression=jsonb_map_values("{column}", "jsonb_build_array(value)"),
+            batch_size=2,
+            key_column="id",
+            progress=progress.append,
+        )
+
+    assert updated == 3
+    assert progress == [2, 3]
+    assert _alt_labels(engine) == [
+        {"en": [["altLabel0"]]},
+        {"en": [["altLabel1"]]},
+        {"en": [["altLabel2"]]},
+    ]
@@ -1,15 +1,47 @@
 """Tests for dds_glossary.model module."""
 
-from dds_glossary.enums import SemanticRelationType
+from dds_glossary.enums import LabelKind, SemanticRelationType
 from dds_glossary.model import (
     Base,
     Collection,
     Concept,
     ConceptScheme,
+    Dataset,
+    IriPrefix,
     SemanticRelation,
 )
 
 
+def test_dataset_default_version() -> None:
+    """It should default the version to the dataset name without its extension."""
+    assert Dataset(name="ESTAT-CN2024.rdf", url="").version == "ESTAT-CN2024"
+    assert Dataset(name="ESTAT-CN2024.rdf", url="", version="CN2024").version == (
+        "CN2024"
+    )
+
+
+def test_iri_prefix_split() -> None:
+    """It should split an IRI after its last slash or hash."""
+    assert IriPrefix.split("http://data.europa.eu/xsp/cn2024/020321000080") == (
+        "http://data.europa.eu/xsp/cn2024/",
+        "020321000080",
+    )
+    assert IriPrefix.split("http://www.w3.org/2004/02/skos/core#Concept") == (
+        "http://www.w3.org/2004/02/skos/core#",
+        "Concept",
+    )
+    assert IriPrefix.split("concept_iri0") == ("", "concept_iri0")
+
+
+def test_iri_entity_iri() -> None:
+    """It should store the IRI as a prefix and a local name."""
+    concept = Concept()
+    concept.iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    assert concept.prefix.prefix == "http://data.europa.eu/xsp/cn2024/"
+    assert concept.local_name == "020321000080"
+    assert concept.iri == "http://data.europa.eu/xsp/cn2024/020321000080"
+
+
 def test_base_eq_true(concept_scheme: ConceptScheme) -> None:
     """It should return True if two Base instances are equal."""
     assert concept_scheme == ConceptScheme(
@@ -204,6 +236,24 @@ def test_concept_to_dict(concept: Concept) -> None:
     }
 
 
+def test_concept_get_labels(concept: Concept) -> None:
+    """It should return a label per language and label of the Concept instance."""
+    labels = [label.to_dict() for label in concept.get_labels()]
+    assert len(labels) == 4 + 5 + 4
+    assert labels[0] == {
+        "kind": LabelKind.PREF_LABEL.value,
+        "lang": "en",
+        "position": 0,
+        "text": "0203 21 -- Carcases and half-carcases",
+    }
+    assert labels[5] == {
+        "kind": LabelKind.ALT_LABEL.value,
+        "lang": "en",
+        "position": 1,
+        "text": "0203 21 -- Carcases and half-carcases",
+    }
+
+
 def test_semantic_relation_from_xml_element(
     semantic_relation: SemanticRelation,
 ) -> None:
@@ -226,3 +276,16 @@ def test_semantic_relation_to_dict(semantic_relation: SemanticRelation) -> None:
         "target_concept_iri": "http://data.europa.eu/xsp/cn2024/020321000010",
         "type": "broader",
     }
+
+
+def test_semantic_relation_resolve_concepts_from_xml(
+    concept: Concept,
+    semantic_relation: SemanticRelation,
+) -> None:
+    """It should resolve the source and target concepts from their IRIs."""
+    target_concept = Concept(iri=semantic_relation.target_concept_iri)
+    semantic_relation.resolve_concepts_from_xml(
+        {concept.iri: concept, target_concept.iri: target_concept}
+    )
+    assert semantic_relation.source_concept is concept
+    assert semantic_relation.target_concept is target_concept
@@ -0,0 +1,35 @@
+"""Tests for dds_glossary.pagination module."""
+
+from base64 import urlsafe_b64encode
+
+from pytest import mark
+from pytest import raises as pytest_raises
+
+from dds_glossary.exceptions import InvalidCursorException
+from dds_glossary.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def test_encode_cursor() -> None:
+    """Test the cursors decode to the notation and IRI they encode."""
+    cursor = encode_cursor("01.02", "http://example.org/concept?a=1&b=2")
+    assert decode_cursor(cursor) == ("01.02", "http://example.org/concept?a=1&b=2")
+    assert decode_cursor(None) is None
+
+
+@mark.parametrize(
+    "cursor",
+    ["invalid", urlsafe_b64encode(b"[1, 2]").decode(), encode_cursor("a", "b")[:-4]],
+)
+def test_decode_cursor_invalid(cursor: str) -> None:
+    """Test the invalid cursors are rejected."""
+    with pytest_raises(InvalidCursorException):
+        decode_cursor(cursor)
+
+
+def test_next_cursor() -> None:
+    """Test the next cursor is the one of the last member of a full page."""
+    members = [{"notation": "1", "iri": "iri1"}, {"notation": "2", "iri": "iri2"}]
+    assert next_cursor(members, None) is None
+    assert next_cursor(members, 3) is None
+    cursor = next_cursor(members, 2)
+    assert cursor is not None and decode_cursor(cursor) == ("2", "iri2")
@@ -1,14 +1,28 @@
 """Tests for dds_glossary.routes module."""
 
+import json
 from http import HTTPStatus
+from pathlib import Path
 
 from fastapi.testclient import TestClient
 from pytest import MonkeyPatch
+from sqlalchemy import event
 
+from dds_glossary.database import bump_dataset_generation, get_document
+from dds_glossary.enums import DocumentType
 from dds_glossary.model import Dataset, FailedDataset
-from dds_glossary.schema import InitDatasetsResponse, VersionResponse
+from dds_glossary.pagination import decode_cursor, encode_cursor
+from dds_glossary.schema import (
+    MAX_BATCH_IRIS,
+    ConceptResponse,
+    InitDatasetsResponse,
+    VersionResponse,
+)
+from dds_glossary.services import GlossaryController, get_engine, get_response_cache
 from dds_glossary.settings import get_settings
 
+from ..common import add_concept_schemes, add_concepts, add_relations
+
 
 def test_version(
     client: TestClient,
@@ -21,6 +35,77 @@ def test_version(
     assert response.json() == version_response.model_dump()
 
 
+def test_get_cache_statistics(client: TestClient) -> None:
+    """Test the /cache endpoint counts the hits and misses of the read endpoints."""
+    engine = get_engine()
+    concept_scheme_iri = add_concept_schemes(engine, 1)[0]["iri"]
+    for _ in range(2):
+        client.get(
+            "/latest/concepts", params={"concept_scheme_iri": concept_scheme_iri}
+        )
+    response = client.get("/latest/cache")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["hits"] == 1
+    assert response.json()["misses"] == 1
+
+
+def test_conditional_requests(client: TestClient, monkeypatch: MonkeyPatch) -> None:
+    """Test the read endpoints set their validators and Cache-Control policy, and
+    answer the clients holding their response with 304, whichever process serves
+    them, until the generation stored in the database is bumped."""
+    monkeypatch.setattr(
+        get_settings(), "CACHE_CONTROLS", {"get_concepts": "public, max-age=60"}
+    )
+    monkeypatch.setattr(get_settings(), "DATASET_GENERATION_TTL", 60.0)
+    engine = get_engine()
+    concept_scheme_iri = add_concept_schemes(engine, 1)[0]["iri"]
+    params = {"concept_scheme_iri": concept_scheme_iri}
+    response = client.get("/latest/concepts", params=params)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["cache-control"] == "public, max-age=60"
+    assert "last-modified" in response.headers
+    etag = response.headers["etag"]
+
+    statements: list[str] = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    response = client.get(
+        "/latest/concepts", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert not response.content and not statements
+    assert (
+        client.get("/latest/schemes", headers={"If-None-Match": etag}).headers[
+            "cache-control"
+        ]
+        == "no-cache"
+    )
+    response = client.get(
+        "/latest/concepts",
+        params=params,
+        headers={"If-None-Match": etag, "X-Read-Primary": "true"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert "etag" not in response.headers
+
+    # The cache of another process, or of a restarted one, shares the
+    # validators, until it refreshes the bumped generation.
+    monkeypatch.setattr(get_settings(), "DATASET_GENERATION_TTL", 0.0)
+    get_response_cache.cache_clear()
+    response = client.get(
+        "/latest/concepts", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    bump_dataset_generation(engine)
+    response = client.get(
+        "/latest/concepts", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["etag"] != etag
+
+
 def test_init_datasets_missing_key(client: TestClient) -> None:
     """Test the /init_datasets endpoint with a missing API key."""
     response = client.post("/latest/init_datasets")
@@ -67,6 +152,27 @@ def test_init_datasets_valid_key(client: TestClient, monkeypatch: MonkeyPatch) -
     )
 
 
+def test_init_datasets_without_budget(
+    client: TestClient, monkeypatch: MonkeyPatch, file_rdf: Path
+) -> None:
+    """Test the /init_datasets endpoint ingests and precomputes the documents
+    without the time budget of the read requests, which it outlasts."""
+    monkeypatch.setattr(
+        GlossaryController, "datasets", [Dataset(name="sample.rdf", url=str(file_rdf))]
+    )
+    monkeypatch.setattr(get_settings(), "DOCUMENT_LANGUAGES", ["en"])
+    monkeypatch.setattr(get_settings(), "QUERY_TIME_BUDGET", 1e-6)
+    api_key = get_settings().API_KEY.get_secret_value()
+    response = client.post("/latest/init_datasets", headers={"X-API-Key": api_key})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["failed_datasets"] == []
+    assert get_document(
+        get_engine(),
+        DocumentType.CONCEPT_SCHEME,
+        "http://data.europa.eu/xsp/cn2024/cn2024",
+    )
+
+
 def test_get_concept_schemes_empty(client: TestClient) -> None:
     """Test the /schemes endpoint with an empty database."""
     response = client.get("/latest/schemes")
@@ -75,6 +181,14 @@ def test_get_concept_schemes_empty(client: TestClient) -> None:
     assert response.headers["content-type"] == "application/json"
 
 
+def test_get_concept_schemes_version_empty(client: TestClient) -> None:
+    """Test the /schemes endpoint with a version that was not saved."""
+    response = client.get("/latest/schemes?version=CN2023")
+    assert response.json() == []
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/json"
+
+
 def test_get_concept_scheme_not_found(client: TestClient) -> None:
     """Test the /scheme endpoint."""
     concept_scheme_iri = "iri"
@@ -126,3 +240,180 @@ def test_get_concept_not_found(client: TestClient) -> None:
     assert response.json() == {"detail": f"Concept {concept_iri} not found."}
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.headers["content-type"] == "application/json"
+
+
+def test_get_concept_document(client: TestClient, monkeypatch: MonkeyPatch) -> None:
+    """Test the /concept endpoint with a precomputed document."""
+    monkeypatch.setattr(
+        "dds_glossary.services.GlossaryController.get_document",
+        lambda *_, **__: b'{"iri": "http://example.org/concept"}',
+    )
+    response = client.get(
+        "/latest/concept", params={"concept_iri": "http://example.org/concept"}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"iri": "http://example.org/concept"}
+
+
+def test_get_concept_expand_relations(client: TestClient) -> None:
+    """Test the /concept endpoint expands the relations with their concepts."""
+    engine = get_engine()
+    concept_scheme_iri = add_concept_schemes(engine, 1)[0]["iri"]
+    concept_dicts = add_concepts(engine, [concept_scheme_iri] * 2)
+    add_relations(engine, [(concept_dicts[0]["iri"], concept_dicts[1]["iri"])])
+    response = client.get(
+        "/latest/concept",
+        params={"concept_iri": concept_dicts[0]["iri"], "expand": "relations"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    relation = response.json()["relations"][0]
+    assert relation["target_concept"] == {
+        key: concept_dicts[1][key] for key in ["iri", "notation", "prefLabel"]
+    }
+    response = client.get(
+        "/latest/concept",
+        params={"concept_iri": concept_dicts[0]["iri"], "expand": "unknown"},
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_get_concepts_batch(client: TestClient) -> None:
+    """Test the /concepts/batch endpoint returns the concepts by IRI."""
+    engine = get_engine()
+    concept_scheme_iri = add_concept_schemes(engine, 1)[0]["iri"]
+    concept_dict = add_concepts(engine, [concept_scheme_iri])[0]
+    response = client.post(
+        "/latest/concepts/batch",
+        json={"iris": [concept_dict["iri"], "http://example.org/missing"]},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        concept_dict["iri"]: ConceptResponse(**concept_dict).model_dump(),
+        "http://example.org/missing": None,
+    }
+    response = client.post(
+        "/latest/concepts/batch", json={"iris": ["iri"] * (MAX_BATCH_IRIS + 1)}
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_search_paginated(client: TestClient, monkeypatch: MonkeyPatch) -> None:
+    """Test the /search endpoint returns the cursor of the next page in a header."""
+    concepts = [
+        ConceptResponse(
+            iri=f"iri{i}",
+            notation=f"notation{i}",
+            prefLabel="",
+            identifier="",
+            scopeNote="",
+            altLabels=[],
+        )
+        for i in range(2)
+    ]
+    monkeypatch.setattr(
+        "dds_glossary.services.GlossaryController.search_database",
+        lambda *_, **__: concepts,
+    )
+    response = client.get("/latest/search", params={"search_term": "", "limit": 2})
+    assert response.status_code == HTTPStatus.OK
+    assert decode_cursor(response.headers["X-Next-Cursor"]) == ("notation1", "iri1")
+    response = client.get("/latest/search", params={"search_term": "", "limit": 3})
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_search_invalid_cursor(client: TestClient) -> None:
+    """Test the /search endpoint with an invalid cursor."""
+    response = client.get("/latest/search", params={"search_term": "", "cursor": "x"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor x."}
+
+
+def test_search_unknown_cursor_prefix(client: TestClient) -> None:
+    """Test the /search endpoint with a cursor of an unknown IRI prefix."""
+    cursor = encode_cursor("1", "http://unknown.org/concept")
+    response = client.get(
+        "/latest/search", params={"search_term": "", "cursor": cursor}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {"detail": f"Invalid cursor {cursor}."}
+
+
+def test_get_concept_scheme_paginated(client: TestClient) -> None:
+    """Test the /scheme endpoint returns the cursor of the next page in a header,
+    as in its body."""
+    engine = get_engine()
+    concept_scheme_iri = add_concept_schemes(engine, 1)[0]["iri"]
+    add_concepts(engine, [concept_scheme_iri] * 3)
+    params = {"concept_scheme_iri": concept_scheme_iri, "limit": 2}
+    response = client.get("/latest/scheme", params=params)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["X-Next-Cursor"] == response.json()["next_cursor"]
+    assert decode_cursor(response.headers["X-Next-Cursor"]) == (
+        "notation1",
+        "concept_iri1",
+    )
+    params["cursor"] = response.headers["X-Next-Cursor"]
+    response = client.get("/latest/scheme", params=params)
+    assert response.json()["next_cursor"] is None
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_concept_fields(client: TestClient, monkeypatch: MonkeyPatch) -> None:
+    """Test the /concept endpoint returns the fields of the sparse fieldset only,
+    instead of the precomputed document."""
+    monkeypatch.setattr(
+        "dds_glossary.services.GlossaryController.get_document",
+        lambda *_, **__: b"{}",
+    )
+    engine = get_engine()
+    concept_scheme_iri = add_concept_schemes(engine, 1)[0]["iri"]
+    concept_dict = add_concepts(engine, [concept_scheme_iri])[0]
+    response = client.get(
+        "/latest/concept",
+        params={"concept_iri": concept_dict["iri"], "fields": "prefLabel"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        **{key: concept_dict[key] for key in ["iri", "notation", "prefLabel"]},
+        "concept_schemes": [concept_scheme_iri],
+        "relations": [],
+    }
+
+
+def test_get_concepts_fields(client: TestClient) -> None:
+    """Test the /concepts endpoint returns the fields of the sparse fieldset only."""
+    engine = get_engine()
+    concept_scheme_iri = add_concept_schemes(engine, 1)[0]["iri"]
+    concept_dict = add_concepts(engine, [concept_scheme_iri])[0]
+    response = client.get(
+        "/latest/concepts",
+        params={"concept_scheme_iri": concept_scheme_iri, "fields": "prefLabel"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == [
+        {key: concept_dict[key] for key in ["iri", "notation", "prefLabel"]}
+    ]
+    response = client.get(
+        "/latest/concepts",
+        params={"concept_scheme_iri": concept_scheme_iri, "fields": "unknown"},
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {"detail": "Invalid fields unknown."}
+
+
+def test_get_concepts_ndjson(client: TestClient) -> None:
+    """Test the /concepts endpoint streams the concepts as newline delimited JSON."""
+    engine = get_engine()
+    concept_scheme_iri = add_concept_schemes(engine, 1)[0]["iri"]
+    concept_dicts = add_concepts(engine, [concept_scheme_iri] * 2)
+    response = client.get(
+        "/latest/concepts",
+        params={"concept_scheme_iri": concept_scheme_iri},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.iter_lines()] == [
+        ConceptResponse(**concept_dict).model_dump() for concept_dict in concept_dicts
+    ]
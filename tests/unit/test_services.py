@@ -1,26 +1,56 @@
 """Tests for dds_glossary.services module."""
 
+import json
+from datetime import datetime
+from functools import partial
 from http import HTTPStatus
 from pathlib import Path
+from threading import Thread, current_thread, main_thread
+from typing import Callable
 
+from anyio import run as anyio_run
+from anyio import sleep_forever
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
 from pytest import MonkeyPatch
 from pytest import raises as pytest_raises
-
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from dds_glossary.cache import ResponseCache
+from dds_glossary.database import (
+    QueryBudget,
+    ReplicaSet,
+    get_dataset_generation,
+    init_async_engine,
+    save_dataset,
+)
+from dds_glossary.enums import DocumentType
 from dds_glossary.exceptions import (
     CollectionNotFoundException,
     ConceptNotFoundException,
     ConceptSchemeNotFoundException,
+    InvalidCursorException,
+    InvalidFieldsException,
+    QueryCancelledException,
+    QueryTimeoutException,
 )
 from dds_glossary.model import Dataset, FailedDataset
+from dds_glossary.pagination import encode_cursor
 from dds_glossary.schema import (
     CollectionResponse,
     ConceptResponse,
+    ConceptSchemeResponse,
     EntityResponse,
+    ExpandedConceptResponse,
+    ExpandedRelationResponse,
     FullConceptResponse,
     FullConceptSchemeResponse,
     RelationResponse,
 )
-from dds_glossary.services import GlossaryController
+from dds_glossary.services import GlossaryController, get_query_budget
+from dds_glossary.settings import get_settings
 
 from ..common import add_collections, add_concept_schemes, add_concepts, add_relations
 
@@ -96,6 +126,51 @@ def test_init_dataset_with_failed_datasets(
     assert response.saved_datasets == [Dataset(name="sample.rdf", url=str(file_rdf))]
 
 
+def test_init_datasets_replaces_versions(
+    controller: GlossaryController,
+    monkeypatch: MonkeyPatch,
+    file_rdf: Path,
+) -> None:
+    """Test that init_datasets replaces the versions of its datasets only."""
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    save_dataset(controller.engine, *controller.parse_dataset(file_rdf), version="v0")
+    monkeypatch.setattr(
+        GlossaryController, "datasets", [Dataset(name="sample.rdf", url=str(file_rdf))]
+    )
+
+    for _ in range(2):
+        response = controller.init_datasets()
+        assert response.failed_datasets == []
+    for version in ("v0", "sample"):
+        concept_scheme = controller.get_concept_scheme(
+            concept_scheme_iri, version=version
+        )
+        assert len(concept_scheme.concepts) == 2
+        assert len(concept_scheme.collections) == 2
+
+
+def test_init_datasets_failed_reload(
+    controller: GlossaryController,
+    monkeypatch: MonkeyPatch,
+    file_rdf: Path,
+) -> None:
+    """Test that init_datasets keeps the version of a dataset failing to reload."""
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    monkeypatch.setattr(
+        GlossaryController, "datasets", [Dataset(name="sample.rdf", url=str(file_rdf))]
+    )
+    controller.init_datasets()
+
+    def save_invalid_version(*_, **__) -> None:
+        raise ValueError("invalid")
+
+    monkeypatch.setattr("dds_glossary.database.save_version", save_invalid_version)
+    response = controller.init_datasets()
+    assert [dataset.error for dataset in response.failed_datasets] == ["invalid"]
+    concept_scheme = controller.get_concept_scheme(concept_scheme_iri, version="sample")
+    assert len(concept_scheme.concepts) == 2
+
+
 def test_get_concept_schemes(controller: GlossaryController) -> None:
     """Test the GlossaryController get_concept_schemes method."""
     concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
@@ -198,6 +273,106 @@ def test_get_concepts(controller: GlossaryController) -> None:
     assert concepts == expected_concepts
 
 
+def test_get_concepts_paginated(controller: GlossaryController) -> None:
+    """Test the GlossaryController get_concepts and get_concept_scheme methods
+    return the pages of the members by notation and IRI, rejecting the invalid
+    cursors and the ones of unknown IRI prefixes."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
+    concept_scheme_iri = concept_scheme_dicts[0]["iri"]
+    concept_dicts = add_concepts(controller.engine, [concept_scheme_iri] * 3)
+    expected_iris = [
+        concept_dict["iri"]
+        for concept_dict in sorted(
+            concept_dicts, key=lambda concept: (concept["notation"], concept["iri"])
+        )
+    ]
+
+    first_page = controller.get_concepts(concept_scheme_iri, limit=2)
+    assert [concept.iri for concept in first_page] == expected_iris[:2]
+    concept_scheme = controller.get_concept_scheme(concept_scheme_iri, limit=2)
+    assert concept_scheme.concepts == first_page
+    assert concept_scheme.next_cursor is not None
+    last_page = controller.get_concept_scheme(
+        concept_scheme_iri, limit=2, cursor=concept_scheme.next_cursor
+    )
+    assert [concept.iri for concept in last_page.concepts] == expected_iris[2:]
+    assert last_page.next_cursor is None
+    assert controller.get_concept_scheme(concept_scheme_iri).next_cursor is None
+    with pytest_raises(InvalidCursorException) as exc_info:
+        controller.get_concepts(concept_scheme_iri, cursor="invalid")
+    assert exc_info.value.status_code == HTTPStatus.BAD_REQUEST
+    unknown_cursor = encode_cursor("1", "http://unknown.org/concept")
+    with pytest_raises(InvalidCursorException) as exc_info:
+        controller.get_concept_scheme(concept_scheme_iri, cursor=unknown_cursor)
+    assert exc_info.value.status_code == HTTPStatus.BAD_REQUEST
+    with pytest_raises(InvalidCursorException):
+        controller.stream_concepts(concept_scheme_iri, cursor=unknown_cursor)
+
+
+def test_get_concepts_fields(controller: GlossaryController) -> None:
+    """Test the GlossaryController get and stream methods return the members with
+    the fields of the sparse fieldset only, besides their IRI and notation."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
+    concept_scheme_iri = concept_scheme_dicts[0]["iri"]
+    concept_dicts = add_concepts(controller.engine, [concept_scheme_iri] * 2)
+    add_collections(controller.engine, [concept_scheme_iri], [[]])
+    expected = sorted(
+        (
+            {key: concept_dict[key] for key in ["iri", "notation", "altLabels"]}
+            for concept_dict in concept_dicts
+        ),
+        key=lambda concept: (concept["notation"], concept["iri"]),
+    )
+
+    concepts = controller.get_concepts(concept_scheme_iri, fields="altLabels")
+    assert [concept.model_dump() for concept in concepts] == expected
+    concept_scheme = controller.get_concept_scheme(
+        concept_scheme_iri, fields="altLabels"
+    )
+    assert concept_scheme.concepts == concepts
+    assert list(concept_scheme.collections[0].model_dump()) == ["iri", "notation"]
+    lines = b"".join(controller.stream_concepts(concept_scheme_iri, fields="altLabels"))
+    assert [json.loads(line) for line in lines.splitlines()] == expected
+    with pytest_raises(InvalidFieldsException) as exc_info:
+        controller.get_concepts(concept_scheme_iri, fields="unknown")
+    assert exc_info.value.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_stream_concept_scheme(
+    controller: GlossaryController, monkeypatch: MonkeyPatch
+) -> None:
+    """Test the GlossaryController streams the concept scheme and its members in
+    batches, one per line, like get_concept_scheme."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
+    concept_scheme_iri = concept_scheme_dicts[0]["iri"]
+    add_concepts(controller.engine, [concept_scheme_iri] * 3)
+    add_collections(controller.engine, [concept_scheme_iri], [[]])
+    monkeypatch.setattr("dds_glossary.database.STREAM_BATCH_SIZE", 2)
+    concept_scheme = controller.get_concept_scheme(concept_scheme_iri, limit=4)
+
+    chunks = list(controller.stream_concept_scheme(concept_scheme_iri, limit=4))
+    assert len(chunks) == 3
+    lines = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert lines[0] == ConceptSchemeResponse(**concept_scheme_dicts[0]).model_dump()
+    assert sorted(lines[1:], key=lambda member: member["iri"]) == sorted(
+        [
+            member.model_dump()
+            for member in concept_scheme.collections + concept_scheme.concepts
+        ],
+        key=lambda member: member["iri"],
+    )
+    assert [
+        json.loads(line)
+        for line in b"".join(
+            controller.stream_concepts(concept_scheme_iri)
+        ).splitlines()
+    ] == [
+        concept.model_dump() for concept in controller.get_concepts(concept_scheme_iri)
+    ]
+    with pytest_raises(ConceptSchemeNotFoundException):
+        controller.stream_concepts("http://example.org/concept_scheme")
+
+
 def test_get_concepts_not_found(controller: GlossaryController) -> None:
     """Test the GlossaryController get_concepts method with a concept scheme
     not found."""
@@ -228,6 +403,129 @@ def test_get_concept(controller: GlossaryController) -> None:
     assert concept == expected_concept
 
 
+def test_get_concept_expand_relations(controller: GlossaryController) -> None:
+    """Test the GlossaryController get_concept method expands the relations with
+    their concepts, in a single query."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
+    concept_dicts = add_concepts(
+        controller.engine, [concept_scheme_dicts[0]["iri"]] * 3
+    )
+    relation_dicts = add_relations(
+        controller.engine,
+        [
+            (concept_dicts[0]["iri"], concept_dicts[1]["iri"]),
+            (concept_dicts[2]["iri"], concept_dicts[0]["iri"]),
+        ],
+    )
+    concepts = {
+        concept_dict["iri"]: EntityResponse(**concept_dict)
+        for concept_dict in concept_dicts
+    }
+    statements: list[str] = []
+    event.listen(
+        controller.engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    concept = controller.get_concept(concept_dicts[0]["iri"], expand_relations=True)
+    assert len(statements) == 2
+    assert concept == ExpandedConceptResponse(
+        **concept_dicts[0],
+        concept_schemes=[concept_scheme_dicts[0]["iri"]],
+        relations=[
+            ExpandedRelationResponse(
+                **relation_dict,
+                source_concept=concepts[relation_dict["source_concept_iri"]],
+                target_concept=concepts[relation_dict["target_concept_iri"]],
+            )
+            for relation_dict in relation_dicts
+        ],
+    )
+
+
+def test_get_concept_fields(controller: GlossaryController) -> None:
+    """Test the GlossaryController get_concept method reads and returns the fields
+    of the sparse fieldset only, besides the IRI, the notation, the concept schemes
+    and the relations of the concept."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
+    concept_dicts = add_concepts(
+        controller.engine, [concept_scheme_dicts[0]["iri"]] * 2
+    )
+    relation_dicts = add_relations(
+        controller.engine, [(concept_dicts[0]["iri"], concept_dicts[1]["iri"])]
+    )
+    statements: list[str] = []
+    event.listen(
+        controller.engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    concept = controller.get_concept(concept_dicts[0]["iri"], fields="identifier")
+    assert len(statements) == 1
+    assert "labels" not in statements[0]
+    assert concept.model_dump() == {
+        **{key: concept_dicts[0][key] for key in ["iri", "notation", "identifier"]},
+        "concept_schemes": [concept_scheme_dicts[0]["iri"]],
+        "relations": [RelationResponse(**relation_dicts[0]).model_dump()],
+    }
+    concept = controller.get_concept(
+        concept_dicts[0]["iri"], expand_relations=True, fields="altLabels"
+    )
+    assert list(concept.model_dump()) == [
+        "iri",
+        "notation",
+        "altLabels",
+        "concept_schemes",
+        "relations",
+    ]
+    assert concept.model_dump()["altLabels"] == concept_dicts[0]["altLabels"]
+    with pytest_raises(InvalidFieldsException):
+        controller.get_concept(concept_dicts[0]["iri"], fields="unknown")
+
+
+def test_get_by_iri(controller: GlossaryController) -> None:
+    """Test the GlossaryController get by IRI methods return the entities by IRI, in
+    a single query each, with None for the IRIs not found."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
+    concept_scheme_iri = concept_scheme_dicts[0]["iri"]
+    concept_dicts = add_concepts(controller.engine, [concept_scheme_iri] * 2)
+    collection_dicts = add_collections(controller.engine, [concept_scheme_iri], [[]])
+    missing_iri = "http://example.org/missing"
+    statements: list[str] = []
+    event.listen(
+        controller.engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    concepts = controller.get_concepts_by_iri(
+        [concept_dicts[1]["iri"], missing_iri, concept_dicts[0]["iri"]]
+    )
+    assert len(statements) == 1
+    assert concepts == {
+        concept_dicts[1]["iri"]: ConceptResponse(**concept_dicts[1]),
+        missing_iri: None,
+        concept_dicts[0]["iri"]: ConceptResponse(**concept_dicts[0]),
+    }
+    assert list(concepts) == [
+        concept_dicts[1]["iri"],
+        missing_iri,
+        concept_dicts[0]["iri"],
+    ]
+    assert controller.get_collections_by_iri(
+        [collection_dicts[0]["iri"], concept_dicts[0]["iri"]]
+    ) == {
+        collection_dicts[0]["iri"]: EntityResponse(**collection_dicts[0]),
+        concept_dicts[0]["iri"]: None,
+    }
+    assert controller.get_concept_schemes_by_iri([concept_scheme_iri, missing_iri]) == {
+        concept_scheme_iri: ConceptSchemeResponse(**concept_scheme_dicts[0]),
+        missing_iri: None,
+    }
+
+
 def test_get_concept_not_found(controller: GlossaryController) -> None:
     """Test the GlossaryController get_concept method with a concept not found."""
     concept_iri = "http://example.org/concept"
@@ -237,6 +535,17 @@ def test_get_concept_not_found(controller: GlossaryController) -> None:
     assert exc_info.value.detail == f"Concept {concept_iri} not found."
 
 
+def test_get_concept_version_not_found(controller: GlossaryController) -> None:
+    """Test the GlossaryController get_concept method with a concept missing from
+    the version."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
+    concept_dicts = add_concepts(controller.engine, [concept_scheme_dicts[0]["iri"]])
+    concept_iri = concept_dicts[0]["iri"]
+    with pytest_raises(ConceptNotFoundException) as exc_info:
+        controller.get_concept(concept_iri, version="CN2023")
+    assert exc_info.value.detail == f"Concept {concept_iri} not found."
+
+
 def test_search_database(controller: GlossaryController) -> None:
     """Test the GlossaryController search_database method."""
     concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
@@ -246,3 +555,191 @@ def test_search_database(controller: GlossaryController) -> None:
     search_results = controller.search_database(concept_dicts[0]["prefLabel"])
     assert len(search_results) == 1
     assert search_results[0].model_dump() == concept_dicts[0]
+
+
+def test_materialize_documents(
+    controller: GlossaryController,
+    file_rdf: Path,
+) -> None:
+    """Test the GlossaryController materialize_documents method."""
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    collection_iri = "https://example.org/collection1"
+    save_dataset(controller.engine, *controller.parse_dataset(file_rdf))
+
+    assert controller.materialize_documents(["en", "sk"]) == 10
+    renderers: list[tuple[DocumentType, str, Callable[..., BaseModel]]] = [
+        (
+            DocumentType.CONCEPT_SCHEME,
+            concept_scheme_iri,
+            controller.get_concept_scheme,
+        ),
+        (DocumentType.CONCEPT, concept_iri, controller.get_concept),
+        (DocumentType.COLLECTION, collection_iri, controller.get_collection),
+    ]
+    for document_type, iri, get in renderers:
+        document = controller.get_document(document_type, iri, lang="sk")
+        assert document is not None
+        assert json.loads(document) == get(iri, lang="sk").model_dump()
+    assert controller.get_document(DocumentType.CONCEPT, concept_iri, "fr") is None
+
+
+def test_read_replicas(controller: GlossaryController) -> None:
+    """Test the GlossaryController reads from the replicas, or from the primary
+    database if they fail or if primary reads are requested."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 1)
+    broken_url = controller.engine.url.set(query={"host": "/nonexistent"})
+    controller.replicas = ReplicaSet.from_urls([str(broken_url)])
+
+    with controller.primary_reads():
+        assert len(controller.get_concept_schemes()) == len(concept_scheme_dicts)
+    with pytest_raises(OperationalError):
+        controller.get_concept_schemes()
+    assert len(controller.get_concept_schemes()) == len(concept_scheme_dicts)
+
+
+def test_run_within_budget(controller: GlossaryController) -> None:
+    """Test the GlossaryController stops the read methods exceeding their time
+    budget, or whose client disconnected."""
+
+    async def connected() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": True}
+
+    async def disconnected() -> dict:
+        return {"type": "http.disconnect"}
+
+    def sleep(seconds: float) -> None:
+        with controller.read_engine.connect() as connection:
+            connection.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": seconds})
+
+    controller.budget = QueryBudget(5.0)
+    request = Request({"type": "http"}, connected)
+    assert (
+        anyio_run(controller.run_within_budget, request, controller.get_concept_schemes)
+        == []
+    )
+
+    controller.budget = QueryBudget(0.2)
+    with pytest_raises(QueryTimeoutException) as timeout:
+        anyio_run(controller.run_within_budget, request, sleep, 10)
+    assert timeout.value.status_code == HTTPStatus.GATEWAY_TIMEOUT
+
+    controller.budget = QueryBudget(5.0)
+    request = Request({"type": "http"}, disconnected)
+    with pytest_raises(QueryCancelledException):
+        anyio_run(controller.run_within_budget, request, sleep, 10)
+
+
+def test_cache(controller: GlossaryController) -> None:
+    """Test the GlossaryController read methods serve the cached results without
+    querying the database, until the dataset generation is bumped, which drops the
+    results of the caches of the other processes once they refresh it."""
+    concept_scheme_iri = add_concept_schemes(controller.engine, 1)[0]["iri"]
+    controller.cache = ResponseCache(partial(get_dataset_generation, controller.engine))
+    other_cache = ResponseCache(
+        partial(get_dataset_generation, controller.engine), ttl=0.0
+    )
+    other_cache.refresh()
+    other_cache.get_or_call("key", lambda: 1)
+    statements: list[str] = []
+    event.listen(
+        controller.engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    concept_scheme = controller.get_concept_scheme(concept_scheme_iri)
+    queries = len(statements)
+    assert controller.get_concept_scheme(concept_scheme_iri, "en") is concept_scheme
+    assert len(statements) == queries
+    add_concepts(controller.engine, [concept_scheme_iri])
+    assert len(controller.get_concept_scheme(concept_scheme_iri).concepts) == 0
+    controller.bump_generation()
+    assert len(controller.get_concept_scheme(concept_scheme_iri).concepts) == 1
+    assert controller.cache.statistics().generation == 1
+    assert other_cache.refresh() == 1
+    assert other_cache.get_or_call("key", lambda: 2) == 2
+
+
+def test_unit_of_work(controller: GlossaryController, file_rdf: Path) -> None:
+    """Test the GlossaryController reads of a unit of work share a single
+    connection, until it ends."""
+    concept_scheme_iri = "http://data.europa.eu/xsp/cn2024/cn2024"
+    concept_iri = "http://data.europa.eu/xsp/cn2024/020321000080"
+    save_dataset(controller.engine, *controller.parse_dataset(file_rdf))
+    checkouts: list[object] = []
+    event.listen(controller.engine, "checkout", lambda *args: checkouts.append(args))
+    controller.unit_of_work = True
+
+    concept_scheme = controller.get_concept_scheme(concept_scheme_iri)
+    concept = controller.get_concept(concept_iri)
+    assert len(checkouts) == 1
+    assert controller.session is not None
+    anyio_run(controller.end_unit_of_work)
+    assert controller.session is None
+
+    controller.unit_of_work = False
+    assert controller.get_concept_scheme(concept_scheme_iri) == concept_scheme
+    assert controller.get_concept(concept_iri) == concept
+    assert len(checkouts) == 4
+
+
+def test_get_query_budget(monkeypatch: MonkeyPatch) -> None:
+    """Test the time budget of a request is the one of its endpoint."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "QUERY_TIME_BUDGET", 2.0)
+    monkeypatch.setattr(settings, "QUERY_TIME_BUDGETS", {"search": 1.0, "home": 0})
+    budgets = {
+        name: get_query_budget(
+            Request(
+                {"type": "http", "route": APIRoute(f"/{name}", lambda: None, name=name)}
+            )
+        )
+        for name in ["search", "home", "get_concept"]
+    }
+    assert budgets["search"] is not None and budgets["search"].seconds == 1.0
+    assert budgets["home"] is None
+    assert budgets["get_concept"] is not None and budgets["get_concept"].seconds == 2.0
+
+
+def test_run_async(controller: GlossaryController) -> None:
+    """Test the GlossaryController runs the read methods on the event loop with the
+    async engine, within their time budget, refreshing the dataset generation of its
+    cache in the threadpool."""
+    concept_scheme_dicts = add_concept_schemes(controller.engine, 2)
+    load_threads: list[Thread] = []
+
+    def load_generation() -> tuple[int, datetime]:
+        load_threads.append(current_thread())
+        return get_dataset_generation(controller.engine)
+
+    controller.cache = ResponseCache(load_generation, ttl=0.0)
+
+    def sleep() -> None:
+        with controller.read_engine.connect() as connection:
+            connection.execute(text("SELECT pg_sleep(10)"))
+
+    async def connected() -> dict:
+        await sleep_forever()
+        return {}
+
+    async def run() -> tuple:
+        async_engine = init_async_engine()
+        assert async_engine is not None
+        controller.async_engine = async_engine
+        try:
+            schemes = await controller.run_async(controller.get_concept_schemes)
+            thread = await controller.run_async(current_thread)
+            controller.budget = QueryBudget(0.2)
+            request = Request({"type": "http"}, connected)
+            with pytest_raises(QueryTimeoutException):
+                await controller.run_within_budget(request, sleep)
+        finally:
+            await async_engine.dispose()
+        return schemes, thread
+
+    schemes, thread = anyio_run(run)
+    assert len(schemes) == len(concept_scheme_dicts)
+    assert thread is main_thread()
+    assert load_threads and main_thread() not in load_threads
+    assert not controller.reads_async
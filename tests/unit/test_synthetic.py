@@ -0,0 +1,62 @@
+"""Tests for dds_glossary.synthetic module."""
+
+from pathlib import Path
+
+from dds_glossary.services import GlossaryController
+from dds_glossary.synthetic import SyntheticDataset
+
+
+def test_synthetic_dataset_level_starts() -> None:
+    """It should fit the concepts in the configured depth."""
+    dataset = SyntheticDataset(concepts=20, depth=3, fan_out=2)
+    assert dataset.level_starts() == [0, 3, 9, 20]
+
+
+def test_synthetic_dataset_deterministic(tmp_path: Path) -> None:
+    """It should write the same file for the same configuration and seed."""
+    dataset = SyntheticDataset(concepts=50, polyhierarchy=0.5, collections=3)
+    first = dataset.write(tmp_path / "first.rdf").read_bytes()
+    second = dataset.write(tmp_path / "second.rdf").read_bytes()
+    other = dataset.model_copy(update={"seed": 1}).write(tmp_path / "other.rdf")
+    assert first == second
+    assert first != other.read_bytes()
+
+
+def test_synthetic_dataset_parse_dataset(
+    controller: GlossaryController,
+    tmp_path: Path,
+) -> None:
+    """It should write a dataset parsed by the glossary controller."""
+    dataset = SyntheticDataset(
+        concepts=20,
+        depth=3,
+        fan_out=2,
+        languages=3,
+        alt_labels=2,
+        collections=2,
+    )
+    concept_schemes, concepts, collections, semantic_relations = (
+        controller.parse_dataset(dataset.write(tmp_path / "synthetic.rdf"))
+    )
+
+    assert [scheme.iri for scheme in concept_schemes] == [dataset.scheme_iri]
+    assert len(concepts) == 20
+    assert len(collections) == 2
+    assert len(semantic_relations) == 17
+    assert list(concepts[0].prefLabels) == ["en", "bg", "cs"]
+    assert len(concepts[0].altLabels["cs"]) == 2
+    assert concepts[0].concept_schemes == concept_schemes
+    assert semantic_relations[0].target_concept_iri == dataset.concept_iri(0)
+    assert len(collections[0].member_iris) == 11
+
+
+def test_synthetic_dataset_polyhierarchy(
+    controller: GlossaryController,
+    tmp_path: Path,
+) -> None:
+    """It should give a second broader concept to concepts in a polyhierarchy."""
+    dataset = SyntheticDataset(concepts=100, fan_out=3, polyhierarchy=1.0)
+    semantic_relations = controller.parse_dataset(
+        dataset.write(tmp_path / "synthetic.rdf")
+    )[3]
+    assert len(semantic_relations) > 100 - dataset.level_starts()[1]